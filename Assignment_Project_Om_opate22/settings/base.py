@@ -38,17 +38,21 @@ INSTALLED_APPS = [
     'careers',
     'catalog',
     'recommender',
+    'search',
+    'monitoring',
     'rest_framework',
 ]
 
 
 # --- MIDDLEWARE ---
 MIDDLEWARE = [
+    'monitoring.middleware.RequestTimingMiddleware',  # outermost, so it times everything
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'monitoring.middleware.ProfilerMiddleware',  # needs request.user
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -61,7 +65,7 @@ ROOT_URLCONF = 'Assignment_Project_Om_opate22.urls'
 # --- TEMPLATES ---
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'monitoring.templates.TimedDjangoTemplates',  # DjangoTemplates + render timing
         'DIRS': [BASE_DIR / 'templates'],  # Global template directory
         'APP_DIRS': True,
         'OPTIONS': {
@@ -116,6 +120,94 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 
+# --- CACHES ---
+# 'charts' is file-based so rendered chart images are shared by all workers
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'charts': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'data' / 'chart_cache',
+        'OPTIONS': {'MAX_ENTRIES': 500},
+    },
+}
+CHART_CACHE_ALIAS = 'charts'
+CHART_CACHE_TIMEOUT = 60 * 60 * 24  # one day; keys change with the data anyway
+
+# --- CHART RENDERER POOL (accounts/chart_pool.py) ---
+CHART_RENDER_WORKERS = 2        # renderer processes; 0 = render in the web worker
+CHART_RENDER_MAX_PENDING = 8    # renders queued or running before new ones get 503
+CHART_RENDER_TIMEOUT = 10       # seconds to wait for a queue slot / a finished render
+
+
+# --- WORKER WARM-UP (Assignment_Project_Om_opate22/warmup.py) ---
+WARMUP_ON_LOAD = False                # run warmup() when wsgi.py / asgi.py is imported
+WARMUP_PRIME_COLLEGE_CACHES = False   # also render missing per-college charts (slow on a cold cache)
+
+
+# --- FULL-TEXT SEARCH (search/index.py) ---
+SEARCH_RESULT_LIMIT = 200       # hits returned per search() call
+
+
+# --- RECOMMENDER MODELS (recommender/collab.py) ---
+RECOMMENDER_MODEL_DIR = BASE_DIR / 'data' / 'recommender'
+RECOMMENDER_CF_NEIGHBOURS = 50  # similar items kept per item
+RECOMMENDER_CF_WEIGHT = 20      # max points the collaborative score adds to a match
+RECOMMENDER_SIMILAR_CAREERS = 10  # neighbours stored per career (recommender/similar_careers.py)
+CATALOG_SNAPSHOT_AUTO_REBUILD = True  # a stale snapshot is rebuilt in a background thread
+
+# Scoring backend (recommender/daemon.py): 'local' scores in each web worker,
+# 'daemon' asks `manage.py run_recommender_daemon` and falls back to 'local'
+RECOMMENDER_BACKEND = 'local'
+RECOMMENDER_SOCKET = BASE_DIR / 'data' / 'recommender.sock'
+RECOMMENDER_DAEMON_TIMEOUT = 2.0  # seconds per request before falling back
+RECOMMENDER_DAEMON_RETRY = 30     # seconds to skip the daemon after it was unreachable
+
+# Peer lookup (recommender/peers.py)
+PEER_EMBEDDING_DIM = 256        # hashed feature buckets per profile vector
+PEER_SEARCH_MODE = 'auto'       # 'exact', 'lsh', or 'auto' (lsh above the threshold)
+PEER_LSH_THRESHOLD = 50000      # profiles before 'auto' switches to lsh
+PEER_LSH_CANDIDATES = 20        # candidates re-scored per requested peer in lsh mode
+
+
+# --- REQUEST TIMING (monitoring/) ---
+REQUEST_TIMING_SAMPLE_RATE = 1.0  # fraction of requests timed; 0 removes the middleware
+REQUEST_TIMING_HEADER = True      # add a Server-Timing header to timed responses (off in production)
+
+# On-demand profiling for staff (monitoring/profiling.py)
+PROFILER_ENABLED = True
+PROFILER_DIR = BASE_DIR / 'data' / 'profiles'
+PROFILER_MAX_PROFILES = 50        # ring buffer size; the oldest profiles are deleted
+PROFILER_SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+
+# Prometheus metrics at /metrics (monitoring/metrics.py)
+METRICS_ENABLED = os.environ.get('TRAJECT_METRICS_ENABLED', '1') == '1'  # manage.py turns it off for one-off commands
+METRICS_DIR = BASE_DIR / 'data' / 'metrics'  # one mmap file per worker process
+# Who may scrape it besides staff users: REMOTE_ADDRs in METRICS_ALLOWED_IPS, or
+# requests with "Authorization: Bearer <METRICS_TOKEN>". Behind a reverse proxy on
+# the same host every client arrives from 127.0.0.1, so prefer the token there.
+METRICS_ALLOWED_IPS = []
+METRICS_TOKEN = os.environ.get('TRAJECT_METRICS_TOKEN', '')  # empty = no token access
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # Query budget warnings; production.py lowers this to INFO for one JSON line per timed request
+        'monitoring.requests': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+
+# --- TESTS ---
+# Sends the catalog version, models, metrics, profiles and caches to a temp dir
+TEST_RUNNER = 'Assignment_Project_Om_opate22.test_runner.IsolatedRuntimeTestRunner'
+
+
 # --- DEFAULT PRIMARY KEY ---
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -126,6 +218,15 @@ LOGOUT_REDIRECT_URL = 'accounts:login'
 
 # --- APPLICATION SETTINGS ---
 ITEMS_PER_PAGE = 20
+
+# --- CATALOG VERSION / EXPORT SNAPSHOTS ---
+# Changes whenever catalog data is edited (see catalog/version.py)
+CATALOG_VERSION_FILE = BASE_DIR / 'data' / 'catalog_version'
+CATALOG_FINGERPRINT_TTL = 5  # seconds a process reuses its catalog table fingerprint
+# Export snapshots are written under MEDIA_ROOT/<EXPORT_SNAPSHOT_DIR>/<catalog version>/
+EXPORT_SNAPSHOT_DIR = 'exports'
+# Background threads that build snapshots; 0 = only `manage.py run_export_jobs`
+EXPORT_JOB_THREADS = 1
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 
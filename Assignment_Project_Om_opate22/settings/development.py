@@ -3,4 +3,6 @@ from .base import *
 # Development-specific settings
 DEBUG = True
 
-ALLOWED_HOSTS = ['localhost', '127.0.0.1']
\ No newline at end of file
+ALLOWED_HOSTS = ['localhost', '127.0.0.1']
+
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']  # a local Prometheus, no proxy in front
\ No newline at end of file
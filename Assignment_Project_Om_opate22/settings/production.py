@@ -1,9 +1,17 @@
+from copy import deepcopy
+
 from .base import *
 
 DEBUG = False
 
 ALLOWED_HOSTS = ['opate22.pythonanywhere.com']
 
+REQUEST_TIMING_SAMPLE_RATE = 0.1  # time one request in ten
+REQUEST_TIMING_HEADER = False     # timings go to the log, not to clients
+LOGGING = deepcopy(LOGGING)
+LOGGING['loggers']['monitoring.requests']['level'] = 'INFO'  # log each timed request
+WARMUP_ON_LOAD = True
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.mysql',
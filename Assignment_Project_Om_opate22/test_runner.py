@@ -0,0 +1,59 @@
+"""
+Test runner that keeps a test run away from the project's runtime files.
+
+Several features keep state on disk next to the database: the catalog
+version file, recommender models and snapshots, per-process metrics,
+saved profiles, cached chart images, export snapshots. Left alone, every
+`manage.py test` run would bump the development catalog version and
+leave its files in data/ and media/. This runner points all of them at
+one temporary directory for the whole run and deletes it afterwards.
+Individual tests can still override_settings() a path of their own.
+
+It also turns off the background threads (catalog snapshot rebuilds,
+export snapshot jobs): they would read the test database through their
+own connections, outside the transaction each TestCase runs in.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+def runtime_path_settings(root: Path) -> dict:
+    """Settings that send every on-disk runtime path under `root`."""
+    caches = {alias: dict(config) for alias, config in settings.CACHES.items()}
+    caches[settings.CHART_CACHE_ALIAS]["LOCATION"] = root / "chart_cache"
+    return {
+        "CATALOG_VERSION_FILE": root / "catalog_version",
+        "RECOMMENDER_MODEL_DIR": root / "recommender",
+        "RECOMMENDER_SOCKET": root / "recommender.sock",
+        "METRICS_DIR": root / "metrics",
+        "PROFILER_DIR": root / "profiles",
+        "MEDIA_ROOT": root / "media",
+        "CACHES": caches,
+    }
+
+
+BACKGROUND_WORK_SETTINGS = {
+    "CATALOG_SNAPSHOT_AUTO_REBUILD": False,
+    "EXPORT_JOB_THREADS": 0,
+}
+
+
+class IsolatedRuntimeTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._runtime_dir = Path(tempfile.mkdtemp(prefix="traject-test-"))
+        self._runtime_settings = override_settings(
+            **runtime_path_settings(self._runtime_dir), **BACKGROUND_WORK_SETTINGS
+        )
+        self._runtime_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._runtime_settings.disable()
+        shutil.rmtree(self._runtime_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
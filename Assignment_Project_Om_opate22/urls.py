@@ -4,7 +4,10 @@ from django.views.generic import TemplateView
 from django.conf import settings
 from django.conf.urls.static import static
 
+from monitoring.views import metrics_view
+
 urlpatterns = [
+    path("admin/profiles/", include("monitoring.urls")),  # before admin/ so it isn't shadowed
     path("admin/", admin.site.urls),
     path("", TemplateView.as_view(template_name="accounts/home.html"), name="home"),
 
@@ -13,6 +16,8 @@ urlpatterns = [
     path("careers/", include("careers.urls")),
     path("catalog/", include("catalog.urls")),
     path("recommender/", include("recommender.urls")),
+    path("search/", include("search.urls")),
+    path("metrics", metrics_view, name="metrics"),
 
 ]
 
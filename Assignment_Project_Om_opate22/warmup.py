@@ -0,0 +1,168 @@
+"""
+Start-up warm-up for web workers.
+
+Cold workers otherwise pay on their first requests for importing lazily
+loaded modules, compiling templates, building the skill index, mapping
+the recommender models and the first database round trip. `warmup()`
+does all of that up front:
+
+- wsgi.py / asgi.py call it at import time when WARMUP_ON_LOAD is set.
+  With a pre-forking server in preload mode (gunicorn --preload) that
+  runs once in the master, and every worker inherits the result:
+  imported modules, compiled templates and memory-mapped models are
+  shared copy-on-write.
+- `python manage.py warm_caches` runs it from deploy scripts.
+
+Every step is independent and only logs its failure: a broken step
+never stops the server from starting. Database connections and the
+chart renderer pool are closed at the end, so nothing that must not be
+shared is inherited by forked workers.
+"""
+
+import importlib
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Imported on first use elsewhere; importing them here moves the cost off the request path
+LAZY_MODULES = (
+    "numpy",
+    "recommender.catalog_snapshot",
+    "recommender.collab",
+    "recommender.daemon",
+    "recommender.peers",
+    "recommender.roadmap",
+    "recommender.similar_careers",
+    "recommender.skill_gap",
+    "accounts.exports",
+    "accounts.export_jobs",
+    "search.index",
+    "monitoring.profiling",
+)
+
+# Charts drawn from per-college rollups: (chart name, accounts.chart_data function)
+COLLEGE_CHARTS = (
+    ("users_per_college", "users_per_college"),
+    ("majors_per_college", "majors_per_college"),
+)
+
+
+# =====================================================
+#  STEPS
+# =====================================================
+
+def import_modules():
+    for name in LAZY_MODULES:
+        importlib.import_module(name)
+    return len(LAZY_MODULES)
+
+
+def load_urls():
+    """Import every view module and build the reverse() lookup tables."""
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    names = len(resolver.reverse_dict)
+    for _, namespace_resolver in resolver.namespace_dict.values():
+        names += len(namespace_resolver.reverse_dict)
+    return names
+
+
+def compile_templates():
+    """Compile every project and app template into the cached loader."""
+    from django.template import TemplateSyntaxError, engines
+
+    compiled = 0
+    for engine in engines.all():
+        # DIRS plus each app's templates/ (APP_DIRS)
+        for directory in engine.template_dirs:
+            for path in sorted(Path(directory).rglob("*.html")):
+                name = path.relative_to(directory).as_posix()
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError:
+                    logger.warning("Template %s does not compile", name)
+                else:
+                    compiled += 1
+    return compiled
+
+
+def load_recommender_indexes(build=False):
+    """Catalog snapshot, skill index and the published models (mapped, not copied)."""
+    from recommender import collab, peers, similar_careers
+    from recommender.catalog_snapshot import get_snapshot
+    from recommender.skills import get_skill_index
+    from search.index import search_backend
+
+    if build:
+        collab.build_model()
+        peers.build_index()
+        similar_careers.build_similarity()
+    return {
+        "catalog_snapshot": get_snapshot(rebuild=True) is not None,
+        "skills": len(get_skill_index()),
+        "cf_model": collab.get_model() is not None,
+        "peer_index": peers.get_peer_index() is not None,
+        "career_similarity": similar_careers.get_neighbours() is not None,
+        "search_backend": search_backend(),
+    }
+
+
+def prime_college_charts():
+    """Render per-college charts into the shared chart cache if they are missing."""
+    from accounts import chart_data
+    from accounts.chart_pool import shutdown_pool
+    from accounts.charts import prime_chart
+
+    try:
+        return sum(
+            prime_chart(chart, getattr(chart_data, data_function)())
+            for chart, data_function in COLLEGE_CHARTS
+        )
+    finally:
+        # The pool's threads and pipes must not be inherited by forked workers
+        shutdown_pool()
+
+
+# =====================================================
+#  ENTRY POINT
+# =====================================================
+
+def warmup(prime_colleges=None, build_models=False, templates=True) -> dict:
+    """Run every warm-up step. Returns {step: {'result' or 'error', 'ms'}}."""
+    from django.db import connections
+
+    if prime_colleges is None:
+        prime_colleges = settings.WARMUP_PRIME_COLLEGE_CACHES
+
+    steps = [
+        ("modules", import_modules),
+        ("urls", load_urls),
+        ("recommender", lambda: load_recommender_indexes(build_models)),
+    ]
+    if templates:
+        steps.append(("templates", compile_templates))
+    if prime_colleges:
+        steps.append(("college_charts", prime_college_charts))
+
+    report = {}
+    started = time.perf_counter()
+    try:
+        for name, step in steps:
+            step_started = time.perf_counter()
+            try:
+                result = {"result": step()}
+            except Exception as exc:
+                logger.exception("Warm-up step %s failed", name)
+                result = {"error": f"{type(exc).__name__}: {exc}"}
+            result["ms"] = round((time.perf_counter() - step_started) * 1000, 1)
+            report[name] = result
+    finally:
+        # A connection opened here would otherwise be shared by every forked worker
+        connections.close_all()
+    logger.info("Warm-up finished in %.0f ms", (time.perf_counter() - started) * 1000)
+    return report
@@ -2,6 +2,7 @@
 WSGI config for Assignment_Project_Om_opate22 project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
+With WARMUP_ON_LOAD it also warms caches and indexes (see warmup.py).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
@@ -14,3 +15,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Assignment_Project_Om_opate22.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402 (settings are configured by now)
+
+if settings.WARMUP_ON_LOAD:
+    # Under a preloading server this runs once, before the workers fork
+    from .warmup import warmup
+    warmup()
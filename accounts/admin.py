@@ -1,6 +1,8 @@
 # accounts/admin.py
 from django.contrib import admin
-from .models import UserProfile, Course, Club, CareerPath, PortfolioItem, UserChecklist, CareerPlan, PlanItem
+from .models import (
+    UserProfile, Course, Club, CareerPath, PortfolioItem, UserChecklist, CareerPlan, PlanItem, ExportJob
+)
 
 
 @admin.register(UserProfile)
@@ -352,4 +354,39 @@ class PlanItemAdmin(admin.ModelAdmin):
         queryset.update(status='PLANNED')
         self.message_user(request, f"{queryset.count()} items marked as planned.")
 
-    mark_planned.short_description = "Mark as Planned"
\ No newline at end of file
+    mark_planned.short_description = "Mark as Planned"
+
+# =====================================================
+#  EXPORT JOB ADMIN
+# =====================================================
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for ExportJob model.
+    Read-mostly view of export snapshots built for each catalog version.
+    """
+    list_display = (
+        "dataset",
+        "fmt",
+        "catalog_version",
+        "status",
+        "size_bytes",
+        "created_at",
+        "finished_at"
+    )
+
+    list_filter = ("status", "dataset", "fmt")
+
+    search_fields = ("catalog_version",)
+
+    readonly_fields = (
+        "file_path",
+        "size_bytes",
+        "error",
+        "created_at",
+        "started_at",
+        "finished_at"
+    )
+
+    ordering = ("-created_at",)
@@ -0,0 +1,81 @@
+# accounts/chart_data.py
+"""
+In-process chart data layer.
+
+Each function runs one query against the precomputed rollup tables
+(colleges/rollups.py) and returns plain Python data.
+The JSON API endpoints serialise these results directly and the
+matplotlib chart views draw from them, so a chart never has to call
+back into our own HTTP API.
+"""
+
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+from colleges.models import AcademicYearStats, College, Major
+from .models import UserProfile
+
+
+def users_per_college():
+    """Count of students per college, ordered by abbreviation."""
+    rows = list(
+        College.objects
+        .annotate(user_count=Coalesce("stats__student_count", 0))
+        .values("abbreviation", "college_name", "user_count")
+        .order_by("abbreviation")
+    )
+    return {
+        "labels": [r["abbreviation"] for r in rows],
+        "counts": [r["user_count"] for r in rows],
+        "details": rows,
+    }
+
+
+def users_per_academic_year():
+    """Count of students per academic year, with readable labels."""
+    rows = (
+        AcademicYearStats.objects
+        .filter(student_count__gt=0)
+        .values("academic_year", count=F("student_count"))
+        .order_by("academic_year")
+    )
+
+    year_labels = dict(UserProfile.ACADEMIC_YEARS)
+    return [
+        {
+            "academic_year_code": r["academic_year"],
+            "academic_year_name": year_labels.get(r["academic_year"], r["academic_year"]),
+            "count": r["count"],
+        }
+        for r in rows
+    ]
+
+
+def courses_per_major():
+    """Count of courses per major, ordered by major name."""
+    return list(
+        Major.objects
+        .annotate(course_count=Coalesce("stats__course_count", 0))
+        .values("name", "code", "course_count")
+        .order_by("name")
+    )
+
+
+def clubs_per_college():
+    """Count of clubs per college, ordered by abbreviation."""
+    return list(
+        College.objects
+        .annotate(club_count=Coalesce("stats__club_count", 0))
+        .values("abbreviation", "college_name", "club_count")
+        .order_by("abbreviation")
+    )
+
+
+def majors_per_college():
+    """(college_name, major count) pairs, largest first."""
+    return list(
+        College.objects
+        .annotate(num_majors=Coalesce("stats__major_count", 0))
+        .values_list("college_name", "num_majors")
+        .order_by("-num_majors")
+    )
@@ -0,0 +1,105 @@
+# accounts/chart_pool.py
+"""
+Out-of-process chart rendering.
+
+Render jobs (chart name + data payload + format) are sent to a small
+ProcessPoolExecutor of "spawn"ed renderer processes that import
+matplotlib once and are warmed up when the pool starts. pyplot's global
+state then never lives in a web worker, and several charts can render
+in parallel safely. Nothing here imports matplotlib or multiprocessing
+until the first chart is actually requested.
+
+The number of jobs in flight is bounded (CHART_RENDER_MAX_PENDING);
+callers that cannot get a slot, or whose render takes longer than
+CHART_RENDER_TIMEOUT, get ChartRenderUnavailable so the view can answer
+503 instead of piling up work. With CHART_RENDER_WORKERS = 0 charts are
+rendered in-process under a lock (useful for development and tests).
+"""
+
+import logging
+import threading
+from concurrent.futures import TimeoutError
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+_inline_lock = threading.Lock()
+
+
+class ChartRenderUnavailable(Exception):
+    """The renderer pool is saturated, timed out or crashed."""
+
+
+def _init_worker():
+    from . import chart_renderers
+    chart_renderers.warm_up()
+
+
+def _render_in_worker(chart, data, fmt):
+    from .chart_renderers import render_chart
+    return render_chart(chart, data, fmt)
+
+
+def _get_pool():
+    global _pool, _slots
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with _pool_lock:
+        if _pool is None:
+            workers = settings.CHART_RENDER_WORKERS
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            _slots = threading.BoundedSemaphore(settings.CHART_RENDER_MAX_PENDING)
+            # Start every renderer process now rather than on the first request
+            for _ in range(workers):
+                _pool.submit(int)
+        return _pool, _slots
+
+
+def shutdown_pool():
+    """Stop the renderer processes (a new pool is created on next use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def render(chart, data, fmt="png"):
+    """Render `chart` and return the encoded image bytes."""
+    if settings.CHART_RENDER_WORKERS <= 0:
+        from .chart_renderers import render_chart
+        with _inline_lock:  # pyplot is not thread-safe
+            return render_chart(chart, data, fmt)
+
+    from concurrent.futures.process import BrokenProcessPool
+
+    pool, slots = _get_pool()
+    if not slots.acquire(timeout=settings.CHART_RENDER_TIMEOUT):
+        raise ChartRenderUnavailable("chart render queue is full")
+
+    try:
+        future = pool.submit(_render_in_worker, chart, data, fmt)
+    except BrokenProcessPool as exc:
+        slots.release()
+        shutdown_pool()
+        raise ChartRenderUnavailable("chart renderer pool crashed") from exc
+    future.add_done_callback(lambda _: slots.release())
+
+    try:
+        return future.result(timeout=settings.CHART_RENDER_TIMEOUT)
+    except TimeoutError as exc:
+        # The slot stays taken until the worker actually finishes
+        raise ChartRenderUnavailable(f"rendering {chart} timed out") from exc
+    except BrokenProcessPool as exc:
+        logger.error("Chart renderer process died while rendering %s", chart)
+        shutdown_pool()
+        raise ChartRenderUnavailable("chart renderer pool crashed") from exc
@@ -0,0 +1,138 @@
+# accounts/chart_renderers.py
+"""
+Matplotlib drawing code for the server-side charts.
+
+Each renderer turns a plain data payload (lists/dicts from chart_data.py)
+into an encoded image. This module deliberately does not import Django:
+it is loaded inside the chart worker processes (see chart_pool.py), so
+web workers never have to import matplotlib themselves.
+"""
+
+from io import BytesIO
+
+import matplotlib
+
+matplotlib.use("Agg")  # Use non-GUI backend
+import matplotlib.pyplot as plt
+
+
+# =====================================================
+#  RENDERERS (data -> matplotlib figure)
+# =====================================================
+
+def draw_users_per_college(data):
+    """Bar chart of students per college."""
+    labels = data["labels"]
+    counts = data["counts"]
+
+    # Create the chart
+    fig, ax = plt.subplots(figsize=(10, 6), dpi=100)
+
+    # Bar chart with traject colors
+    bars = ax.bar(labels, counts, color="#FF6B35", edgecolor="#1A1A2E", linewidth=1.5)
+
+    # Styling
+    ax.set_title("Students per College", fontsize=16, fontweight="bold", color="#1A1A2E")
+    ax.set_xlabel("College", fontsize=12, color="#1A1A2E")
+    ax.set_ylabel("Number of Students", fontsize=12, color="#1A1A2E")
+    ax.tick_params(axis="x", rotation=45, labelsize=10)
+    ax.tick_params(axis="y", labelsize=10)
+
+    # Add count labels on top of bars
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height,
+                f'{int(height)}',
+                ha='center', va='bottom', fontsize=10)
+
+    # Grid for readability
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+
+    fig.tight_layout()
+    return fig, {"bbox_inches": "tight"}
+
+
+def draw_users_per_year(results):
+    """Pie chart of students per academic year."""
+    if not results:
+        # Return a blank chart if no data
+        fig, ax = plt.subplots(figsize=(8, 6))
+        ax.text(0.5, 0.5, 'No data available', ha='center', va='center', fontsize=16)
+        ax.axis('off')
+    else:
+        labels = [r["academic_year_name"] for r in results]
+        sizes = [r["count"] for r in results]
+
+        fig, ax = plt.subplots(figsize=(10, 7), dpi=100)
+
+        colors = ['#FF6B35', '#F7931E', '#FDC830', '#37B5A6', '#4ECDC4']
+        explode = [0.05] * len(labels)  # Slightly separate all slices
+
+        wedges, texts, autotexts = ax.pie(
+            sizes,
+            labels=labels,
+            autopct='%1.1f%%',
+            colors=colors,
+            explode=explode,
+            startangle=90,
+            textprops={'fontsize': 11}
+        )
+
+        # Make percentage text bold
+        for autotext in autotexts:
+            autotext.set_color('white')
+            autotext.set_fontweight('bold')
+
+        ax.set_title("Student Distribution by Academic Year",
+                     fontsize=16, fontweight="bold", pad=20)
+
+    fig.tight_layout()
+    return fig, {"bbox_inches": "tight"}
+
+
+def draw_majors_per_college(data):
+    """Bar chart of majors per college; `data` is a list of (name, count)."""
+    labels = [d[0] for d in data]
+    counts = [d[1] for d in data]
+
+    fig, ax = plt.subplots(figsize=(8, 4))
+    bars = ax.bar(labels, counts, color="#3b82f6")
+    ax.set_title("Majors per College", fontsize=14, weight="bold")
+    ax.set_xlabel("College")
+    ax.set_ylabel("Number of Majors")
+    ax.tick_params(axis="x", rotation=25)
+
+    for bar, c in zip(bars, counts):
+        ax.text(bar.get_x() + bar.get_width() / 2, c + 0.1, str(c),
+                ha="center", va="bottom", fontsize=9)
+
+    fig.tight_layout()
+    return fig, {"dpi": 150}
+
+
+CHART_RENDERERS = {
+    "users_per_college": draw_users_per_college,
+    "users_per_year": draw_users_per_year,
+    "majors_per_college": draw_majors_per_college,
+}
+
+
+def render_chart(chart, data, fmt="png"):
+    """Draw `chart` from `data` and return the encoded image bytes."""
+    fig, savefig_kwargs = CHART_RENDERERS[chart](data)
+
+    buf = BytesIO()
+    # Keep SVG text as <text> elements instead of outlined paths (much smaller)
+    with matplotlib.rc_context({"svg.fonttype": "none"}):
+        fig.savefig(buf, format=fmt, **savefig_kwargs)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def warm_up():
+    """Load pyplot and the font cache so the first real render is fast."""
+    fig, ax = plt.subplots(figsize=(1, 1))
+    ax.text(0.5, 0.5, "warm-up")
+    fig.savefig(BytesIO(), format="png")
+    plt.close(fig)
+    return True
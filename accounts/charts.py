@@ -0,0 +1,111 @@
+# accounts/charts.py
+"""
+Chart rendering service for the server-side matplotlib charts.
+
+Views pass a chart name plus the aggregated data from chart_data.py.
+The encoded image is cached (settings.CHART_CACHE_ALIAS) under a hash of
+that data and the render parameters, so matplotlib only runs when the
+numbers actually change. Responses carry ETag / Last-Modified and
+conditional GETs are answered with 304 Not Modified.
+
+The drawing itself lives in chart_renderers.py and runs in the renderer
+process pool from chart_pool.py, never in the web worker.
+"""
+
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from monitoring.metrics import CACHE_REQUESTS, CHART_RENDER_SECONDS
+
+from .chart_pool import ChartRenderUnavailable, render
+
+logger = logging.getLogger(__name__)
+
+# Bump when the drawing code changes so cached images are re-rendered
+CHART_STYLE_VERSION = 1
+
+CHART_FORMATS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+
+# =====================================================
+#  CACHED HTTP RESPONSE
+# =====================================================
+
+def chart_cache_key(chart, data, fmt):
+    """Hash of the chart name, render parameters and aggregated data."""
+    payload = json.dumps(
+        {"chart": chart, "fmt": fmt, "style": CHART_STYLE_VERSION, "data": data},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chart_format(request, default="png"):
+    """Output format from ?format=png|svg, falling back to `default`."""
+    fmt = (request.GET.get("format") or default).lower()
+    return fmt if fmt in CHART_FORMATS else default
+
+
+def prime_chart(chart, data, fmt="png"):
+    """Render `chart` into the cache unless it is already there. True if it rendered."""
+    key = chart_cache_key(chart, data, fmt)
+    cache = caches[settings.CHART_CACHE_ALIAS]
+    if cache.get(f"chart:{key}") is not None:
+        return False
+    image = render(chart, data, fmt)
+    cache.set(f"chart:{key}", (image, int(time.time())), settings.CHART_CACHE_TIMEOUT)
+    return True
+
+
+def chart_response(request, chart, data, fmt="png"):
+    """
+    Return the rendered chart, re-using a cached image when the data
+    and parameters are unchanged, or a 304 when the client has it already.
+    """
+    key = chart_cache_key(chart, data, fmt)
+    etag = f'"{key[:32]}"'
+    cache = caches[settings.CHART_CACHE_ALIAS]
+
+    cached = cache.get(f"chart:{key}")
+    last_modified = cached[1] if cached else None
+    CACHE_REQUESTS.inc(cache="chart", result="hit" if cached else "miss")
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        # Same ETag means same data + parameters, so the client's copy is current
+        not_modified["ETag"] = etag
+        patch_cache_control(not_modified, no_cache=True)
+        return not_modified
+
+    if cached:
+        image = cached[0]
+    else:
+        try:
+            with CHART_RENDER_SECONDS.time(chart=chart):
+                image = render(chart, data, fmt)
+        except ChartRenderUnavailable as exc:
+            logger.warning("Chart %s not rendered: %s", chart, exc)
+            response = HttpResponse("Chart is temporarily unavailable.", status=503,
+                                    content_type="text/plain")
+            response["Retry-After"] = "5"
+            return response
+        last_modified = int(time.time())
+        cache.set(f"chart:{key}", (image, last_modified), settings.CHART_CACHE_TIMEOUT)
+
+    response = HttpResponse(image, content_type=CHART_FORMATS[fmt])
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, no_cache=True)
+    return response
@@ -0,0 +1,209 @@
+# accounts/export_jobs.py
+"""
+Background export snapshots.
+
+The first download of an export for a given catalog version is streamed
+live and, at the same time, an ExportJob is queued to write the same
+export to MEDIA_ROOT/<EXPORT_SNAPSHOT_DIR>/<catalog version>/. Later
+downloads of an unchanged catalog are served from that file with Range
+support and no catalog queries.
+
+Jobs run on a small in-process thread pool (settings.EXPORT_JOB_THREADS)
+and/or via `python manage.py run_export_jobs`.
+"""
+
+import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.utils import timezone
+
+from catalog.version import get_catalog_version
+from monitoring.metrics import EXPORT_BYTES
+from .exports import (
+    CONTENT_TYPES,
+    EXPORT_DATASETS,
+    buffered_bytes,
+    dataset_chunks,
+    export_filename,
+    ranged_file_response,
+    streaming_export_response,
+)
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def snapshot_root() -> Path:
+    return Path(settings.MEDIA_ROOT) / settings.EXPORT_SNAPSHOT_DIR
+
+
+def artifact_relpath(dataset, fmt, version):
+    return f"{settings.EXPORT_SNAPSHOT_DIR}/{version}/traject_{dataset}.{fmt}"
+
+
+def artifact_path(dataset, fmt, version) -> Path:
+    return Path(settings.MEDIA_ROOT) / artifact_relpath(dataset, fmt, version)
+
+
+# =====================================================
+#  QUEUEING
+# =====================================================
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.EXPORT_JOB_THREADS,
+            thread_name_prefix="export-job",
+        )
+    return _executor
+
+
+def _run_in_thread(job_id):
+    try:
+        run_export_job(job_id)
+    finally:
+        # Each worker thread has its own DB connection
+        connection.close()
+
+
+def enqueue_export(dataset, fmt, version, run_async=True):
+    """
+    Make sure a snapshot job exists for (dataset, fmt, version).
+    Failed jobs, and finished jobs whose file has gone missing,
+    are reset to PENDING so they are retried. With run_async the job is
+    handed to the in-process thread pool (if enabled) after commit.
+    """
+    try:
+        job, created = ExportJob.objects.get_or_create(
+            dataset=dataset, fmt=fmt, catalog_version=version
+        )
+    except IntegrityError:
+        # Another request queued the same job at the same moment
+        return ExportJob.objects.get(dataset=dataset, fmt=fmt, catalog_version=version)
+
+    stale = job.status == 'FAILED' or (
+        job.status == 'DONE' and not artifact_path(dataset, fmt, version).exists()
+    )
+    if not created and stale:
+        ExportJob.objects.filter(pk=job.pk, status=job.status).update(status='PENDING', error='')
+        job.status = 'PENDING'
+        created = True
+
+    if created and run_async and settings.EXPORT_JOB_THREADS > 0:
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_thread, job.pk))
+    return job
+
+
+def enqueue_all_exports(version=None, run_async=True):
+    """Queue a snapshot of every dataset in every format."""
+    version = version or get_catalog_version()
+    return [
+        enqueue_export(dataset, fmt, version, run_async=run_async)
+        for dataset in EXPORT_DATASETS
+        for fmt in CONTENT_TYPES
+    ]
+
+
+# =====================================================
+#  WORKER
+# =====================================================
+
+def run_export_job(job_id):
+    """Build the snapshot file for one job. Returns False if it was already claimed."""
+    close_old_connections()
+
+    # Claim the job atomically so two workers never build the same file
+    claimed = ExportJob.objects.filter(pk=job_id, status='PENDING').update(
+        status='RUNNING', started_at=timezone.now()
+    )
+    if not claimed:
+        return False
+
+    job = ExportJob.objects.get(pk=job_id)
+    path = artifact_path(job.dataset, job.fmt, job.catalog_version)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as fh:
+            for block in buffered_bytes(dataset_chunks(job.dataset, job.fmt)):
+                fh.write(block)
+        os.replace(tmp_path, path)
+    except Exception as exc:
+        logger.exception("Export job %s failed", job_id)
+        tmp_path.unlink(missing_ok=True)
+        ExportJob.objects.filter(pk=job_id).update(
+            status='FAILED', error=str(exc), finished_at=timezone.now()
+        )
+        return True
+
+    ExportJob.objects.filter(pk=job_id).update(
+        status='DONE',
+        file_path=artifact_relpath(job.dataset, job.fmt, job.catalog_version),
+        size_bytes=path.stat().st_size,
+        finished_at=timezone.now(),
+    )
+    return True
+
+
+def run_pending_jobs():
+    """Run every PENDING job in this process. Returns the number built."""
+    built = 0
+    for job_id in ExportJob.objects.filter(status='PENDING').values_list('id', flat=True):
+        if run_export_job(job_id):
+            built += 1
+    return built
+
+
+def prune_snapshots(keep_version=None):
+    """Delete snapshot folders (and their jobs) for old catalog versions."""
+    keep_version = keep_version or get_catalog_version()
+    root = snapshot_root()
+    removed = 0
+    if root.exists():
+        for folder in root.iterdir():
+            if folder.is_dir() and folder.name != keep_version:
+                shutil.rmtree(folder, ignore_errors=True)
+                removed += 1
+    ExportJob.objects.exclude(catalog_version=keep_version).delete()
+    return removed
+
+
+# =====================================================
+#  DOWNLOAD
+# =====================================================
+
+def export_download_response(request, dataset, fmt):
+    """
+    Serve the snapshot for the current catalog version if it exists,
+    otherwise stream the export live and queue a snapshot for next time.
+    """
+    version = get_catalog_version()
+    path = artifact_path(dataset, fmt, version)
+
+    if path.exists():
+        response = ranged_file_response(
+            request,
+            path,
+            content_type=CONTENT_TYPES[fmt],
+            filename=export_filename(dataset, fmt),
+            etag=f'"{version}-{dataset}-{fmt}"',
+        )
+        # Counted when the response is built; live streams count per block
+        EXPORT_BYTES.inc(int(response.get("Content-Length", 0)), dataset=dataset, format=fmt)
+        return response
+
+    try:
+        enqueue_export(dataset, fmt, version)
+    except Exception:
+        # Queueing is an optimisation; never fail the download because of it
+        logger.exception("Could not queue export snapshot for %s.%s", dataset, fmt)
+    return streaming_export_response(request, dataset, fmt)
@@ -0,0 +1,286 @@
+# accounts/exports.py
+"""
+Streaming export engine for the CSV / NDJSON / JSON download endpoints.
+
+Rows are read with values_list() over queryset.iterator(), turned into text
+one row at a time and handed to a StreamingHttpResponse in ~64KB chunks,
+so memory stays flat no matter how many catalog rows are exported.
+Clients that send "Accept-Encoding: gzip" get the stream compressed on the fly.
+
+Finished snapshot files (see accounts/export_jobs.py) are served with
+ranged_file_response(), which supports single byte-range requests.
+"""
+
+import csv
+import json
+import os
+import re
+import zlib
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Value
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date
+
+from colleges.models import College
+from colleges.models import Course as CollegeCourse
+from monitoring.metrics import EXPORT_BYTES
+
+EXPORT_CHUNK_SIZE = 2000  # rows fetched per database round trip
+EXPORT_BUFFER_BYTES = 64 * 1024  # bytes accumulated before each yield
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+_ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+# =====================================================
+#  DATASETS
+# =====================================================
+
+def _courses_queryset():
+    return (
+        CollegeCourse.objects
+        .annotate(major_label=Coalesce("major__name", Value("N/A")))
+        .order_by("subject", "number")
+    )
+
+
+def _colleges_queryset():
+    return (
+        College.objects
+        .annotate(major_count=Count("majors"))
+        .order_by("abbreviation")
+    )
+
+
+# name -> queryset factory, CSV header/columns, JSON keys/columns
+EXPORT_DATASETS = {
+    "courses": {
+        "queryset": _courses_queryset,
+        "csv_header": ["Subject", "Number", "Title", "Credits", "Major"],
+        "csv_fields": ["subject", "number", "title", "credits", "major_label"],
+        "json_fields": [
+            "subject",
+            "number",
+            "title",
+            "credits",
+            "major__name",
+            "major__college__abbreviation",
+        ],
+    },
+    "colleges": {
+        "queryset": _colleges_queryset,
+        "csv_header": ["Abbreviation", "College Name", "City", "State", "Number of Majors"],
+        "csv_fields": ["abbreviation", "college_name", "city", "state", "major_count"],
+        "json_fields": [
+            "abbreviation",
+            "college_name",
+            "city",
+            "state",
+            "logo_url",
+            "major_count",
+        ],
+    },
+}
+
+
+def iter_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield plain tuples for `fields`, fetched `chunk_size` rows at a time."""
+    return queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+
+
+# =====================================================
+#  WRITERS
+# =====================================================
+
+class _Echo:
+    """File-like object whose write() just returns the line, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _json_line(keys, row):
+    return json.dumps(dict(zip(keys, row)), cls=DjangoJSONEncoder, separators=(",", ":"))
+
+
+def ndjson_chunks(keys, rows):
+    for row in rows:
+        yield _json_line(keys, row) + "\n"
+
+
+def json_document_chunks(collection, keys, rows):
+    """
+    Stream a single JSON object of the form
+    {"generated_at": ..., "<collection>": [...], "record_count": N}.
+    record_count is written last so it can be counted while streaming
+    instead of running a separate COUNT(*) query up front.
+    """
+    yield '{"generated_at":%s,"%s":[' % (json.dumps(datetime.now().isoformat()), collection)
+    count = 0
+    for row in rows:
+        yield ("," if count else "") + _json_line(keys, row)
+        count += 1
+    yield '],"record_count":%d}' % count
+
+
+def dataset_chunks(name, fmt, chunk_size=EXPORT_CHUNK_SIZE):
+    """Return the text chunks for exporting dataset `name` as `fmt`."""
+    dataset = EXPORT_DATASETS[name]
+    queryset = dataset["queryset"]()
+
+    if fmt == "csv":
+        rows = iter_rows(queryset, dataset["csv_fields"], chunk_size)
+        return csv_chunks(dataset["csv_header"], rows)
+
+    fields = dataset["json_fields"]
+    rows = iter_rows(queryset, fields, chunk_size)
+    if fmt == "ndjson":
+        return ndjson_chunks(fields, rows)
+    return json_document_chunks(name, fields, rows)
+
+
+# =====================================================
+#  RESPONSE
+# =====================================================
+
+def buffered_bytes(chunks, size=EXPORT_BUFFER_BYTES):
+    """Encode text chunks as UTF-8 and regroup them into blocks of ~`size` bytes."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk.encode("utf-8")
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def gzip_bytes(blocks):
+    """Compress a stream of byte blocks into a single gzip member."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def counted_bytes(blocks, dataset, fmt):
+    """Pass blocks through, adding their size to the export byte counter."""
+    for block in blocks:
+        EXPORT_BYTES.inc(len(block), dataset=dataset, format=fmt)
+        yield block
+
+
+def accepts_gzip(request):
+    return bool(_ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", "")))
+
+
+def export_filename(name, fmt):
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
+    return f"traject_{name}_{timestamp}.{fmt}"
+
+
+def streaming_export_response(request, name, fmt):
+    """Build a StreamingHttpResponse exporting dataset `name` in format `fmt`."""
+    blocks = buffered_bytes(dataset_chunks(name, fmt))
+
+    use_gzip = accepts_gzip(request)
+    if use_gzip:
+        blocks = gzip_bytes(blocks)
+    blocks = counted_bytes(blocks, name, fmt)
+
+    response = StreamingHttpResponse(blocks, content_type=CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{export_filename(name, fmt)}"'
+    response["Vary"] = "Accept-Encoding"
+    if use_gzip:
+        response["Content-Encoding"] = "gzip"
+    return response
+
+
+# =====================================================
+#  SNAPSHOT FILES (with Range support)
+# =====================================================
+
+def _parse_range(header, size):
+    """
+    Parse a single "bytes=start-end" range against a file of `size` bytes.
+    Returns (start, end) inclusive, None when the header should be ignored
+    (absent or multi-range), or "invalid" when it cannot be satisfied.
+    """
+    match = _BYTE_RANGE.match(header.strip()) if header else None
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return "invalid"
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return "invalid"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return "invalid"
+    return start, end
+
+
+def _file_slice(path, start, length, block_size=EXPORT_BUFFER_BYTES):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = fh.read(min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def ranged_file_response(request, path, content_type, filename, etag):
+    """Serve a file from disk, honouring a single Range header (206/416)."""
+    stat = os.stat(path)
+    size = stat.st_size
+
+    byte_range = _parse_range(request.META.get("HTTP_RANGE"), size)
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range and if_range != etag:
+        byte_range = None  # file changed since the client's partial copy
+
+    if byte_range == "invalid":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+    elif byte_range is None:
+        response = FileResponse(open(path, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _file_slice(path, start, length), status=206, content_type=content_type
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(length)
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
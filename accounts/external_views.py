@@ -4,7 +4,6 @@ External API Integration: GitHub API
 Allows searching for GitHub user profiles for portfolio/career research
 """
 
-import requests
 from django.views import View
 from django.shortcuts import render
 from django.http import JsonResponse
@@ -36,6 +35,9 @@ class GitHubUserAPIView(View):
 
         # Only search if username provided
         if username:
+            # Imported here so web workers don't pay for requests/urllib3 at startup
+            import requests
+
             try:
                 # Fetch user profile
                 user_response = requests.get(
@@ -0,0 +1,116 @@
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from benchmarks import runner
+from benchmarks.synthetic import Scale, generate
+from catalog.version import bump_catalog_version
+
+
+class Command(BaseCommand):
+    help = ('Benchmark get_all_recommendations / generate_roadmap / generate_summary '
+            'on synthetic catalogs in a throwaway in-memory SQLite database')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--careers', default='100,1000',
+            help='Comma-separated catalog sizes (number of careers), e.g. 100,1000,10000.'
+        )
+        parser.add_argument('--users', type=int, default=200, help='Students generated per scale.')
+        parser.add_argument('--profiles', type=int, default=10, help='Students timed per scale.')
+        parser.add_argument('--iterations', type=int, default=3, help='Timing passes over the profiles.')
+        parser.add_argument('--seed', type=int, default=390, help='Random seed for the dataset.')
+        parser.add_argument(
+            '--operation', action='append', choices=sorted(runner.OPERATIONS),
+            help='Only run this operation (can be repeated).'
+        )
+        parser.add_argument(
+            '--build-models', action='store_true',
+            help='Build the CF model on the synthetic data so the blended scoring path is timed.'
+        )
+        parser.add_argument('--output', help='Write the JSON report here.')
+        parser.add_argument('--compare', help='Baseline JSON report to compare p50 latencies against.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The benchmark needs a SQLite default database (it runs in memory).')
+        try:
+            sizes = [int(s) for s in options['careers'].split(',') if s.strip()]
+        except ValueError:
+            raise CommandError('--careers must be a comma-separated list of integers.')
+
+        report = {
+            'environment': runner.environment(),
+            'config': {
+                'users': options['users'],
+                'profiles': options['profiles'],
+                'iterations': options['iterations'],
+                'seed': options['seed'],
+                'build_models': options['build_models'],
+            },
+            'runs': [],
+        }
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            for careers in sizes:
+                scale = Scale.for_careers(careers, users=options['users'])
+                self.stdout.write(f'Scale: {careers} careers, {scale.users} students')
+                call_command('flush', interactive=False, verbosity=0)
+                report['runs'].append(self._run_scale(scale, options))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        for run in report['runs']:
+            self.stdout.write(f"\n{run['scale']['careers']} careers")
+            for name, stats in run['operations'].items():
+                self.stdout.write(
+                    f"  {name:<26} p50 {stats['p50_ms']:>9.2f} ms   p95 {stats['p95_ms']:>9.2f} ms   "
+                    f"{stats['queries']:>5} queries   {stats['peak_kb']:>9.1f} KB peak"
+                )
+
+        if options['output']:
+            runner.write_report(options['output'], report)
+            self.stdout.write(self.style.SUCCESS(f"\nReport written to {options['output']}"))
+
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text())
+            self.stdout.write('\nChange in p50 vs baseline:')
+            for careers, op, before, after, change in runner.compare_reports(baseline, report):
+                style = self.style.ERROR if change > 10 else self.style.SUCCESS
+                self.stdout.write(style(
+                    f'  {careers:>7} careers  {op:<26} {before:>9.2f} -> {after:>9.2f} ms  ({change:+.1f}%)'
+                ))
+
+    def _run_scale(self, scale, options):
+        # Published models and the catalog version file go to a temp dir, so
+        # the real ones are never touched
+        with tempfile.TemporaryDirectory() as tmp, override_settings(
+            RECOMMENDER_MODEL_DIR=Path(tmp) / 'models',
+            CATALOG_VERSION_FILE=Path(tmp) / 'catalog_version',
+        ):
+            start = time.perf_counter()
+            counts = generate(scale, seed=options['seed'])
+            bump_catalog_version()  # new skill vocabulary for this dataset
+            if options['build_models']:
+                from recommender.collab import build_model
+                build_model()
+            setup_seconds = time.perf_counter() - start
+
+            profiles = runner.sample_profiles(options['profiles'])
+            operations = runner.run_operations(
+                profiles, options['iterations'], operations=options['operation']
+            )
+
+        return {
+            'scale': scale.as_dict(),
+            'rows': counts,
+            'setup_seconds': round(setup_seconds, 2),
+            'operations': operations,
+        }
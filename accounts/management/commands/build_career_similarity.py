@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from recommender.similar_careers import build_similarity
+
+
+class Command(BaseCommand):
+    help = 'Precompute the top-N similar careers for every career (skill/industry overlap)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=None,
+            help='Neighbours kept per career (default: RECOMMENDER_SIMILAR_CAREERS).'
+        )
+
+    def handle(self, *args, **options):
+        stats = build_similarity(options['top'])
+        self.stdout.write(f"  {stats['careers']} career(s), {stats['neighbours']} neighbour link(s)")
+        self.stdout.write(self.style.SUCCESS(f"Career similarity written to {stats['path']}"))
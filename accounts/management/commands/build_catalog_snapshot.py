@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from recommender.catalog_snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Write the memory-mapped catalog snapshot shared by all workers'
+
+    def handle(self, *args, **options):
+        stats = build_snapshot()
+        self.stdout.write(
+            f"  {stats['careers']} career(s), {stats['portfolio_items']} portfolio item(s), "
+            f"{stats['courses']} course(s), {stats['clubs']} club(s)"
+        )
+        self.stdout.write(
+            f"  {stats['skills']} skill(s), {stats['strings']} distinct string(s), "
+            f"{stats['bytes'] / 1024:.0f} KB"
+        )
+        self.stdout.write(self.style.SUCCESS(f"Catalog snapshot {stats['source']} written to {stats['path']}"))
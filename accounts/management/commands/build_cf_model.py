@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from recommender.collab import build_model
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the item-item collaborative filtering model from checklists and career plans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--neighbours', type=int, default=None,
+            help='Similar items kept per item (default: RECOMMENDER_CF_NEIGHBOURS).'
+        )
+
+    def handle(self, *args, **options):
+        stats = build_model(options['neighbours'])
+        self.stdout.write(
+            f"  {stats['users']} student(s), {stats['items']} item(s), "
+            f"{stats['pairs']} similarity pair(s)"
+        )
+        self.stdout.write(self.style.SUCCESS(f"CF model written to {stats['path']}"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from recommender.peers import build_index
+
+
+class Command(BaseCommand):
+    help = 'Embed every student profile for the nearest-peer lookup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dim', type=int, default=None,
+            help='Vector width (default: PEER_EMBEDDING_DIM).'
+        )
+
+    def handle(self, *args, **options):
+        stats = build_index(options['dim'])
+        self.stdout.write(f"  {stats['profiles']} profile(s), {stats['dim']} dimensions")
+        self.stdout.write(self.style.SUCCESS(f"Peer index written to {stats['path']}"))
@@ -0,0 +1,87 @@
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.synthetic import BATCH_SIZE, Scale, generate
+from catalog.version import bump_catalog_version
+from colleges.models import College
+from colleges.rollups import rebuild_rollups
+from search.index import rebuild_index
+
+
+class Command(BaseCommand):
+    help = ('Generate a deterministic synthetic dataset (colleges, majors, courses, careers, '
+            'clubs, students, checklists, plans) for load testing')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Number of students.')
+        parser.add_argument('--careers', type=int, help='Number of careers (default: scaled from --users).')
+        parser.add_argument('--portfolio-items', type=int, help='Number of portfolio items (default: scaled).')
+        parser.add_argument('--colleges', type=int, help='Number of colleges (default: scaled).')
+        parser.add_argument('--majors-per-college', type=int, help='Majors per college (max 12).')
+        parser.add_argument('--courses-per-major', type=int, help='Recommended courses per major.')
+        parser.add_argument('--clubs-per-college', type=int, help='Clubs per college.')
+        parser.add_argument('--checklist-per-user', type=int, help='Checklist entries per student.')
+        parser.add_argument('--plans-per-user', type=int, help='Career plans per student.')
+        parser.add_argument('--seed', type=int, default=390, help='Random seed; same seed, same data.')
+        parser.add_argument(
+            '--prefix', default='gen',
+            help='Prefix for usernames and college abbreviations; must not have been used before.'
+        )
+        parser.add_argument(
+            '--password', default='demo123',
+            help='Password for every generated account (hashed once, shared by all).'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='Rows per INSERT and students per transaction.')
+        parser.add_argument(
+            '--skip-derived', action='store_true',
+            help="Don't rebuild rollups / the search index or bump the catalog version afterwards."
+        )
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if not prefix.isalnum():
+            raise CommandError('--prefix must be alphanumeric.')
+        if (User.objects.filter(username__startswith=f'{prefix.lower()}_').exists()
+                or College.objects.filter(abbreviation__regex=rf'^{prefix.upper()}[0-9]+$').exists()):
+            raise CommandError(f'Prefix "{prefix}" is already in use; pick another with --prefix.')
+
+        scale = Scale.for_users(options['users'])
+        for field in ('careers', 'portfolio_items', 'colleges', 'majors_per_college',
+                      'courses_per_major', 'clubs_per_college', 'checklist_per_user', 'plans_per_user'):
+            if options[field] is not None:
+                setattr(scale, field, options[field])
+
+        self.stdout.write('Generating: ' + ', '.join(f'{k}={v}' for k, v in scale.as_dict().items()))
+        start = time.perf_counter()
+        # Salt comes from the seed, so the same seed gives byte-identical rows
+        password = make_password(options['password'], salt=f"{prefix}{options['seed']}".ljust(12, 'x'))
+
+        def progress(done, total):
+            if done % (options['batch_size'] * 10) and done != total:
+                return
+            rate = done / max(time.perf_counter() - start, 1e-9)
+            self.stdout.write(f'  students: {done}/{total} ({rate:,.0f}/s)')
+
+        counts = generate(
+            scale, seed=options['seed'], prefix=prefix.upper(), password=password,
+            batch_size=options['batch_size'], progress=progress,
+        )
+        for table, rows in counts.items():
+            self.stdout.write(f'  {table}: {rows}')
+        self.stdout.write(f'Inserted in {time.perf_counter() - start:.1f}s')
+
+        if not options['skip_derived']:
+            # bulk_create skips the signals that normally keep these current
+            self.stdout.write('Rebuilding rollups and search index...')
+            rebuild_rollups()
+            rebuild_index()
+            bump_catalog_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated dataset in {time.perf_counter() - start:.1f}s "
+            f"(log in as {prefix.lower()}_0000001 / {options['password']})"
+        ))
@@ -0,0 +1,100 @@
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# Roughly what a web worker does before serving its first request
+BOOT_CODE = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+
+def parse_importtime(output):
+    """Parse `python -X importtime` stderr into a list of module timings."""
+    rows = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append({
+                "module": module,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": max(len(indent) - 1, 0) // 2,
+            })
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Report per-module import time (python -X importtime) for booting the URLconf'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=25, help='Number of modules to list.')
+        parser.add_argument(
+            '--sort', choices=['cumulative', 'self'], default='cumulative',
+            help='Sort modules by cumulative (default) or self import time.'
+        )
+        parser.add_argument('--json', dest='json_path', help='Also write the full report to this file.')
+
+    def handle(self, *args, **options):
+        env = os.environ.copy()
+        env['DJANGO_SETTINGS_MODULE'] = settings.SETTINGS_MODULE
+
+        # Fresh interpreter, so nothing is already imported
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_CODE],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        rows = parse_importtime(proc.stderr)
+        if proc.returncode != 0:
+            errors = [line for line in proc.stderr.splitlines() if not IMPORTTIME_LINE.match(line)]
+            raise CommandError('URLconf failed to import:\n' + '\n'.join(errors[-15:]))
+
+        # ru_maxrss is in KB on Linux
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        total_ms = sum(row['self_ms'] for row in rows)
+
+        packages = defaultdict(float)
+        for row in rows:
+            packages[row['module'].split('.')[0]] += row['self_ms']
+
+        key = 'cumulative_ms' if options['sort'] == 'cumulative' else 'self_ms'
+        top = sorted(rows, key=lambda row: row[key], reverse=True)[:options['top']]
+
+        self.stdout.write(f'Modules imported: {len(rows)}')
+        self.stdout.write(f'Total import time: {total_ms:.1f} ms')
+        self.stdout.write(f'Peak RSS of the boot process: {peak_rss_mb:.1f} MB')
+
+        self.stdout.write(f'\nTop {len(top)} modules by {options["sort"]} time:')
+        self.stdout.write(f'  {"cumulative":>10}  {"self":>8}  module')
+        for row in top:
+            self.stdout.write(
+                f'  {row["cumulative_ms"]:>8.1f}ms  {row["self_ms"]:>6.1f}ms  {row["module"]}'
+            )
+
+        self.stdout.write('\nSelf time by top-level package:')
+        for package, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:15]:
+            self.stdout.write(f'  {ms:>8.1f}ms  {package}')
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({
+                    'total_ms': total_ms,
+                    'peak_rss_mb': peak_rss_mb,
+                    'packages': dict(packages),
+                    'modules': rows,
+                }, fh, indent=2)
+            self.stdout.write(f'\nFull report written to {options["json_path"]}')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from colleges.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the analytics rollup tables (college, major and academic-year counts)'
+
+    def handle(self, *args, **options):
+        counts = rebuild_rollups()
+        for table, rows in counts.items():
+            self.stdout.write(f'  {table}: {rows} row(s)')
+        self.stdout.write(self.style.SUCCESS('Rollups rebuilt.'))
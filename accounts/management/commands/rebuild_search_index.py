@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from search.documents import SEARCH_SOURCES
+from search.index import rebuild_index, search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search documents (colleges, careers, courses, portfolio items)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind', action='append', choices=sorted(SEARCH_SOURCES),
+            help='Only rebuild this kind of document (can be repeated).'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Search backend: {search_backend()}')
+        counts = rebuild_index(options['kind'])
+        for kind, rows in counts.items():
+            self.stdout.write(f'  {kind}: {rows} document(s)')
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from accounts.export_jobs import enqueue_all_exports, prune_snapshots, run_pending_jobs
+from accounts.models import ExportJob
+from catalog.version import get_catalog_version
+
+
+class Command(BaseCommand):
+    help = 'Build pending export snapshots (courses/colleges CSV, JSON, NDJSON)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--snapshot', action='store_true',
+            help='Queue every export for the current catalog version first.'
+        )
+        parser.add_argument(
+            '--requeue', action='store_true',
+            help='Reset RUNNING and FAILED jobs to PENDING (e.g. after a crash).'
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='Delete snapshots that belong to older catalog versions.'
+        )
+
+    def handle(self, *args, **options):
+        version = get_catalog_version()
+        self.stdout.write(f'Catalog version: {version}')
+
+        if options['requeue']:
+            reset = ExportJob.objects.filter(status__in=['RUNNING', 'FAILED']).update(
+                status='PENDING', error=''
+            )
+            self.stdout.write(f'  Requeued {reset} job(s)')
+
+        if options['snapshot']:
+            jobs = enqueue_all_exports(version, run_async=False)
+            self.stdout.write(f'  Queued {len(jobs)} export(s)')
+
+        built = run_pending_jobs()
+        self.stdout.write(f'  Built {built} snapshot(s)')
+
+        if options['prune']:
+            removed = prune_snapshots(version)
+            self.stdout.write(f'  Removed {removed} old snapshot folder(s)')
+
+        self.stdout.write(self.style.SUCCESS('Export jobs finished.'))
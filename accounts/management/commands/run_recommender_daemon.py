@@ -0,0 +1,54 @@
+import signal
+import socket
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from recommender.daemon import RecommenderServer, RecommenderService
+
+
+def _stop(signum, frame):
+    """SIGTERM (systemd, supervisor) stops the server like Ctrl-C does."""
+    raise KeyboardInterrupt
+
+
+class Command(BaseCommand):
+    help = 'Serve recommendations from an in-memory catalog on a Unix socket'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket', default=None,
+            help='Socket path (default: RECOMMENDER_SOCKET).'
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['socket'] or settings.RECOMMENDER_SOCKET)
+        if path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(path))
+            except OSError:
+                path.unlink()  # left behind by a daemon that did not exit cleanly
+            else:
+                raise CommandError(f'A daemon is already listening on {path}')
+            finally:
+                probe.close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        service = RecommenderService()
+        service.warm()
+        catalog = service.catalog()
+        self.stdout.write(f'Catalog {catalog.version}: {len(catalog)} object(s) loaded')
+
+        server = RecommenderServer(path, service)
+        signal.signal(signal.SIGTERM, _stop)
+        self.stdout.write(self.style.SUCCESS(f'Recommender daemon listening on {path}'))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            path.unlink(missing_ok=True)
+        self.stdout.write('Recommender daemon stopped.')
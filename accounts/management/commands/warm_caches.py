@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from Assignment_Project_Om_opate22.warmup import warmup
+
+
+class Command(BaseCommand):
+    help = 'Load recommender indexes, compile templates and prime caches (run on deploy)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prime-colleges', action='store_true',
+            help='Also render missing per-college charts into the chart cache.'
+        )
+        parser.add_argument(
+            '--build-models', action='store_true',
+            help='Rebuild the CF model, peer index and career similarity first.'
+        )
+        parser.add_argument(
+            '--skip-templates', action='store_true',
+            help='Do not compile templates (they only live in this process anyway).'
+        )
+
+    def handle(self, *args, **options):
+        report = warmup(
+            prime_colleges=options['prime_colleges'] or None,
+            build_models=options['build_models'],
+            templates=not options['skip_templates'],
+        )
+        failed = 0
+        for step, outcome in report.items():
+            if 'error' in outcome:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"  {step:<15} FAILED {outcome['error']}"))
+            else:
+                self.stdout.write(f"  {step:<15} {outcome['ms']:>8.1f} ms  {outcome['result']}")
+        if failed:
+            self.stdout.write(self.style.WARNING(f'Warm-up finished with {failed} failed step(s).'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Warm-up finished.'))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_alter_userprofile_academic_year'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(choices=[('courses', 'Courses'), ('colleges', 'Colleges')], max_length=20)),
+                ('fmt', models.CharField(choices=[('csv', 'CSV'), ('json', 'JSON'), ('ndjson', 'NDJSON')], max_length=10)),
+                ('catalog_version', models.CharField(max_length=40)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=20)),
+                ('file_path', models.CharField(blank=True, max_length=255)),
+                ('size_bytes', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Export Job',
+                'verbose_name_plural': 'Export Jobs',
+                'ordering': ['-created_at'],
+                'unique_together': {('dataset', 'fmt', 'catalog_version')},
+            },
+        ),
+    ]
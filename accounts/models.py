@@ -91,6 +91,11 @@ class UserProfile(models.Model):
             return []
         return [i.strip() for i in self.personal_interests.split(',') if i.strip()]
 
+    def get_similar_peers(self, k=10, mode=None):
+        """Students with the most similar skills, interests and major (see recommender/peers.py)."""
+        from recommender.peers import nearest_peers
+        return nearest_peers(self, k=k, mode=mode)
+
 
 # =====================================================
 #  COURSE MODEL
@@ -395,11 +400,12 @@ class CareerPlan(models.Model):
 
     def get_progress_percentage(self):
         """Calculate overall progress towards this career goal."""
+        # Counted in Python so prefetch_related('plan_items') makes this free
         plan_items = self.plan_items.all()
         if not plan_items:
             return 0
-        completed = plan_items.filter(status='COMPLETED').count()
-        return int((completed / plan_items.count()) * 100)
+        completed = sum(1 for item in plan_items if item.status == 'COMPLETED')
+        return int((completed / len(plan_items)) * 100)
 
 
 class PlanItem(models.Model):
@@ -500,4 +506,61 @@ class PlanItem(models.Model):
         from django.utils import timezone
         self.status = 'COMPLETED'
         self.completed_at = timezone.now()
-        self.save()
\ No newline at end of file
+        self.save()
+
+# =====================================================
+#  EXPORT JOB MODEL
+# =====================================================
+
+class ExportJob(models.Model):
+    """
+    A snapshot of one export (e.g. courses as CSV) for one catalog version.
+    Built in the background by accounts/export_jobs.py and then served
+    straight from MEDIA_ROOT until the catalog changes.
+    """
+    DATASET_CHOICES = [
+        ('courses', 'Courses'),
+        ('colleges', 'Colleges'),
+    ]
+
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('json', 'JSON'),
+        ('ndjson', 'NDJSON'),
+    ]
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    dataset = models.CharField(max_length=20, choices=DATASET_CHOICES)
+    fmt = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    catalog_version = models.CharField(max_length=40)
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='PENDING'
+    )
+
+    # Path of the finished file, relative to MEDIA_ROOT
+    file_path = models.CharField(max_length=255, blank=True)
+    size_bytes = models.PositiveBigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        unique_together = ('dataset', 'fmt', 'catalog_version')
+        verbose_name = "Export Job"
+        verbose_name_plural = "Export Jobs"
+
+    def __str__(self):
+        return f"{self.dataset}.{self.fmt} @ {self.catalog_version} ({self.status})"
@@ -12,12 +12,14 @@ from django.utils import timezone
 from django.db.models import Count, Q
 
 from .models import PortfolioItem, UserChecklist
+from monitoring.queries import query_budget
 
 
 # =====================================================
 #  PORTFOLIO CHECKLIST VIEW
 # =====================================================
 
+@query_budget(16)
 @login_required
 def portfolio_checklist_view(request):
     """
@@ -237,6 +239,7 @@ def remove_from_checklist(request, checklist_id):
 #  BROWSE ALL PORTFOLIO ITEMS
 # =====================================================
 
+@query_budget(10)
 @login_required
 def browse_portfolio_items(request):
     """
@@ -0,0 +1,341 @@
+import base64
+import csv
+import gzip
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts import chart_data, chart_pool, charts
+from accounts.exports import streaming_export_response
+from accounts.models import CareerPlan, PlanItem, PortfolioItem, UserProfile
+from colleges.models import College, Course as CollegeCourse, Major
+from colleges.rollups import rebuild_rollups
+from monitoring.testing import QueryBudgetMixin, create_test_dataset
+
+
+class AccountsQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.profile = UserProfile.objects.select_related("user").order_by("pk").first()
+        cls.plan = CareerPlan.objects.filter(user_profile=cls.profile).first()
+        for item in PortfolioItem.objects.all()[:6]:
+            PlanItem.objects.create(career_plan=cls.plan, portfolio_item=item)
+
+    def setUp(self):
+        self.client.force_login(self.profile.user)
+
+    def test_dashboard(self):
+        self.assertViewWithinBudget(reverse("accounts:dashboard"))
+
+    def test_profile(self):
+        self.assertViewWithinBudget(reverse("accounts:profile"))
+
+    def test_user_list(self):
+        self.assertViewWithinBudget(reverse("accounts:user_list_http"))
+
+    def test_api_users(self):
+        self.assertViewWithinBudget(reverse("accounts:api_users"))
+
+    def test_reports(self):
+        self.assertViewWithinBudget(reverse("accounts:reports"))
+
+    def test_career_planning(self):
+        self.assertViewWithinBudget(reverse("accounts:career_planning"))
+
+    def test_career_plans_list(self):
+        self.assertViewWithinBudget(reverse("accounts:career_plans_list"))
+
+    def test_career_plan_detail(self):
+        self.assertViewWithinBudget(reverse("accounts:career_plan_detail", args=[self.plan.pk]))
+
+    def test_portfolio_checklist(self):
+        self.assertViewWithinBudget(reverse("accounts:portfolio_checklist"))
+
+    def test_browse_portfolio(self):
+        self.assertViewWithinBudget(reverse("accounts:browse_portfolio"))
+
+
+class WarmCachesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+
+    def test_every_step_succeeds(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                override_settings(RECOMMENDER_MODEL_DIR=Path(tmp) / "models",
+                                  CATALOG_VERSION_FILE=Path(tmp) / "catalog_version"):
+            out = StringIO()
+            call_command("warm_caches", stdout=out)
+        self.assertNotIn("FAILED", out.getvalue())
+        self.assertIn("'catalog_snapshot': True", out.getvalue())
+        self.assertIn("templates", out.getvalue())
+
+
+class GenerateDatasetTests(TestCase):
+    options = dict(users=3, careers=5, portfolio_items=5, colleges=1, majors_per_college=2,
+                   courses_per_major=2, clubs_per_college=1, password="pw", stdout=StringIO())
+
+    def test_generates_accounts_that_can_log_in(self):
+        call_command("generate_dataset", prefix="demo", **self.options)
+        self.assertEqual(UserProfile.objects.count(), 3)
+        self.assertTrue(self.client.login(username="demo_0000001", password="pw"))
+
+    def test_refuses_a_used_prefix(self):
+        call_command("generate_dataset", prefix="demo", skip_derived=True, **self.options)
+        users = User.objects.count()
+        with self.assertRaisesMessage(CommandError, 'Prefix "demo" is already in use'):
+            call_command("generate_dataset", prefix="demo", **self.options)
+        self.assertEqual(User.objects.count(), users)
+
+        College.objects.create(college_name="Existing", abbreviation="OLD7")
+        with self.assertRaisesMessage(CommandError, "already in use"):
+            call_command("generate_dataset", prefix="old", **self.options)
+
+    def test_refuses_a_prefix_that_is_not_alphanumeric(self):
+        with self.assertRaisesMessage(CommandError, "alphanumeric"):
+            call_command("generate_dataset", prefix="a_b", **self.options)
+
+
+class UsersAPITests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.usernames = list(
+            UserProfile.objects.order_by("user__username", "user__id")
+            .values_list("user__username", flat=True)
+        )
+
+    def get(self, **params):
+        return self.client.get(reverse("accounts:api_users"), params)
+
+    def test_cursor_round_trip_visits_every_user_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            payload = self.get(**params).json()
+            # The total is counted once, on the first page
+            self.assertEqual(payload["count"], None if cursor else len(self.usernames))
+            seen.extend(row["username"] for row in payload["results"])
+            cursor = payload["next"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.usernames)
+
+    def test_cursor_pages_do_not_count(self):
+        cursor = self.get(limit=1).json()["next"]
+        with CaptureQueriesContext(connection) as queries:
+            self.get(limit=1, cursor=cursor)
+        self.assertFalse([q["sql"] for q in queries.captured_queries if "COUNT(" in q["sql"]])
+
+    def test_invalid_and_tampered_cursors_are_rejected(self):
+        valid = self.get(limit=1).json()["next"]
+        truncated = valid[:len(valid) // 2]
+        wrong_types = base64.urlsafe_b64encode(b'["a","1"]').decode()
+        for cursor in ("not-a-cursor", "W10", truncated, wrong_types):
+            with self.subTest(cursor=cursor):
+                response = self.get(cursor=cursor)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["error"], "Invalid cursor.")
+
+    def test_bad_limit(self):
+        self.assertEqual(self.get(limit="ten").status_code, 400)
+
+    def test_filters(self):
+        profile = UserProfile.objects.select_related("college", "major").order_by("pk").first()
+        cases = {
+            "college": (profile.college.abbreviation, {"college": profile.college}),
+            "major": (str(profile.major_id), {"major": profile.major}),
+            "academic_year": (profile.academic_year.lower(), {"academic_year": profile.academic_year}),
+            "q": (profile.user.username, {"user__username__icontains": profile.user.username}),
+        }
+        for param, (value, lookup) in cases.items():
+            with self.subTest(param=param):
+                payload = self.get(**{param: value}).json()
+                expected = UserProfile.objects.filter(**lookup).count()
+                self.assertEqual(payload["count"], expected)
+                self.assertEqual(len(payload["results"]), min(expected, 20))
+                self.assertIn(profile.user.username, [r["username"] for r in payload["results"]])
+
+
+class StreamingExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        major = Major.objects.order_by("pk").first()
+        CollegeCourse.objects.bulk_create(
+            CollegeCourse(subject="CS", number=str(100 + i), title=f"Course, \"{i}\"",
+                          major=major if i % 2 else None)
+            for i in range(30)
+        )
+
+    def export(self, name, fmt, **headers):
+        request = RequestFactory().get("/", **headers)
+        response = streaming_export_response(request, name, fmt)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content)
+
+    def test_csv_has_header_and_one_line_per_row(self):
+        response, body = self.export("courses", "csv")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("attachment;", response["Content-Disposition"])
+        rows = list(csv.reader(body.decode().splitlines()))
+        self.assertEqual(rows[0], ["Subject", "Number", "Title", "Credits", "Major"])
+        self.assertEqual(len(rows) - 1, CollegeCourse.objects.count())
+
+    def test_json_document_counts_while_streaming(self):
+        _, body = self.export("colleges", "json")
+        document = json.loads(body)
+        self.assertEqual(document["record_count"], College.objects.count())
+        self.assertEqual(len(document["colleges"]), document["record_count"])
+        self.assertIn("major_count", document["colleges"][0])
+
+    def test_ndjson_is_one_object_per_line(self):
+        _, body = self.export("courses", "ndjson")
+        lines = body.decode().splitlines()
+        self.assertEqual(len(lines), CollegeCourse.objects.count())
+        self.assertEqual(set(json.loads(lines[0])), {
+            "subject", "number", "title", "credits",
+            "major__name", "major__college__abbreviation",
+        })
+
+    def test_gzip_when_accepted(self):
+        _, plain = self.export("courses", "ndjson")
+        response, body = self.export("courses", "ndjson", HTTP_ACCEPT_ENCODING="br, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body), plain)
+
+
+class ChartDataTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        rebuild_rollups()
+
+    def assertMatchesProfiles(self):
+        per_college = dict(
+            College.objects.annotate(n=Count("students")).values_list("abbreviation", "n")
+        )
+        data = chart_data.users_per_college()
+        self.assertEqual(dict(zip(data["labels"], data["counts"])), per_college)
+
+        per_year = dict(
+            UserProfile.objects.values("academic_year").annotate(n=Count("pk"))
+            .values_list("academic_year", "n")
+        )
+        self.assertEqual(
+            {r["academic_year_code"]: r["count"] for r in chart_data.users_per_academic_year()},
+            per_year,
+        )
+
+    def test_rollups_match_direct_counts(self):
+        self.assertMatchesProfiles()
+
+    def test_new_profile_is_counted(self):
+        college = College.objects.order_by("pk").first()
+        user = User.objects.create_user("chart-student", password="x")
+        UserProfile.objects.create(user=user, college=college, academic_year="GR")
+        self.assertMatchesProfiles()
+
+    def test_reports_total_counts_every_profile(self):
+        user = User.objects.create_user("no-college", password="x")
+        UserProfile.objects.create(user=user)
+        self.client.force_login(user)
+        response = self.client.get(reverse("accounts:reports"))
+        self.assertEqual(response.context["total_users"], UserProfile.objects.count())
+
+    def test_api_serves_the_same_data(self):
+        response = self.client.get(reverse("accounts:api_users_per_college"))
+        self.assertEqual(response.json(), json.loads(json.dumps(chart_data.users_per_college())))
+        response = self.client.get(reverse("accounts:api_users_per_academic_year"))
+        self.assertEqual(response.json()["results"], chart_data.users_per_academic_year())
+
+
+@override_settings(CHART_RENDER_WORKERS=0)
+class ChartCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        rebuild_rollups()
+
+    def setUp(self):
+        caches[settings.CHART_CACHE_ALIAS].clear()
+        self.url = reverse("accounts:chart_users_per_college_png")
+
+    def test_conditional_get_returns_304(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["Content-Type"], "image/png")
+        self.assertTrue(first.content.startswith(b"\x89PNG"))
+
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again["ETag"], first["ETag"])
+
+    def test_image_is_cached_until_the_data_changes(self):
+        with mock.patch("accounts.charts.render", wraps=charts.render) as render:
+            first = self.client.get(self.url)
+            cached = self.client.get(self.url)
+            self.assertEqual(cached.content, first.content)
+            self.assertEqual(render.call_count, 1)
+
+            user = User.objects.create_user("chart-student", password="x")
+            UserProfile.objects.create(user=user, college=College.objects.order_by("pk").first())
+            changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(changed.status_code, 200)
+            self.assertNotEqual(changed["ETag"], first["ETag"])
+            self.assertEqual(render.call_count, 2)
+
+
+class ChartPoolTests(TestCase):
+    DATA = {"labels": ["A", "B"], "counts": [3, 5], "details": []}
+
+    def setUp(self):
+        caches[settings.CHART_CACHE_ALIAS].clear()
+        self.addCleanup(chart_pool.shutdown_pool)
+
+    @override_settings(CHART_RENDER_WORKERS=1, CHART_RENDER_MAX_PENDING=1, CHART_RENDER_TIMEOUT=0.001)
+    def test_slow_render_times_out(self):
+        with self.assertRaisesMessage(chart_pool.ChartRenderUnavailable, "timed out"):
+            chart_pool.render("users_per_college", self.DATA)
+
+    @override_settings(CHART_RENDER_WORKERS=1, CHART_RENDER_MAX_PENDING=1, CHART_RENDER_TIMEOUT=0.001)
+    def test_full_queue_is_refused(self):
+        _, slots = chart_pool._get_pool()
+        slots.acquire()
+        self.addCleanup(slots.release)
+        with self.assertRaisesMessage(chart_pool.ChartRenderUnavailable, "queue is full"):
+            chart_pool.render("users_per_college", self.DATA)
+
+    @override_settings(CHART_RENDER_WORKERS=1, CHART_RENDER_TIMEOUT=30)
+    def test_pool_renders(self):
+        image = chart_pool.render("users_per_college", self.DATA, "svg")
+        self.assertIn(b"<svg", image)
+
+    def test_unavailable_renderer_answers_503_and_caches_nothing(self):
+        url = reverse("accounts:chart_users_per_college_png")
+        unavailable = chart_pool.ChartRenderUnavailable("chart render queue is full")
+        with mock.patch("accounts.charts.render", side_effect=unavailable), \
+                self.assertLogs("accounts.charts", "WARNING"):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "5")
+
+        with override_settings(CHART_RENDER_WORKERS=0):
+            self.assertEqual(self.client.get(url).status_code, 200)
@@ -66,9 +66,13 @@ urlpatterns = [
     #  CHART ENDPOINTS (Week 9)
     # =====================================================
 
-    # --- Chart PNG Images (Server-Generated) ---
+    # --- Chart Images (Server-Generated, cached) ---
     path("charts/users-per-college.png", users_per_college_chart_png, name="chart_users_per_college_png"),
     path("charts/users-per-year.png", users_per_year_chart_png, name="chart_users_per_year_png"),
+    path("charts/users-per-college.svg", users_per_college_chart_png, {"fmt": "svg"},
+         name="chart_users_per_college_svg"),
+    path("charts/users-per-year.svg", users_per_year_chart_png, {"fmt": "svg"},
+         name="chart_users_per_year_svg"),
 
     # --- Chart Pages (Templates that display the charts) ---
     path("charts/users-per-college/", UsersChartPage.as_view(), name="chart_users_per_college_page"),
@@ -132,6 +136,10 @@ urlpatterns = [
     path("export/courses.json", views.export_courses_json, name="export_courses_json"),
     path("export/colleges.json", views.export_colleges_json, name="export_colleges_json"),
 
+    # NDJSON Exports
+    path("export/courses.ndjson", views.export_courses_ndjson, name="export_courses_ndjson"),
+    path("export/colleges.ndjson", views.export_colleges_ndjson, name="export_colleges_ndjson"),
+
     # =====================================================
     #  CAREER PLANNING
     # =====================================================
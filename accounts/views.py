@@ -7,29 +7,29 @@ from django.contrib.auth.models import User
 from django.contrib import messages
 from django.contrib.auth import login, authenticate, logout
 from django.http import HttpResponse, JsonResponse
-from django.db.models import Q, Count
+from django.db.models import Q
+from django.db.models.functions import Coalesce
 from django.template import loader
 from django.views import View
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin  # NEW FOR A11
+from django.conf import settings
 
 from .models import UserProfile, Club, CareerPath, CareerPlan, PlanItem, Course
 from .forms import SignupForm, LoginForm, UserProfileForm
 from .forms_auth import TrajectSignUpForm  # NEW FOR A11
+from . import chart_data
 from colleges.models import College, Major
 
 # NEW IMPORTS for Week 9 (APIs + Charts)
+import base64
+import binascii
 import json
-import urllib.request
-from io import BytesIO
-import matplotlib
-
-matplotlib.use("Agg")  # Use non-GUI backend
-import matplotlib.pyplot as plt
+from .charts import chart_format, chart_response
 
 # NEW IMPORTS for A11 (CSV/JSON Exports)
-import csv
-from datetime import datetime
+from .export_jobs import export_download_response
+from monitoring.queries import query_budget
 
 
 # =====================================================
@@ -107,6 +107,7 @@ def logout_view(request):
 #  ENHANCED DASHBOARD VIEW
 # =====================================================
 
+@query_budget(30)
 @login_required
 def dashboard_view(request):
     """
@@ -211,6 +212,7 @@ def choose_college_view(request):
 #  PROFILE VIEWS
 # =====================================================
 
+@query_budget(10)
 @login_required
 def profile_view(request, username=None):
     """
@@ -243,6 +245,7 @@ def edit_profile_view(request):
 #  USER LIST & COLLEGE SHORTCUT
 # =====================================================
 
+@query_budget(8)
 @login_required
 def user_list_http(request):
     """Render a basic list of all users (for debugging/demo)."""
@@ -265,6 +268,131 @@ def set_college(request, college_id):
     return redirect("colleges:detail", pk=college.id)
 
 
+# =====================================================
+#  USERS API PAGINATION (keyset on username, id)
+# =====================================================
+
+USERS_API_MAX_LIMIT = 100
+
+USERS_API_FIELDS = (
+    "user__id",
+    "user__username",
+    "user__email",
+    "college__abbreviation",
+    "major__name",
+    "academic_year",
+    "gpa",
+)
+
+
+def _encode_users_cursor(username, user_id):
+    """Pack the last (username, id) of a page into an opaque URL-safe token."""
+    raw = json.dumps([username, user_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_users_cursor(cursor):
+    """Inverse of _encode_users_cursor. Raises ValueError on a malformed token."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        username, user_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (TypeError, ValueError, binascii.Error) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    if not isinstance(username, str) or not isinstance(user_id, int):
+        raise ValueError("Invalid cursor.")
+    return username, user_id
+
+
+def _users_page_response(request, search_fields, include_year=False):
+    """
+    Shared implementation for api_users and UsersAPI.
+    Reads straight from UserProfile with values(), so users without a
+    profile are skipped and no model instances are built. Pages are keyed
+    on (username, id): each page is one indexed range scan, no OFFSET.
+    `count` is the total number of matching users on the first page only
+    (one COUNT per listing, not per page) and null on cursor pages; the
+    page length is len(results).
+    """
+    params = request.GET
+
+    try:
+        limit = int(params.get("limit") or settings.ITEMS_PER_PAGE)
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer."}, status=400)
+    limit = max(1, min(limit, USERS_API_MAX_LIMIT))
+
+    profiles = UserProfile.objects.all()
+
+    q = (params.get("q") or "").strip()
+    if q:
+        search = Q()
+        for field in search_fields:
+            search |= Q(**{f"user__{field}__icontains": q})
+        profiles = profiles.filter(search)
+
+    college = (params.get("college") or "").strip()
+    if college:
+        if college.isdigit():
+            profiles = profiles.filter(college_id=int(college))
+        else:
+            profiles = profiles.filter(college__abbreviation__iexact=college)
+
+    major = (params.get("major") or "").strip()
+    if major:
+        if major.isdigit():
+            profiles = profiles.filter(major_id=int(major))
+        else:
+            profiles = profiles.filter(major__name__iexact=major)
+
+    academic_year = (params.get("academic_year") or "").strip().upper()
+    if academic_year:
+        profiles = profiles.filter(academic_year=academic_year)
+
+    cursor = params.get("cursor")
+    total = None
+    if not cursor:
+        total = profiles.count()
+    else:
+        try:
+            last_username, last_id = _decode_users_cursor(cursor)
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        profiles = profiles.filter(
+            Q(user__username__gt=last_username) |
+            Q(user__username=last_username, user__id__gt=last_id)
+        )
+
+    # Fetch one extra row to know whether another page exists
+    rows = list(
+        profiles
+        .order_by("user__username", "user__id")
+        .values(*USERS_API_FIELDS)[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    year_labels = dict(UserProfile.ACADEMIC_YEARS)
+    data = []
+    for row in rows:
+        item = {
+            "id": row["user__id"],
+            "username": row["user__username"],
+            "email": row["user__email"],
+            "college": row["college__abbreviation"],
+            "major": row["major__name"],
+        }
+        if include_year:
+            item["academic_year"] = year_labels.get(row["academic_year"], row["academic_year"])
+        item["gpa"] = float(row["gpa"]) if row["gpa"] else None
+        data.append(item)
+
+    next_cursor = None
+    if has_more:
+        next_cursor = _encode_users_cursor(rows[-1]["user__username"], rows[-1]["user__id"])
+
+    return JsonResponse({"count": total, "next": next_cursor, "results": data})
+
+
 # =====================================================
 #  JSON API ENDPOINTS (Week 9 - Function-Based)
 # =====================================================
@@ -286,42 +414,25 @@ def api_ping_jsonresponse(request):
     return JsonResponse({"ok": True, "message": "Ping successful using JsonResponse"})
 
 
+@query_budget(5)
 def api_users(request):
     """
     GET /api/users/
-    Returns a list of all users with their profile information.
-    Optional query parameter: ?q=<search_term>
-    """
-    q = (request.GET.get("q") or "").strip()
-
-    users = User.objects.select_related("profile__college", "profile__major")
-
-    if q:
-        users = users.filter(
-            Q(username__icontains=q) |
-            Q(email__icontains=q) |
-            Q(first_name__icontains=q) |
-            Q(last_name__icontains=q)
-        )
-
-    data = []
-    for user in users.order_by("username"):
-        # Skip users without profiles (like superusers)
-        if not hasattr(user, 'profile'):
-            continue
-
-        profile = user.profile
-        data.append({
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "college": profile.college.abbreviation if profile.college else None,
-            "major": profile.major.name if profile.major else None,
-            "academic_year": profile.get_academic_year_display(),
-            "gpa": float(profile.gpa) if profile.gpa else None,
-        })
-
-    return JsonResponse({"count": len(data), "results": data})
+    Returns one page of users with their profile information.
+    Optional query parameters:
+      ?q=<search_term>           search username, email, first/last name
+      ?college=<id|abbreviation> filter by college
+      ?major=<id|name>           filter by major
+      ?academic_year=<FR|SO|JR|SR|GR>
+      ?limit=<page size>         defaults to ITEMS_PER_PAGE
+      ?cursor=<next cursor>      continue from a previous page
+    Response: {"count": <total matches, first page only>, "next": <cursor|null>, "results": [...]}
+    """
+    return _users_page_response(
+        request,
+        search_fields=("username", "email", "first_name", "last_name"),
+        include_year=True,
+    )
 
 
 def api_users_per_college(request):
@@ -330,22 +441,7 @@ def api_users_per_college(request):
     Returns the count of users per college (aggregated data).
     Perfect for creating bar charts!
     """
-    rows = (
-        College.objects
-        .annotate(user_count=Count("students"))
-        .values("abbreviation", "college_name", "user_count")
-        .order_by("abbreviation")
-    )
-
-    # Format for easy charting
-    labels = [r["abbreviation"] for r in rows]
-    counts = [r["user_count"] for r in rows]
-
-    return JsonResponse({
-        "labels": labels,
-        "counts": counts,
-        "details": list(rows)
-    })
+    return JsonResponse(chart_data.users_per_college())
 
 
 def api_users_per_academic_year(request):
@@ -353,24 +449,7 @@ def api_users_per_academic_year(request):
     GET /api/users/academic-year/
     Returns count of users per academic year (Freshman, Sophomore, etc.)
     """
-    rows = (
-        UserProfile.objects
-        .values("academic_year")
-        .annotate(count=Count("id"))
-        .order_by("academic_year")
-    )
-
-    # Create readable labels
-    year_labels = dict(UserProfile.ACADEMIC_YEARS)
-    results = []
-    for r in rows:
-        results.append({
-            "academic_year_code": r["academic_year"],
-            "academic_year_name": year_labels.get(r["academic_year"], r["academic_year"]),
-            "count": r["count"]
-        })
-
-    return JsonResponse({"results": results})
+    return JsonResponse({"results": chart_data.users_per_academic_year()})
 
 
 def api_courses_per_major(request):
@@ -378,14 +457,7 @@ def api_courses_per_major(request):
     GET /api/courses/per-major/
     Returns the count of courses available per major.
     """
-    rows = (
-        Major.objects
-        .annotate(course_count=Count("courses"))
-        .values("name", "code", "course_count")
-        .order_by("name")
-    )
-
-    return JsonResponse({"results": list(rows)})
+    return JsonResponse({"results": chart_data.courses_per_major()})
 
 
 def api_clubs_per_college(request):
@@ -393,14 +465,7 @@ def api_clubs_per_college(request):
     GET /api/clubs/per-college/
     Returns the count of clubs per college.
     """
-    rows = (
-        College.objects
-        .annotate(club_count=Count("clubs"))
-        .values("abbreviation", "college_name", "club_count")
-        .order_by("abbreviation")
-    )
-
-    return JsonResponse({"results": list(rows)})
+    return JsonResponse({"results": chart_data.clubs_per_college()})
 
 
 # =====================================================
@@ -415,136 +480,31 @@ class UsersAPI(View):
     """
 
     def get(self, request):
-        q = (request.GET.get("q") or "").strip()
-
-        users = User.objects.select_related("profile__college", "profile__major")
-
-        if q:
-            users = users.filter(
-                Q(username__icontains=q) |
-                Q(email__icontains=q)
-            )
-
-        data = []
-        for user in users.order_by("username"):
-            profile = user.profile
-            data.append({
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "college": profile.college.abbreviation if profile.college else None,
-                "major": profile.major.name if profile.major else None,
-                "gpa": float(profile.gpa) if profile.gpa else None,
-            })
-
-        return JsonResponse({"count": len(data), "results": data})
+        return _users_page_response(request, search_fields=("username", "email"))
 
 
 # =====================================================
 #  CHART GENERATION (Server-Side)
 # =====================================================
 
-def users_per_college_chart_png(request):
+def users_per_college_chart_png(request, fmt="png"):
     """
-    Generates a PNG bar chart showing users per college.
+    Generates a bar chart showing users per college.
     This view:
-    1. Fetches data from our own JSON API
-    2. Uses matplotlib to create a chart
-    3. Returns the chart as a PNG image (HttpResponse)
+    1. Reads the same aggregated data as the JSON API (chart_data)
+    2. Uses matplotlib to create a chart (cached until the data changes)
+    3. Returns the chart as a PNG (or SVG with ?format=svg) image
     """
-    # Build the full URL to our API endpoint
-    api_url = request.build_absolute_uri('/accounts/api/colleges/users/')
-    # Fetch data from our API
-    with urllib.request.urlopen(api_url) as response:
-        data = json.load(response)
-
-    labels = data["labels"]
-    counts = data["counts"]
-
-    # Create the chart
-    fig, ax = plt.subplots(figsize=(10, 6), dpi=100)
-
-    # Bar chart with traject colors
-    bars = ax.bar(labels, counts, color="#FF6B35", edgecolor="#1A1A2E", linewidth=1.5)
-
-    # Styling
-    ax.set_title("Students per College", fontsize=16, fontweight="bold", color="#1A1A2E")
-    ax.set_xlabel("College", fontsize=12, color="#1A1A2E")
-    ax.set_ylabel("Number of Students", fontsize=12, color="#1A1A2E")
-    ax.tick_params(axis="x", rotation=45, labelsize=10)
-    ax.tick_params(axis="y", labelsize=10)
-
-    # Add count labels on top of bars
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width() / 2., height,
-                f'{int(height)}',
-                ha='center', va='bottom', fontsize=10)
-
-    # Grid for readability
-    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    data = chart_data.users_per_college()
+    return chart_response(request, "users_per_college", data, chart_format(request, fmt))
 
-    fig.tight_layout()
 
-    # Save to BytesIO buffer
-    buf = BytesIO()
-    fig.savefig(buf, format="png", bbox_inches='tight')
-    plt.close(fig)
-    buf.seek(0)
-
-    return HttpResponse(buf.getvalue(), content_type="image/png")
-
-
-def users_per_year_chart_png(request):
+def users_per_year_chart_png(request, fmt="png"):
     """
-    Generates a PNG pie chart showing distribution of students by academic year.
+    Generates a pie chart showing distribution of students by academic year.
     """
-    api_url = request.build_absolute_uri('/accounts/api/users/academic-year/')
-    with urllib.request.urlopen(api_url) as response:
-        data = json.load(response)
-
-    results = data["results"]
-
-    if not results:
-        # Return a blank chart if no data
-        fig, ax = plt.subplots(figsize=(8, 6))
-        ax.text(0.5, 0.5, 'No data available', ha='center', va='center', fontsize=16)
-        ax.axis('off')
-    else:
-        labels = [r["academic_year_name"] for r in results]
-        sizes = [r["count"] for r in results]
-
-        fig, ax = plt.subplots(figsize=(10, 7), dpi=100)
-
-        colors = ['#FF6B35', '#F7931E', '#FDC830', '#37B5A6', '#4ECDC4']
-        explode = [0.05] * len(labels)  # Slightly separate all slices
-
-        wedges, texts, autotexts = ax.pie(
-            sizes,
-            labels=labels,
-            autopct='%1.1f%%',
-            colors=colors,
-            explode=explode,
-            startangle=90,
-            textprops={'fontsize': 11}
-        )
-
-        # Make percentage text bold
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-
-        ax.set_title("Student Distribution by Academic Year",
-                     fontsize=16, fontweight="bold", pad=20)
-
-    fig.tight_layout()
-
-    buf = BytesIO()
-    fig.savefig(buf, format="png", bbox_inches='tight')
-    plt.close(fig)
-    buf.seek(0)
-
-    return HttpResponse(buf.getvalue(), content_type="image/png")
+    results = chart_data.users_per_academic_year()
+    return chart_response(request, "users_per_year", results, chart_format(request, fmt))
 
 
 # =====================================================
@@ -568,6 +528,8 @@ class AcademicYearChartPage(TemplateView):
 # =====================================================
 #  CSV EXPORT VIEWS (Assignment 11)
 # =====================================================
+# Exports are served from a cached snapshot of the current catalog
+# version when one exists, otherwise streamed live (accounts/export_jobs.py).
 
 @login_required(login_url='accounts:login')
 def export_courses_csv(request):
@@ -576,34 +538,7 @@ def export_courses_csv(request):
     Useful for students planning their course schedules.
     Returns a downloadable CSV file with timestamp.
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
-    filename = f"traject_courses_{timestamp}.csv"
-
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-    writer = csv.writer(response)
-    # Header row
-    writer.writerow(["Subject", "Number", "Title", "Credits", "Major"])
-
-    # Get all courses from colleges.Course
-    from colleges.models import Course as CollegeCourse
-    courses = (
-        CollegeCourse.objects
-        .select_related("major")
-        .order_by("subject", "number")
-    )
-
-    for course in courses:
-        writer.writerow([
-            course.subject,
-            course.number,
-            course.title,
-            str(course.credits),
-            course.major.name if course.major else "N/A"
-        ])
-
-    return response
+    return export_download_response(request, "courses", "csv")
 
 
 @login_required(login_url='accounts:login')
@@ -613,32 +548,7 @@ def export_colleges_csv(request):
     Useful for students comparing different schools.
     Includes aggregated major count for each college.
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
-    filename = f"traject_colleges_{timestamp}.csv"
-
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-    writer = csv.writer(response)
-    # Header row
-    writer.writerow(["Abbreviation", "College Name", "City", "State", "Number of Majors"])
-
-    colleges = (
-        College.objects
-        .annotate(major_count=Count("majors"))
-        .order_by("abbreviation")
-    )
-
-    for college in colleges:
-        writer.writerow([
-            college.abbreviation,
-            college.college_name,
-            college.city,
-            college.state,
-            college.major_count
-        ])
-
-    return response
+    return export_download_response(request, "colleges", "csv")
 
 
 # =====================================================
@@ -651,34 +561,7 @@ def export_courses_json(request):
     Assignment 11: Export all courses to JSON.
     Returns JSON with metadata (timestamp, count).
     """
-    from colleges.models import Course as CollegeCourse
-
-    courses = (
-        CollegeCourse.objects
-        .select_related("major", "major__college")
-        .values(
-            "subject",
-            "number",
-            "title",
-            "credits",
-            "major__name",
-            "major__college__abbreviation"
-        )
-        .order_by("subject", "number")
-    )
-
-    data = {
-        "generated_at": datetime.now().isoformat(),
-        "record_count": courses.count(),
-        "courses": list(courses)
-    }
-
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
-    filename = f"traject_courses_{timestamp}.json"
-
-    response = JsonResponse(data, json_dumps_params={"indent": 2})
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+    return export_download_response(request, "courses", "json")
 
 
 @login_required(login_url='accounts:login')
@@ -687,38 +570,30 @@ def export_colleges_json(request):
     Assignment 11: Export all colleges to JSON.
     Returns JSON with metadata (timestamp, count).
     """
-    colleges = (
-        College.objects
-        .annotate(major_count=Count("majors"))
-        .values(
-            "abbreviation",
-            "college_name",
-            "city",
-            "state",
-            "logo_url",
-            "major_count"
-        )
-        .order_by("abbreviation")
-    )
+    return export_download_response(request, "colleges", "json")
 
-    data = {
-        "generated_at": datetime.now().isoformat(),
-        "record_count": colleges.count(),
-        "colleges": list(colleges)
-    }
 
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
-    filename = f"traject_colleges_{timestamp}.json"
+# =====================================================
+#  NDJSON EXPORT VIEWS
+# =====================================================
 
-    response = JsonResponse(data, json_dumps_params={"indent": 2})
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+@login_required(login_url='accounts:login')
+def export_courses_ndjson(request):
+    """Export all courses as newline-delimited JSON (one object per line)."""
+    return export_download_response(request, "courses", "ndjson")
+
+
+@login_required(login_url='accounts:login')
+def export_colleges_ndjson(request):
+    """Export all colleges as newline-delimited JSON (one object per line)."""
+    return export_download_response(request, "colleges", "ndjson")
 
 
 # =====================================================
 #  REPORTS VIEW (Assignment 11)
 # =====================================================
 
+@query_budget(15)
 class ReportsView(LoginRequiredMixin, TemplateView):
     """
     Assignment 11: Reports page showing grouped summaries.
@@ -735,10 +610,15 @@ class ReportsView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
 
+        # All counts come from the rollup tables in colleges/rollups.py
+        majors = Major.objects.annotate(
+            course_count=Coalesce("stats__course_count", 0),
+            student_count=Coalesce("stats__student_count", 0),
+        )
+
         # 1. Courses per Major
         courses_per_major = (
-            Major.objects
-            .annotate(course_count=Count("courses"))
+            majors
             .values("name", "college__abbreviation", "course_count")
             .order_by("-course_count")
         )
@@ -746,15 +626,14 @@ class ReportsView(LoginRequiredMixin, TemplateView):
         # 2. Students (UserProfiles) per College
         students_per_college = (
             College.objects
-            .annotate(student_count=Count("students"))
+            .annotate(student_count=Coalesce("stats__student_count", 0))
             .values("abbreviation", "college_name", "student_count")
             .order_by("-student_count")
         )
 
         # 3. Students per Major
         students_per_major = (
-            Major.objects
-            .annotate(student_count=Count("major_students"))
+            majors
             .values("name", "college__abbreviation", "student_count")
             .order_by("-student_count")
         )
@@ -883,11 +762,16 @@ function greet() { return 'Hello World!'; }"""
 #  CAREER PLANNING VIEWS
 # =====================================================
 
+@query_budget(18)
 @login_required
 def career_planning_view(request):
     """Unified career planning page with tabs for My Plans and AI Roadmap."""
     profile = request.user.profile
-    plans = CareerPlan.objects.filter(user_profile=profile)
+    plans = (
+        CareerPlan.objects.filter(user_profile=profile)
+        .select_related('target_career')
+        .prefetch_related('plan_items')
+    )
 
     # Get roadmap summary
     from recommender.roadmap import get_roadmap_summary
@@ -902,11 +786,16 @@ def career_planning_view(request):
     return render(request, 'accounts/career_planning.html', context)
 
 
+@query_budget(10)
 @login_required
 def career_plans_list(request):
     """List all career plans for the current user."""
     profile = request.user.profile
-    plans = CareerPlan.objects.filter(user_profile=profile)
+    plans = (
+        CareerPlan.objects.filter(user_profile=profile)
+        .select_related('target_career')
+        .prefetch_related('plan_items')
+    )
 
     context = {
         'plans': plans,
@@ -971,16 +860,19 @@ def career_plan_create(request):
     return render(request, 'accounts/career_plans/create.html', context)
 
 
+@query_budget(25)
 @login_required
 def career_plan_detail(request, plan_id):
     """View and manage a specific career plan."""
     from accounts.models import CareerPlan, PlanItem
     from recommender.engine import RecommendationEngine
+    from recommender.similar_careers import similar_careers
+    from recommender.skill_gap import plan_skill_gap
     
     plan = get_object_or_404(CareerPlan, id=plan_id, user_profile=request.user.profile)
     
     # Get plan items
-    plan_items = plan.plan_items.all()
+    plan_items = plan.plan_items.select_related('portfolio_item', 'course')
 
     # Get recommendations for this career
     engine = RecommendationEngine(request.user.profile)
@@ -1002,6 +894,8 @@ def career_plan_detail(request, plan_id):
         'completed_count': completed_count,
         'in_progress_count': in_progress_count,
         'planned_count': planned_count,
+        'alternative_careers': similar_careers(plan.target_career_id, limit=4),
+        'skill_gap': plan_skill_gap(request.user.profile, plan.target_career),
     }
     
     return render(request, 'accounts/career_plans/detail.html', context)
@@ -0,0 +1,6 @@
+"""
+Benchmarks for the recommendation engine and roadmap generator.
+
+Run with `python manage.py benchmark_recommender`; see
+accounts/management/commands/benchmark_recommender.py for options.
+"""
@@ -0,0 +1,140 @@
+"""
+Timing harness for the recommendation engine and roadmap generator.
+
+Each operation runs against a sample of synthetic profiles:
+- a timing pass (no instrumentation) gives p50 / p95 / mean latency,
+- one instrumented pass per profile records SQL query count and the
+  tracemalloc peak, so instrumentation overhead never skews the timings.
+"""
+
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import UserProfile
+from recommender.engine import get_all_recommendations
+from recommender.roadmap import RoadmapGenerator
+
+OPERATIONS = {
+    "get_all_recommendations": lambda profile: get_all_recommendations(profile),
+    "generate_roadmap": lambda profile: RoadmapGenerator(profile).generate_roadmap(),
+    "generate_summary": lambda profile: RoadmapGenerator(profile).generate_summary(),
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def sample_profiles(count):
+    return list(
+        UserProfile.objects.select_related("major", "college").order_by("pk")[:count]
+    )
+
+
+def time_operation(func, profiles, iterations, warmup=1):
+    """Latency samples in milliseconds: `iterations` passes over `profiles`."""
+    for profile in profiles[:warmup]:
+        func(profile)
+    samples = []
+    for _ in range(iterations):
+        for profile in profiles:
+            start = time.perf_counter()
+            func(profile)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def instrument_operation(func, profiles):
+    """Median query count and max tracemalloc peak (KB) over one pass."""
+    queries, peaks = [], []
+    for profile in profiles:
+        gc.collect()
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as captured:
+            func(profile)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        queries.append(len(captured.captured_queries))
+        peaks.append(peak / 1024)
+    return statistics.median(queries) if queries else 0, max(peaks, default=0.0)
+
+
+def run_operations(profiles, iterations, warmup=1, operations=None):
+    results = {}
+    for name in operations or OPERATIONS:
+        func = OPERATIONS[name]
+        samples = time_operation(func, profiles, iterations, warmup)
+        queries, peak_kb = instrument_operation(func, profiles)
+        results[name] = {
+            "calls": len(samples),
+            "p50_ms": round(percentile(samples, 50), 3),
+            "p95_ms": round(percentile(samples, 95), 3),
+            "mean_ms": round(statistics.fmean(samples), 3) if samples else 0.0,
+            "max_ms": round(max(samples, default=0.0), 3),
+            "queries": queries,
+            "peak_kb": round(peak_kb, 1),
+        }
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "platform": platform.platform(),
+        "database": connection.vendor,
+    }
+
+
+# =====================================================
+#  REPORTS
+# =====================================================
+
+def write_report(path, report):
+    with open(path, "w") as fh:
+        json.dump(report, fh, indent=2)
+
+
+def compare_reports(baseline, current, metric="p50_ms"):
+    """
+    Rows of (careers, operation, baseline, current, change %) for every
+    operation present at the same scale in both reports.
+    """
+    base = {
+        (run["scale"]["careers"], op): stats[metric]
+        for run in baseline.get("runs", [])
+        for op, stats in run["operations"].items()
+    }
+    rows = []
+    for run in current.get("runs", []):
+        for op, stats in run["operations"].items():
+            key = (run["scale"]["careers"], op)
+            if key in base and base[key]:
+                change = (stats[metric] - base[key]) / base[key] * 100
+                rows.append((key[0], op, base[key], stats[metric], round(change, 1)))
+    return rows
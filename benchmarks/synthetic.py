@@ -0,0 +1,402 @@
+"""
+Synthetic catalog and student data for benchmarks and load tests.
+
+Everything is generated from a seeded random.Random, so the same scale,
+seed and prefix always produce the same rows. Rows are inserted with
+bulk_create() in batches:
+- the catalog (colleges, majors, courses, careers, portfolio items, clubs)
+  in one transaction,
+- students (users, profiles, checklists, plans) one batch per transaction,
+  so a million-user load never holds more than one batch in memory.
+
+Careers, portfolio items and students are each drawn around a "field"
+(Data, Security, Product, ...) with that field's core skills, so
+recommendations, collaborative filtering and peer search see realistic
+clusters instead of uniform noise.
+
+bulk_create() does not fire signals: callers that load into a real
+database should rebuild rollups and the search index and bump the catalog
+version afterwards (the generate_dataset command does).
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Max
+
+from accounts.models import (
+    CareerPlan, Club, Course, PortfolioItem, UserChecklist, UserProfile,
+)
+from careers.models import Career
+from colleges.models import College, Major
+
+BATCH_SIZE = 1000
+
+FIELD_SKILLS = {
+    "Software": ["python", "java", "git", "algorithms", "data structures", "system design", "rest apis"],
+    "Data": ["sql", "python", "statistics", "data analysis", "data visualization", "pandas", "tableau"],
+    "Machine Learning": ["python", "machine learning", "deep learning", "pytorch", "tensorflow", "numpy", "statistics"],
+    "Cloud": ["aws", "azure", "gcp", "docker", "kubernetes", "terraform", "linux"],
+    "Security": ["security", "networking", "cryptography", "penetration testing", "linux", "python"],
+    "Product": ["product management", "user research", "agile", "communication", "sql", "leadership"],
+    "Design": ["figma", "user research", "wireframing", "prototyping", "communication"],
+    "Financial": ["financial modeling", "excel", "accounting", "statistics", "sql"],
+    "Marketing": ["marketing", "seo", "data analysis", "communication", "public speaking"],
+    "Hardware": ["circuit design", "embedded systems", "signal processing", "matlab", "c++"],
+    "Mobile": ["swift", "kotlin", "flutter", "mobile development", "git", "rest apis"],
+    "Web": ["javascript", "typescript", "react", "node.js", "web development", "graphql"],
+    "Data Engineering": ["sql", "spark", "hadoop", "etl", "python", "postgresql", "redis"],
+    "DevOps": ["devops", "ci/cd", "docker", "kubernetes", "linux", "terraform"],
+}
+FIELDS = list(FIELD_SKILLS)
+SKILLS = sorted({skill for skills in FIELD_SKILLS.values() for skill in skills} | {
+    "go", "rust", "django", "mongodb", "nlp", "computer vision", "distributed systems",
+    "project management", "technical writing", "negotiation", "sales", "research", "cad", "robotics",
+})
+
+FIELD_INDUSTRIES = {
+    "Financial": ["finance", "consulting"],
+    "Hardware": ["manufacturing", "automotive", "aerospace"],
+    "Marketing": ["media", "retail"],
+    "Design": ["media", "gaming"],
+}
+INDUSTRIES = [
+    "technology", "finance", "healthcare", "education", "consulting", "retail",
+    "energy", "manufacturing", "government", "media", "gaming", "automotive",
+    "aerospace", "biotech", "telecommunications", "non-profit", "real estate",
+]
+
+ROLES = ["Engineer", "Analyst", "Scientist", "Developer", "Designer", "Manager",
+         "Consultant", "Architect", "Researcher", "Specialist"]
+SENIORITY = ["", "", "Junior", "Senior", "Lead", "Associate"]
+COMPANIES = ["Google", "Microsoft", "Amazon", "Meta", "Apple", "Netflix", "Stripe",
+             "Salesforce", "Adobe", "IBM", "Intel", "Nvidia", "Goldman Sachs",
+             "JPMorgan", "Deloitte", "Accenture", "Boeing", "Tesla", "Epic Systems",
+             "Capital One", "Spotify", "Airbnb", "Uber", "Datadog", "Cloudflare"]
+
+MAJORS = [
+    ("Computer Science", "CS", ["Software", "Web", "Machine Learning", "Security"]),
+    ("Computer Engineering", "CE", ["Hardware", "Software", "Cloud"]),
+    ("Electrical Engineering", "ECE", ["Hardware", "Software"]),
+    ("Information Science", "IS", ["Data", "Product", "Design"]),
+    ("Data Science", "DS", ["Data", "Machine Learning", "Data Engineering"]),
+    ("Statistics", "STAT", ["Data", "Machine Learning", "Financial"]),
+    ("Mathematics", "MATH", ["Data", "Financial", "Machine Learning"]),
+    ("Economics", "ECON", ["Financial", "Data", "Product"]),
+    ("Finance", "FIN", ["Financial", "Data"]),
+    ("Marketing", "MKT", ["Marketing", "Product"]),
+    ("Industrial Design", "ID", ["Design", "Product"]),
+    ("Information Technology", "IT", ["Cloud", "DevOps", "Security"]),
+]
+
+CITIES = [
+    ("Austin", "Texas"), ("Boston", "Massachusetts"), ("Chicago", "Illinois"),
+    ("Denver", "Colorado"), ("Seattle", "Washington"), ("Atlanta", "Georgia"),
+    ("Madison", "Wisconsin"), ("Ann Arbor", "Michigan"), ("Raleigh", "North Carolina"),
+    ("Phoenix", "Arizona"), ("Portland", "Oregon"), ("Columbus", "Ohio"),
+    ("Pittsburgh", "Pennsylvania"), ("San Diego", "California"), ("Nashville", "Tennessee"),
+    ("Salt Lake City", "Utah"), ("Minneapolis", "Minnesota"), ("Richmond", "Virginia"),
+]
+COLLEGE_KINDS = ["University", "State University", "Institute of Technology", "College"]
+
+ITEM_KINDS = [
+    ("PROJECT", "{field} Capstone Project"), ("PROJECT", "Build a {field} Portfolio App"),
+    ("CERT", "{field} Professional Certificate"), ("MILESTONE", "{field} Research Assistantship"),
+    ("INTERNSHIP", "{field} Summer Internship"), ("COMPETITION", "{field} Hackathon"),
+]
+DIFFICULTIES = ["BEGINNER", "INTERMEDIATE", "ADVANCED"]
+YEARS = ["FR", "SO", "JR", "SR", "GR"]
+CLUB_CATEGORIES = ["Tech", "Academic", "Professional", "Cultural", "Sports"]
+CHECKLIST_STATUSES = ["PLANNED", "IN_PROGRESS", "COMPLETED", "ABANDONED"]
+CHECKLIST_WEIGHTS = [4, 3, 3, 1]
+
+
+@dataclass
+class Scale:
+    careers: int
+    portfolio_items: int
+    colleges: int
+    majors_per_college: int
+    courses_per_major: int
+    clubs_per_college: int
+    users: int
+    checklist_per_user: int = 3
+    plans_per_user: int = 1
+
+    @classmethod
+    def for_careers(cls, careers, users=200):
+        """Scale everything else sensibly from the number of careers."""
+        return cls(
+            careers=careers,
+            portfolio_items=max(careers, 20),
+            colleges=min(max(careers // 100, 3), 200),
+            majors_per_college=8,
+            courses_per_major=12,
+            clubs_per_college=15,
+            users=users,
+        )
+
+    @classmethod
+    def for_users(cls, users):
+        """A catalog sized for a student population (one college per ~5k students)."""
+        return cls(
+            careers=min(max(users // 50, 100), 20000),
+            portfolio_items=min(max(users // 50, 100), 20000),
+            colleges=min(max(users // 5000, 3), 500),
+            majors_per_college=8,
+            courses_per_major=12,
+            clubs_per_college=15,
+            users=users,
+        )
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+# =====================================================
+#  HELPERS
+# =====================================================
+
+def _pick(rng, population, low, high):
+    return rng.sample(population, min(rng.randint(low, high), len(population)))
+
+
+def _skills_for(rng, field, core_low, core_high, extra_high):
+    """Mostly the field's core skills, plus a few from anywhere."""
+    skills = _pick(rng, FIELD_SKILLS[field], core_low, core_high)
+    for skill in _pick(rng, SKILLS, 0, extra_high):
+        if skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+def _insert(model, objs, batch_size) -> List[int]:
+    """
+    bulk_create `objs` and return their primary keys in order.
+
+    Backends that cannot return ids from a bulk insert (MySQL) get them by
+    reading back the rows above the previous max pk. That relies on
+    auto-increment ids being handed out in insert order, which holds when
+    nothing else writes to the table during the load.
+    """
+    if not objs:
+        return []
+    if connection.features.can_return_rows_from_bulk_insert:
+        return [obj.pk for obj in model.objects.bulk_create(objs, batch_size=batch_size)]
+    floor = model.objects.aggregate(top=Max("pk"))["top"] or 0
+    model.objects.bulk_create(objs, batch_size=batch_size)
+    ids = list(model.objects.filter(pk__gt=floor).order_by("pk").values_list("pk", flat=True))
+    if len(ids) != len(objs):
+        raise RuntimeError(
+            f"{model.__name__}: inserted {len(objs)} rows but found {len(ids)}; "
+            "was something else writing to the table?"
+        )
+    return ids
+
+
+@dataclass
+class Catalog:
+    """Ids of the generated catalog rows, grouped the way students draw from them."""
+    majors: List[tuple]                  # (major id, college id, fields)
+    careers_by_field: Dict[str, List[int]]
+    items_by_field: Dict[str, List[int]]
+
+    def __post_init__(self):
+        self.career_ids = [pk for ids in self.careers_by_field.values() for pk in ids]
+        self.item_ids = [pk for ids in self.items_by_field.values() for pk in ids]
+
+
+# =====================================================
+#  CATALOG
+# =====================================================
+
+@transaction.atomic
+def generate_catalog(scale: Scale, rng: random.Random, prefix: str = "SYN",
+                     batch_size: int = BATCH_SIZE) -> Catalog:
+    college_rows = []
+    for i in range(scale.colleges):
+        city, state = CITIES[i % len(CITIES)]
+        kind = rng.choice(COLLEGE_KINDS)
+        college_rows.append(College(
+            college_name=f"{city} {kind} {i + 1}" if i >= len(CITIES) else f"{city} {kind}",
+            abbreviation=f"{prefix}{i + 1}",
+            city=city,
+            state=state,
+        ))
+    college_ids = _insert(College, college_rows, batch_size)
+
+    major_rows, major_meta = [], []
+    for college_id in college_ids:
+        for name, code, fields in rng.sample(MAJORS, min(scale.majors_per_college, len(MAJORS))):
+            major_rows.append(Major(college_id=college_id, name=name, code=code))
+            major_meta.append((college_id, code, fields))
+    major_ids = _insert(Major, major_rows, batch_size)
+    majors = [(pk, college_id, fields) for pk, (college_id, _, fields) in zip(major_ids, major_meta)]
+
+    courses = []
+    for (major_id, _, fields), (_, code, _) in zip(majors, major_meta):
+        for k in range(scale.courses_per_major):
+            field = rng.choice(fields)
+            topic = rng.choice(FIELD_SKILLS[field])
+            courses.append(Course(
+                major_id=major_id,
+                subject=code,
+                number=str(100 + 100 * (k * 4 // max(scale.courses_per_major, 1)) + k),
+                title=f"{'Introduction to' if k < 3 else 'Advanced'} {topic.title()}",
+                credits=rng.choice([3, 3, 4, 1]),
+                description=f"Covers {', '.join(_pick(rng, FIELD_SKILLS[field], 2, 4))}.",
+            ))
+    _insert(Course, courses, batch_size)
+
+    career_rows, career_fields = [], []
+    for _ in range(scale.careers):
+        field = rng.choice(FIELDS)
+        title = " ".join(part for part in (rng.choice(SENIORITY), field, rng.choice(ROLES)) if part)
+        career_rows.append(Career(
+            title=title,
+            company=rng.choice(COMPANIES),
+            skills=_skills_for(rng, field, 4, 6, 2),
+            industries=list(dict.fromkeys(
+                FIELD_INDUSTRIES.get(field, ["technology"])[:1] + _pick(rng, INDUSTRIES, 0, 2)
+            )),
+            description=f"{title} working with {', '.join(_pick(rng, FIELD_SKILLS[field], 2, 3))}.",
+        ))
+        career_fields.append(field)
+    careers_by_field: Dict[str, List[int]] = {}
+    for pk, field in zip(_insert(Career, career_rows, batch_size), career_fields):
+        careers_by_field.setdefault(field, []).append(pk)
+
+    item_rows, item_fields = [], []
+    for i in range(scale.portfolio_items):
+        field = rng.choice(FIELDS)
+        item_type, pattern = rng.choice(ITEM_KINDS)
+        item_rows.append(PortfolioItem(
+            title=f"{pattern.format(field=field)} #{i + 1}",
+            item_type=item_type,
+            description=f"Hands-on {field.lower()} experience.",
+            skills_gained=", ".join(_skills_for(rng, field, 2, 4, 1)),
+            estimated_hours=rng.randint(5, 120),
+            difficulty_level=rng.choice(DIFFICULTIES),
+        ))
+        item_fields.append(field)
+    items_by_field: Dict[str, List[int]] = {}
+    for pk, field in zip(_insert(PortfolioItem, item_rows, batch_size), item_fields):
+        items_by_field.setdefault(field, []).append(pk)
+
+    clubs = []
+    for college_id in college_ids:
+        for _ in range(scale.clubs_per_college):
+            field = rng.choice(FIELDS)
+            category = rng.choice(CLUB_CATEGORIES)
+            clubs.append(Club(
+                name=f"{field} {category} Society",
+                category=category,
+                college_id=college_id,
+                description=", ".join(_pick(rng, FIELD_SKILLS[field], 2, 3)),
+            ))
+    _insert(Club, clubs, batch_size)
+
+    return Catalog(majors=majors, careers_by_field=careers_by_field, items_by_field=items_by_field)
+
+
+# =====================================================
+#  STUDENTS
+# =====================================================
+
+def _draw(rng, by_field, everything, field, count):
+    """`count` distinct ids, mostly from `field`, topped up from anywhere."""
+    pool = by_field.get(field, [])
+    chosen = rng.sample(pool, min(count, len(pool)))
+    while len(chosen) < min(count, len(everything)):
+        pk = rng.choice(everything)
+        if pk not in chosen:
+            chosen.append(pk)
+    return chosen
+
+
+@transaction.atomic
+def _generate_student_batch(scale, catalog, rng, start, count, prefix, password, batch_size):
+    users, picks = [], []
+    for i in range(start, start + count):
+        major_id, college_id, fields = rng.choice(catalog.majors)
+        picks.append((major_id, college_id, rng.choice(fields)))
+        users.append(User(
+            username=f"{prefix.lower()}_{i + 1:07d}",
+            email=f"{prefix.lower()}_{i + 1:07d}@example.edu",
+            password=password,
+        ))
+    user_ids = _insert(User, users, batch_size)
+
+    profiles = [
+        UserProfile(
+            user_id=user_id,
+            college_id=college_id,
+            major_id=major_id,
+            academic_year=rng.choice(YEARS),
+            skills=", ".join(_skills_for(rng, field, 2, 5, 3)),
+            personal_interests=", ".join(_pick(rng, FIELD_SKILLS[field] + INDUSTRIES, 1, 4)),
+            preferred_industries=", ".join(_pick(rng, INDUSTRIES, 1, 2)),
+            career_goals=f"Become a {field} {rng.choice(ROLES)}",
+        )
+        for user_id, (major_id, college_id, field) in zip(user_ids, picks)
+    ]
+    profile_ids = _insert(UserProfile, profiles, batch_size)
+
+    checklists, plans = [], []
+    for profile_id, (_, _, field) in zip(profile_ids, picks):
+        items = _draw(rng, catalog.items_by_field, catalog.item_ids, field, scale.checklist_per_user)
+        careers = _draw(rng, catalog.careers_by_field, catalog.career_ids, field, scale.plans_per_user)
+        for item_id in items:
+            checklists.append(UserChecklist(
+                user_profile_id=profile_id,
+                portfolio_item_id=item_id,
+                status=rng.choices(CHECKLIST_STATUSES, CHECKLIST_WEIGHTS)[0],
+            ))
+        for n, career_id in enumerate(careers):
+            plans.append(CareerPlan(
+                user_profile_id=profile_id,
+                target_career_id=career_id,
+                name=f"Plan {'ABCDEFGH'[n % 8]}: {field}",
+                is_primary=(n == 0),
+            ))
+    UserChecklist.objects.bulk_create(checklists, batch_size=batch_size)
+    CareerPlan.objects.bulk_create(plans, batch_size=batch_size)
+    return len(checklists), len(plans)
+
+
+def generate(scale: Scale, seed: int = 390, prefix: str = "SYN", password: str = "!",
+             batch_size: int = BATCH_SIZE,
+             progress: Optional[Callable[[int, int], None]] = None) -> dict:
+    """
+    Insert a synthetic dataset of the given scale. Returns row counts.
+
+    `password` is stored as-is, so pass a hash from make_password() to get
+    accounts that can log in ("!" means unusable). `progress(done, total)`
+    is called after each committed student batch.
+    """
+    rng = random.Random(seed)
+    catalog = generate_catalog(scale, rng, prefix, batch_size)
+
+    checklists = plans = 0
+    for start in range(0, scale.users, batch_size):
+        count = min(batch_size, scale.users - start)
+        added = _generate_student_batch(scale, catalog, rng, start, count, prefix, password, batch_size)
+        checklists += added[0]
+        plans += added[1]
+        if progress:
+            progress(start + count, scale.users)
+
+    return {
+        "colleges": scale.colleges,
+        "majors": len(catalog.majors),
+        "courses": len(catalog.majors) * scale.courses_per_major,
+        "careers": scale.careers,
+        "portfolio_items": scale.portfolio_items,
+        "clubs": scale.colleges * scale.clubs_per_college,
+        "users": scale.users,
+        "checklists": checklists,
+        "plans": plans,
+    }
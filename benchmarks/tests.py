@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from accounts.models import UserProfile
+from careers.models import Career
+from monitoring.testing import create_test_dataset
+
+from . import runner
+from .synthetic import Scale, generate
+
+
+class SyntheticDatasetTests(TestCase):
+    def test_counts_match_the_scale(self):
+        scale = Scale(careers=12, portfolio_items=10, colleges=2, majors_per_college=2,
+                      courses_per_major=3, clubs_per_college=2, users=5)
+        counts = generate(scale, seed=7, prefix="BEN")
+        self.assertEqual(Career.objects.count(), counts["careers"])
+        self.assertEqual(UserProfile.objects.count(), counts["users"])
+        self.assertEqual(counts["courses"], 12)
+        self.assertTrue(User.objects.filter(username="ben_0000001").exists())
+
+    def test_same_seed_same_rows(self):
+        scale = Scale.for_careers(20, users=3)
+        generate(scale, seed=7, prefix="AAA")
+        first = list(Career.objects.order_by("pk").values_list("title", "skills"))
+        Career.objects.all().delete()
+        generate(scale, seed=7, prefix="BBB")
+        self.assertEqual(list(Career.objects.order_by("pk").values_list("title", "skills")), first)
+
+
+class RunnerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+
+    def test_run_operations_reports_every_operation(self):
+        profiles = runner.sample_profiles(2)
+        results = runner.run_operations(profiles, iterations=2)
+        self.assertEqual(set(results), set(runner.OPERATIONS))
+        for stats in results.values():
+            self.assertEqual(stats["calls"], 4)
+            self.assertLessEqual(stats["p50_ms"], stats["p95_ms"])
+            self.assertLessEqual(stats["p95_ms"], stats["max_ms"])
+            self.assertGreater(stats["queries"], 0)
+
+        only = runner.run_operations(profiles, iterations=1, operations=["generate_summary"])
+        self.assertEqual(list(only), ["generate_summary"])
+
+    def test_percentile_interpolates(self):
+        self.assertEqual(runner.percentile([], 50), 0.0)
+        self.assertEqual(runner.percentile([4, 1, 3, 2], 50), 2.5)
+        self.assertEqual(runner.percentile([1, 2, 3], 100), 3)
+
+    def test_compare_reports_matches_scale_and_operation(self):
+        def report(careers, p50):
+            return {"runs": [{"scale": {"careers": careers},
+                              "operations": {"generate_roadmap": {"p50_ms": p50}}}]}
+
+        rows = runner.compare_reports(report(100, 10.0), report(100, 12.0))
+        self.assertEqual(rows, [(100, "generate_roadmap", 10.0, 12.0, 20.0)])
+        self.assertEqual(runner.compare_reports(report(100, 10.0), report(1000, 12.0)), [])
@@ -1,3 +1,29 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import UserProfile
+from careers.models import Career
+from monitoring.testing import QueryBudgetMixin, create_test_dataset
+
+
+class CareersQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.profile = UserProfile.objects.select_related("user").order_by("pk").first()
+        cls.career = Career.objects.order_by("pk").first()
+
+    def setUp(self):
+        self.client.force_login(self.profile.user)
+
+    def test_career_list(self):
+        self.assertViewWithinBudget(reverse("careers:list"))
+
+    def test_career_detail(self):
+        self.assertViewWithinBudget(reverse("careers:detail", args=[self.career.pk]))
+
+    def test_similar_careers(self):
+        self.assertViewWithinBudget(reverse("careers:similar", args=[self.career.pk]))
+
+    def test_recommended_careers(self):
+        self.assertViewWithinBudget(reverse("careers:recommended"))
@@ -7,5 +7,6 @@ app_name = "careers"
 urlpatterns = [
     path("", views.career_list_view, name="list"),
     path("<int:pk>/", views.career_detail_view, name="detail"),
+    path("<int:pk>/similar/", views.similar_careers_api, name="similar"),
     path("recommended/", views.recommended_careers_view, name="recommended"),
 ]
@@ -1,11 +1,16 @@
 # careers/views.py
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from .models import Career
+from search import index as search_index
+from recommender.similar_careers import similar_career_ids, similar_careers
+from monitoring.queries import query_budget
 
 # ============================
 # Career List View
 # ============================
+@query_budget(8)
 @login_required
 def career_list_view(request):
     """
@@ -19,18 +24,49 @@ def career_list_view(request):
 # ============================
 # Career Detail View
 # ============================
+@query_budget(10)
 @login_required
 def career_detail_view(request, pk):
     """
     Displays details for a single career.
     """
     career = get_object_or_404(Career, pk=pk)
-    return render(request, "careers/career_detail.html", {"career": career})
+    return render(request, "careers/career_detail.html", {
+        "career": career,
+        "similar_careers": similar_careers(career.pk, limit=5),
+    })
+
+
+# ============================
+# Similar Careers (JSON)
+# ============================
+@query_budget(6)
+@login_required
+def similar_careers_api(request, pk):
+    """
+    GET /careers/<pk>/similar/?limit=5
+    Precomputed nearest careers by skill/industry overlap.
+    """
+    try:
+        limit = min(max(int(request.GET.get("limit", 5)), 1), 20)
+    except ValueError:
+        limit = 5
+    pairs = similar_career_ids(pk, limit)
+    titles = dict(Career.objects.filter(pk__in=[c for c, _ in pairs]).values_list("pk", "title"))
+    return JsonResponse({
+        "career_id": pk,
+        "results": [
+            {"id": c, "title": titles[c], "similarity": round(score, 4)}
+            for c, score in pairs
+            if c in titles
+        ],
+    })
 
 
 # ============================
 # Recommended Careers (Optional)
 # ============================
+@query_budget(10)
 @login_required
 def recommended_careers_view(request):
     """
@@ -46,11 +82,9 @@ def recommended_careers_view(request):
         keywords = set(skills_list) | set(interests_list)
 
         if keywords:
-            # Filter careers that match any of the keywords
-            from django.db.models import Q
-            query = Q()
-            for keyword in keywords:
-                query |= Q(description__icontains=keyword) | Q(title__icontains=keyword)
-            recommended = Career.objects.filter(query).distinct()[:10]
+            # Careers matching any keyword, best full-text match first
+            recommended = search_index.ranked(
+                Career.objects.all(), sorted(keywords), "career", limit=10, match_any=True
+            )
 
     return render(request, "careers/recommended_careers.html", {"recommended": recommended})
@@ -0,0 +1,40 @@
+# catalog/signals.py
+"""
+Connects catalog models to the catalog version (see catalog/version.py).
+"""
+
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+from .version import bump_catalog_version_on_commit
+
+CATALOG_MODELS = [
+    "colleges.College",
+    "colleges.Major",
+    "colleges.Course",
+    "catalog.Course",
+    "accounts.Course",
+    "accounts.Club",
+    "accounts.PortfolioItem",
+    "careers.Career",
+]
+
+
+def catalog_tables():
+    """(table, primary key column) for every catalog model and the item-career links."""
+    models = [apps.get_model(label) for label in CATALOG_MODELS]
+    models.append(apps.get_model("accounts.PortfolioItem").related_careers.through)
+    return [(model._meta.db_table, model._meta.pk.column) for model in models]
+
+
+def connect_catalog_signals():
+    for label in CATALOG_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(bump_catalog_version_on_commit, sender=model,
+                          dispatch_uid=f"catalog_version_save_{label}")
+        post_delete.connect(bump_catalog_version_on_commit, sender=model,
+                            dispatch_uid=f"catalog_version_delete_{label}")
+
+    through = apps.get_model("accounts.PortfolioItem").related_careers.through
+    m2m_changed.connect(bump_catalog_version_on_commit, sender=through,
+                        dispatch_uid="catalog_version_portfolio_careers")
@@ -1,3 +1,62 @@
-from django.test import TestCase
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import UserProfile
+from careers.models import Career
+from catalog.models import Course, DegreeCategory, DegreeRequirement
+from catalog.version import get_catalog_version
+from colleges.models import Major
+from monitoring.testing import QueryBudgetMixin, create_test_dataset
+
+
+class CatalogQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.profile = UserProfile.objects.select_related("user").order_by("pk").first()
+        for major in Major.objects.select_related("college"):
+            category = DegreeCategory.objects.create(name="Core", min_credits=30, major=major)
+            for n in range(3):
+                course = Course.objects.create(
+                    subject=major.code, number=f"{100 + n}", title=f"{major.name} {n + 1}",
+                    credits=3, college=major.college,
+                )
+                DegreeRequirement.objects.create(category=category, course=course)
+        cls.course = Course.objects.order_by("pk").first()
+
+    def setUp(self):
+        self.client.force_login(self.profile.user)
+
+    def test_course_list(self):
+        self.assertViewWithinBudget(reverse("catalog:courses"))
+
+    def test_course_detail(self):
+        self.assertViewWithinBudget(reverse("catalog:course_detail", args=[self.course.pk]))
+
+    def test_categories(self):
+        self.assertViewWithinBudget(reverse("catalog:categories"))
+
+    def test_requirements(self):
+        self.assertViewWithinBudget(reverse("catalog:requirements"))
+
+
+@override_settings(CATALOG_FINGERPRINT_TTL=0)
+class CatalogVersionTests(TestCase):
+    def test_runs_outside_the_project_data_dir(self):
+        self.assertNotIn(settings.BASE_DIR, settings.CATALOG_VERSION_FILE.parents)
+
+    def test_saves_change_the_version(self):
+        before = get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Career.objects.create(title="Analyst")
+        self.assertNotEqual(get_catalog_version(), before)
+
+    def test_writes_without_signals_change_the_version(self):
+        before = get_catalog_version()
+        Career.objects.bulk_create([Career(title="Analyst"), Career(title="Engineer")])
+        after_insert = get_catalog_version()
+        self.assertNotEqual(after_insert, before)
+
+        Career.objects.filter(title="Analyst")._raw_delete(Career.objects.db)
+        self.assertNotEqual(get_catalog_version(), after_insert)
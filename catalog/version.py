@@ -0,0 +1,95 @@
+# catalog/version.py
+"""
+Catalog version token.
+
+Two parts joined by "-":
+
+- a short random token stored in a file (settings.CATALOG_VERSION_FILE)
+  that the post_save/post_delete signals replace whenever catalog data
+  (colleges, majors, courses, clubs, careers, portfolio items) is edited;
+- a fingerprint of the catalog tables themselves (row count and highest
+  id of each, read in one query), so bulk_create(), deletes, loaddata and
+  raw inserts - which send no signals - still change the version.
+
+Anything derived from the catalog - export snapshots, search/recommender
+indexes - can key its cache on this value. The fingerprint is re-read at
+most every CATALOG_FINGERPRINT_TTL seconds per process, so a request pays
+for that one query only occasionally.
+
+An in-place QuerySet.update() of catalog rows changes neither part; code
+that does one should call bump_catalog_version() afterwards.
+"""
+
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+
+DEFAULT_VERSION = "0"
+
+# (database name, expires at, fingerprint) for this process
+_fingerprint_cache = None
+
+
+def _version_file() -> Path:
+    return Path(settings.CATALOG_VERSION_FILE)
+
+
+def _file_token() -> str:
+    try:
+        return _version_file().read_text().strip() or DEFAULT_VERSION
+    except FileNotFoundError:
+        return DEFAULT_VERSION
+
+
+def catalog_fingerprint() -> str:
+    """Hash of (row count, max id) for every catalog table, in one query."""
+    from .signals import catalog_tables
+
+    quote = connection.ops.quote_name
+    query = " UNION ALL ".join(
+        f"SELECT COUNT(*), MAX({quote(pk)}) FROM {quote(table)}"
+        for table, pk in catalog_tables()
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(query)
+        rows = cursor.fetchall()
+    return hashlib.blake2b(repr(rows).encode(), digest_size=6).hexdigest()
+
+
+def _cached_fingerprint() -> str:
+    global _fingerprint_cache
+    database = connection.settings_dict["NAME"]
+    now = time.monotonic()
+    if _fingerprint_cache is None or _fingerprint_cache[0] != database or now >= _fingerprint_cache[1]:
+        _fingerprint_cache = (database, now + settings.CATALOG_FINGERPRINT_TTL, catalog_fingerprint())
+    return _fingerprint_cache[2]
+
+
+def get_catalog_version() -> str:
+    """Return the current catalog version: "<file token>-<table fingerprint>"."""
+    return f"{_file_token()}-{_cached_fingerprint()}"
+
+
+def bump_catalog_version() -> str:
+    """Write a new version token atomically and return it."""
+    global _fingerprint_cache
+    _fingerprint_cache = None  # this process's own bulk writes show up at once
+    path = _version_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    version = uuid.uuid4().hex[:12]
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(version)
+    os.replace(tmp_path, path)
+    return version
+
+
+def bump_catalog_version_on_commit(**kwargs):
+    """Signal receiver: bump the version once the current transaction commits."""
+    if kwargs.get("raw") or kwargs.get("action", "post_").startswith("pre_"):
+        return
+    transaction.on_commit(bump_catalog_version)
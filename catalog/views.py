@@ -1,26 +1,31 @@
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from .models import Course, DegreeCategory, DegreeRequirement
+from monitoring.queries import query_budget
 
 
+@query_budget(8)
 @login_required
 def course_list_view(request):
     courses = Course.objects.all().order_by("subject", "number")
     return render(request, "catalog/course_list.html", {"courses": courses})
 
 
+@query_budget(8)
 @login_required
 def course_detail_view(request, pk):
     course = get_object_or_404(Course, pk=pk)
     return render(request, "catalog/course_detail.html", {"course": course})
 
 
+@query_budget(8)
 @login_required
 def category_list_view(request):
     categories = DegreeCategory.objects.all().select_related("major")
     return render(request, "catalog/category_list.html", {"categories": categories})
 
 
+@query_budget(8)
 @login_required
 def requirement_list_view(request):
     requirements = DegreeRequirement.objects.select_related("category", "course")
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import College, Major
+from .models import College, CollegeStats, Major, MajorStats
 
 
 @admin.register(College)
@@ -16,3 +16,15 @@ class MajorAdmin(admin.ModelAdmin):
     search_fields = ("name", "code", "college__college_name", "college__abbreviation")
     list_filter = ("college",)
     ordering = ("name",)
+
+
+@admin.register(CollegeStats)
+class CollegeStatsAdmin(admin.ModelAdmin):
+    list_display = ("college", "student_count", "major_count", "club_count")
+    ordering = ("college__abbreviation",)
+
+
+@admin.register(MajorStats)
+class MajorStatsAdmin(admin.ModelAdmin):
+    list_display = ("major", "student_count", "course_count")
+    ordering = ("major__name",)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CollegesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'colleges'
+
+    def ready(self):
+        from .signals import connect_rollup_signals
+        connect_rollup_signals()
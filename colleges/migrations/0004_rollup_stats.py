@@ -0,0 +1,89 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_rollups(apps, schema_editor):
+    """Fill the new rollup tables from the existing rows."""
+    College = apps.get_model('colleges', 'College')
+    Major = apps.get_model('colleges', 'Major')
+    CollegeStats = apps.get_model('colleges', 'CollegeStats')
+    MajorStats = apps.get_model('colleges', 'MajorStats')
+    AcademicYearStats = apps.get_model('colleges', 'AcademicYearStats')
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    Club = apps.get_model('accounts', 'Club')
+    Course = apps.get_model('colleges', 'Course')
+
+    def counts(model, field):
+        rows = model.objects.exclude(**{f'{field}__isnull': True}).values(field)
+        return dict(rows.annotate(n=models.Count('pk')).values_list(field, 'n'))
+
+    students, majors, clubs = (
+        counts(UserProfile, 'college_id'), counts(Major, 'college_id'), counts(Club, 'college_id')
+    )
+    CollegeStats.objects.bulk_create(
+        CollegeStats(college_id=pk, student_count=students.get(pk, 0),
+                     major_count=majors.get(pk, 0), club_count=clubs.get(pk, 0))
+        for pk in College.objects.values_list('pk', flat=True)
+    )
+
+    students, courses = counts(UserProfile, 'major_id'), counts(Course, 'major_id')
+    MajorStats.objects.bulk_create(
+        MajorStats(major_id=pk, student_count=students.get(pk, 0), course_count=courses.get(pk, 0))
+        for pk in Major.objects.values_list('pk', flat=True)
+    )
+
+    AcademicYearStats.objects.bulk_create(
+        AcademicYearStats(academic_year=code, student_count=n)
+        for code, n in counts(UserProfile, 'academic_year').items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_exportjob'),
+        ('colleges', '0003_alter_college_options_course_major_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AcademicYearStats',
+            fields=[
+                ('academic_year', models.CharField(max_length=10, primary_key=True, serialize=False)),
+                ('student_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Academic Year Stats',
+                'verbose_name_plural': 'Academic Year Stats',
+                'ordering': ['academic_year'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CollegeStats',
+            fields=[
+                ('college', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='colleges.college')),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('major_count', models.PositiveIntegerField(default=0)),
+                ('club_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'College Stats',
+                'verbose_name_plural': 'College Stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='MajorStats',
+            fields=[
+                ('major', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='colleges.major')),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('course_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Major Stats',
+                'verbose_name_plural': 'Major Stats',
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -105,3 +105,53 @@ class DegreeRequirementItem(models.Model):
         if self.course:
             return f"{self.course.subject} {self.course.number}"
         return self.note or "(Requirement)"
+
+
+# ====================================
+# Rollup Tables (maintained by colleges/rollups.py)
+# ====================================
+class CollegeStats(models.Model):
+    """Precomputed per-college counts, kept current by signals."""
+    college = models.OneToOneField(
+        College, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    student_count = models.PositiveIntegerField(default=0)
+    major_count = models.PositiveIntegerField(default=0)
+    club_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "College Stats"
+        verbose_name_plural = "College Stats"
+
+    def __str__(self):
+        return f"Stats for {self.college_id}"
+
+
+class MajorStats(models.Model):
+    """Precomputed per-major counts, kept current by signals."""
+    major = models.OneToOneField(
+        Major, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    student_count = models.PositiveIntegerField(default=0)
+    course_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Major Stats"
+        verbose_name_plural = "Major Stats"
+
+    def __str__(self):
+        return f"Stats for {self.major_id}"
+
+
+class AcademicYearStats(models.Model):
+    """Number of student profiles per academic year code (FR, SO, ...)."""
+    academic_year = models.CharField(max_length=10, primary_key=True)
+    student_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["academic_year"]
+        verbose_name = "Academic Year Stats"
+        verbose_name_plural = "Academic Year Stats"
+
+    def __str__(self):
+        return f"{self.academic_year}: {self.student_count}"
@@ -0,0 +1,203 @@
+# colleges/rollups.py
+"""
+Precomputed analytics rollups (CollegeStats, MajorStats, AcademicYearStats).
+
+The reports page, the colleges list and the *_per_* chart/API endpoints
+read these small tables instead of running GROUP BY / COUNT joins over
+every profile, club and course on each request.
+
+Rows are kept current incrementally: colleges/signals.py calls
+track_old_values() before a save and apply_change()/apply_delete() after
+it, which turn into single "count = count +/- 1" UPDATEs inside the same
+transaction as the write. If a rollup row is missing (new database,
+bulk_create(), queryset.update()) that one row is recounted from scratch.
+`python manage.py rebuild_rollups` recomputes everything.
+"""
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import AcademicYearStats, College, CollegeStats, Major, MajorStats
+
+
+# =====================================================
+#  RECOUNTING
+# =====================================================
+
+def _count_by(model_label, field, value):
+    return apps.get_model(model_label).objects.filter(**{field: value}).count()
+
+
+def refresh_college_stats(college_id):
+    """Recount one college's row from the source tables."""
+    if not College.objects.filter(pk=college_id).exists():
+        return
+    CollegeStats.objects.update_or_create(
+        college_id=college_id,
+        defaults={
+            "student_count": _count_by("accounts.UserProfile", "college_id", college_id),
+            "major_count": _count_by("colleges.Major", "college_id", college_id),
+            "club_count": _count_by("accounts.Club", "college_id", college_id),
+        },
+    )
+
+
+def refresh_major_stats(major_id):
+    """Recount one major's row from the source tables."""
+    if not Major.objects.filter(pk=major_id).exists():
+        return
+    MajorStats.objects.update_or_create(
+        major_id=major_id,
+        defaults={
+            "student_count": _count_by("accounts.UserProfile", "major_id", major_id),
+            "course_count": _count_by("colleges.Course", "major_id", major_id),
+        },
+    )
+
+
+def refresh_academic_year_stats(academic_year):
+    AcademicYearStats.objects.update_or_create(
+        academic_year=academic_year,
+        defaults={
+            "student_count": _count_by("accounts.UserProfile", "academic_year", academic_year),
+        },
+    )
+
+
+_REFRESH = {
+    CollegeStats: refresh_college_stats,
+    MajorStats: refresh_major_stats,
+    AcademicYearStats: refresh_academic_year_stats,
+}
+
+
+# =====================================================
+#  INCREMENTAL UPDATES
+# =====================================================
+
+# source model -> [(attribute on the instance, rollup model, counter field)]
+ROLLUP_SOURCES = {
+    "accounts.UserProfile": [
+        ("college_id", CollegeStats, "student_count"),
+        ("major_id", MajorStats, "student_count"),
+        ("academic_year", AcademicYearStats, "student_count"),
+    ],
+    "accounts.Club": [("college_id", CollegeStats, "club_count")],
+    "colleges.Major": [("college_id", CollegeStats, "major_count")],
+    "colleges.Course": [("major_id", MajorStats, "course_count")],
+}
+
+
+def _adjust(stats_model, key, field, delta):
+    """
+    Add `delta` to one counter, recounting the row if it is missing or would
+    go negative. A decrement of a missing row is dropped instead: while a
+    College is being deleted its CollegeStats row cascades away before its
+    majors and clubs, and recounting would re-insert a row for a college
+    that is about to disappear.
+    """
+    if key is None or key == "":
+        return
+    qs = stats_model.objects.filter(pk=key)
+    if delta < 0:
+        qs = qs.filter(**{f"{field}__gte": -delta})
+    if qs.update(**{field: F(field) + delta}):
+        return
+    if delta < 0 and not stats_model.objects.filter(pk=key).exists():
+        return
+    _REFRESH[stats_model](key)
+
+
+def _attributes(instance):
+    return [attr for attr, _, _ in ROLLUP_SOURCES[instance._meta.label]]
+
+
+def track_old_values(instance, update_fields=None):
+    """Remember the grouping values stored in the database before a save."""
+    instance._rollup_old = None
+    if instance._state.adding or instance.pk is None:
+        return
+    attrs = _attributes(instance)
+    if update_fields is not None:
+        if not set(attrs) & {instance._meta.get_field(f).attname for f in update_fields}:
+            instance._rollup_old = False  # nothing we count is being written
+            return
+    row = type(instance)._base_manager.filter(pk=instance.pk).values_list(*attrs).first()
+    instance._rollup_old = dict(zip(attrs, row)) if row else None
+
+
+def apply_change(instance, created):
+    """Move the instance's counts from its old groups to its new ones."""
+    old = None if created else getattr(instance, "_rollup_old", None)
+    if old is False:
+        return
+    for attr, stats_model, field in ROLLUP_SOURCES[instance._meta.label]:
+        new_key = getattr(instance, attr)
+        old_key = old[attr] if old else None
+        if old_key == new_key:
+            continue
+        _adjust(stats_model, old_key, field, -1)
+        _adjust(stats_model, new_key, field, +1)
+
+
+def apply_delete(instance):
+    for attr, stats_model, field in ROLLUP_SOURCES[instance._meta.label]:
+        _adjust(stats_model, getattr(instance, attr), field, -1)
+
+
+# =====================================================
+#  FULL REBUILD
+# =====================================================
+
+def _grouped_counts(model_label, field):
+    rows = (
+        apps.get_model(model_label).objects
+        .exclude(**{f"{field}__isnull": True})
+        .values(field)
+        .annotate(n=Count("pk"))
+        .values_list(field, "n")
+    )
+    return dict(rows)
+
+
+@transaction.atomic
+def rebuild_rollups():
+    """Recompute every rollup table. Returns the number of rows written per table."""
+    students = _grouped_counts("accounts.UserProfile", "college_id")
+    majors = _grouped_counts("colleges.Major", "college_id")
+    clubs = _grouped_counts("accounts.Club", "college_id")
+    CollegeStats.objects.all().delete()
+    CollegeStats.objects.bulk_create(
+        CollegeStats(
+            college_id=pk,
+            student_count=students.get(pk, 0),
+            major_count=majors.get(pk, 0),
+            club_count=clubs.get(pk, 0),
+        )
+        for pk in College.objects.values_list("pk", flat=True)
+    )
+
+    students = _grouped_counts("accounts.UserProfile", "major_id")
+    courses = _grouped_counts("colleges.Course", "major_id")
+    MajorStats.objects.all().delete()
+    MajorStats.objects.bulk_create(
+        MajorStats(
+            major_id=pk,
+            student_count=students.get(pk, 0),
+            course_count=courses.get(pk, 0),
+        )
+        for pk in Major.objects.values_list("pk", flat=True)
+    )
+
+    years = _grouped_counts("accounts.UserProfile", "academic_year")
+    AcademicYearStats.objects.all().delete()
+    AcademicYearStats.objects.bulk_create(
+        AcademicYearStats(academic_year=code, student_count=n) for code, n in years.items()
+    )
+
+    return {
+        "colleges": CollegeStats.objects.count(),
+        "majors": MajorStats.objects.count(),
+        "academic_years": AcademicYearStats.objects.count(),
+    }
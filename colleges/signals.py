@@ -0,0 +1,44 @@
+# colleges/signals.py
+"""
+Keeps the analytics rollup tables (see colleges/rollups.py) in step with
+the profiles, clubs, majors and courses they count.
+"""
+
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from . import rollups
+from .models import College, CollegeStats, Major, MajorStats
+
+
+def _before_save(sender, instance, update_fields=None, **kwargs):
+    rollups.track_old_values(instance, update_fields)
+
+
+def _after_save(sender, instance, created, **kwargs):
+    rollups.apply_change(instance, created)
+
+
+def _after_delete(sender, instance, **kwargs):
+    rollups.apply_delete(instance)
+
+
+def _college_created(sender, instance, created, **kwargs):
+    if created:
+        CollegeStats.objects.get_or_create(college=instance)
+
+
+def _major_created(sender, instance, created, **kwargs):
+    if created:
+        MajorStats.objects.get_or_create(major=instance)
+
+
+def connect_rollup_signals():
+    post_save.connect(_college_created, sender=College, dispatch_uid="rollup_college_created")
+    post_save.connect(_major_created, sender=Major, dispatch_uid="rollup_major_created")
+
+    for label in rollups.ROLLUP_SOURCES:
+        model = apps.get_model(label)
+        pre_save.connect(_before_save, sender=model, dispatch_uid=f"rollup_pre_save_{label}")
+        post_save.connect(_after_save, sender=model, dispatch_uid=f"rollup_save_{label}")
+        post_delete.connect(_after_delete, sender=model, dispatch_uid=f"rollup_delete_{label}")
@@ -1,3 +1,55 @@
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import Club, UserProfile
+from colleges.models import College, CollegeStats, Major
+from colleges.rollups import rebuild_rollups
+from monitoring.testing import QueryBudgetMixin, create_test_dataset
+
+
+class CollegesQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.profile = UserProfile.objects.select_related("user").order_by("pk").first()
+        cls.college = College.objects.order_by("pk").first()
+
+    def setUp(self):
+        self.client.force_login(self.profile.user)
+
+    def test_college_list(self):
+        self.assertViewWithinBudget(reverse("colleges:list"))
+
+    def test_college_detail(self):
+        self.assertViewWithinBudget(reverse("colleges:detail", args=[self.college.pk]))
+
+    def test_majors_json(self):
+        self.assertViewWithinBudget(reverse("colleges:majors_json", args=[self.college.pk]))
+
+    def test_college_search(self):
+        self.assertViewWithinBudget(reverse("colleges:college_search") + "?q=university")
+
+
+class RollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        rebuild_rollups()
+
+    def test_deleting_a_college_with_majors_and_clubs(self):
+        college = College.objects.filter(majors__isnull=False, clubs__isnull=False).first()
+        self.assertIsNotNone(college)
+        college.delete()
+        self.assertFalse(CollegeStats.objects.filter(college_id=college.pk).exists())
+        # SQLite defers FK checks to commit, which a TestCase never reaches
+        connection.check_constraints()
+
+    def test_counts_follow_inserts_and_deletes(self):
+        college = College.objects.order_by("pk").first()
+        Major.objects.create(college=college, name="Extra", code="EXT")
+        club = Club.objects.create(college=college, name="Extra Club")
+        club.delete()
+        stats = CollegeStats.objects.get(college=college)
+        self.assertEqual(stats.major_count, Major.objects.filter(college=college).count())
+        self.assertEqual(stats.club_count, Club.objects.filter(college=college).count())
@@ -1,23 +1,24 @@
-from io import BytesIO
-from django.db.models import Q, Count
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
 from django.views.generic import ListView, DetailView, FormView
 from django.http import JsonResponse, HttpResponse
 from django.shortcuts import render, redirect
 from django.urls import reverse_lazy
 from django.contrib import messages
 
-from .models import College, Major
+from .models import College, CollegeStats, Major
 from .forms import CollegeSearchForm, MajorForm
 from accounts.models import UserProfile
-
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from accounts import chart_data
+from accounts.charts import chart_format, chart_response
+from search import index as search_index
+from monitoring.queries import query_budget
 
 
 # ====================================
 # College List View (Existing)
 # ====================================
+@query_budget(14)
 class CollegeListView(ListView):
     model = College
     template_name = "colleges/college_list.html"
@@ -27,12 +28,8 @@ class CollegeListView(ListView):
         qs = College.objects.all().order_by("abbreviation")
         q = (self.request.GET.get("q") or "").strip()
         if q:
-            qs = qs.filter(
-                Q(college_name__icontains=q)
-                | Q(abbreviation__icontains=q)
-                | Q(city__icontains=q)
-                | Q(state__icontains=q)
-            )
+            # paginated, so every match (the search page keeps the cap)
+            qs = search_index.ranked(qs, q, "college", limit=search_index.UNLIMITED)
         return qs
 
     def get_context_data(self, **kwargs):
@@ -43,22 +40,23 @@ class CollegeListView(ListView):
         if q:
             context["result_count"] = context["object_list"].count()
 
-        # --- Analytics ---
+        # --- Analytics (read from the CollegeStats rollup) ---
+        stats = College.objects.annotate(
+            major_count=Coalesce("stats__major_count", 0),
+            student_count=Coalesce("stats__student_count", 0),
+        ).order_by("abbreviation")
+
         context["total_colleges"] = College.objects.count()
         context["total_majors"] = Major.objects.count()
-        context["total_students"] = UserProfile.objects.filter(college__isnull=False).count()
-
-        context["majors_per_college"] = (
-            College.objects.annotate(major_count=Count("majors"))
-            .values("id", "abbreviation", "college_name", "major_count")
-            .order_by("abbreviation")
+        context["total_students"] = (
+            CollegeStats.objects.aggregate(total=Sum("student_count"))["total"] or 0
         )
 
-        context["students_per_college"] = (
-            UserProfile.objects.filter(college__isnull=False)
-            .values("college__id", "college__abbreviation", "college__college_name")
-            .annotate(student_count=Count("id"))
-            .order_by("college__abbreviation")
+        context["majors_per_college"] = stats.values(
+            "id", "abbreviation", "college_name", "major_count"
+        )
+        context["students_per_college"] = stats.filter(student_count__gt=0).values(
+            "id", "abbreviation", "college_name", "student_count"
         )
 
         return context
@@ -67,6 +65,7 @@ class CollegeListView(ListView):
 # ====================================
 # College Detail View (Existing)
 # ====================================
+@query_budget(10)
 class CollegeDetailView(DetailView):
     model = College
     template_name = "colleges/college_detail.html"
@@ -83,6 +82,7 @@ class CollegeDetailView(DetailView):
 # ====================================
 # JSON Endpoint for Majors (Existing)
 # ====================================
+@query_budget(4)
 def majors_json_view(request, college_id):
     """Return all majors for a given college in JSON format."""
     majors = (
@@ -97,33 +97,9 @@ def majors_json_view(request, college_id):
 # Matplotlib Chart View (Existing)
 # ====================================
 def college_chart(request):
-    """Return a PNG bar chart showing number of majors per college."""
-    data = (
-        College.objects.annotate(num_majors=Count("majors"))
-        .values_list("college_name", "num_majors")
-        .order_by("-num_majors")
-    )
-
-    labels = [d[0] for d in data]
-    counts = [d[1] for d in data]
-
-    fig, ax = plt.subplots(figsize=(8, 4))
-    bars = ax.bar(labels, counts, color="#3b82f6")
-    ax.set_title("Majors per College", fontsize=14, weight="bold")
-    ax.set_xlabel("College")
-    ax.set_ylabel("Number of Majors")
-    ax.tick_params(axis="x", rotation=25)
-
-    for bar, c in zip(bars, counts):
-        ax.text(bar.get_x() + bar.get_width() / 2, c + 0.1, str(c),
-                ha="center", va="bottom", fontsize=9)
-
-    buf = BytesIO()
-    fig.tight_layout()
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
-    buf.seek(0)
-    return HttpResponse(buf.getvalue(), content_type="image/png")
+    """Return a PNG (or ?format=svg) bar chart showing number of majors per college."""
+    data = chart_data.majors_per_college()
+    return chart_response(request, "majors_per_college", data, chart_format(request))
 
 
 # ============================================================
@@ -133,15 +109,14 @@ def college_chart(request):
 # -------------------------------
 # GET Example — College Search
 # -------------------------------
+@query_budget(10)
 def college_search_view(request):
     form = CollegeSearchForm(request.GET or None)
     results = None
 
     if form.is_valid() and form.cleaned_data.get("q"):
         query = form.cleaned_data["q"]
-        results = College.objects.filter(
-            Q(college_name__icontains=query) | Q(abbreviation__icontains=query)
-        )
+        results = search_index.ranked(College.objects.all(), query, "college")
 
     return render(request, "colleges/college_search.html", {
         "form": form,
@@ -3,12 +3,18 @@
 import os
 import sys
 
+# Commands that serve traffic report to /metrics; one-off commands
+# (benchmarks, dataset generation, tests, cache warming) would skew it
+SERVING_COMMANDS = {"runserver", "run_recommender_daemon"}
+
 
 def main():
     """Run administrative tasks."""
     os.environ.setdefault(
         "DJANGO_SETTINGS_MODULE", "Assignment_Project_Om_opate22.settings"
     )
+    if len(sys.argv) > 1 and sys.argv[1] not in SERVING_COMMANDS:
+        os.environ.setdefault("TRAJECT_METRICS_ENABLED", "0")
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
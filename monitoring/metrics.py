@@ -0,0 +1,409 @@
+"""
+Prometheus-format counters and histograms, aggregated across worker processes.
+
+Each process appends its samples to its own memory-mapped file,
+METRICS_DIR/metrics-<pid>.db, and updates them in place:
+
+    [used bytes: int32][pad]  then entries of
+    [key length: int32][key: JSON, space-padded to 8 bytes][value: float64]
+
+An update is a dict lookup plus one struct.pack_into(), so metrics can stay
+on hot paths. GET /metrics reads every file in the directory and sums the
+samples. When a process opens its file it first folds the files of exited
+workers into metrics-archive.db (see compact()), so counters never go
+backwards and the directory holds one file per live worker plus the
+archive. Readers and compaction share a lock file, so a scrape never sees
+a value both in the archive and in the file it came from.
+
+    from monitoring.metrics import Histogram
+
+    BUILD_SECONDS = Histogram("traject_build_seconds", "Build time.", ["kind"])
+
+    @BUILD_SECONDS.time(kind="roadmap")
+    def build(): ...
+
+Histogram buckets are stored per bucket and made cumulative on export.
+METRICS_ENABLED = False turns every update into a no-op.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+from contextlib import ContextDecorator, contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, files are never compacted
+    fcntl = None
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_HEADER = 8
+_INITIAL_SIZE = 64 * 1024
+_ARCHIVE = "metrics-archive.db"
+_LOCK = "metrics.lock"
+
+REGISTRY: Dict[str, "Metric"] = {}
+
+
+# =====================================================
+#  PER-PROCESS FILE
+# =====================================================
+
+class _ValueFile:
+    """Append-only key -> float64 map in one memory-mapped file."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a+b")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _INITIAL_SIZE:
+            self._file.truncate(_INITIAL_SIZE)
+            size = _INITIAL_SIZE
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._used = struct.unpack_from("i", self._map, 0)[0] or _HEADER
+        self._positions = {key: pos for key, pos, _ in _entries(self._map, self._used)}
+
+    def _append(self, key: str) -> int:
+        encoded = key.encode("utf-8")
+        padded = encoded + b" " * (-(len(encoded) + 4) % 8)
+        entry = struct.pack(f"i{len(padded)}sd", len(encoded), padded, 0.0)
+        if self._used + len(entry) > len(self._map):
+            size = len(self._map) * 2
+            while self._used + len(entry) > size:
+                size *= 2
+            self._map.close()
+            self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), size)
+        self._map[self._used:self._used + len(entry)] = entry
+        self._used += len(entry)
+        # Publish the new length last, so readers never see half an entry
+        struct.pack_into("i", self._map, 0, self._used)
+        position = self._used - 8
+        self._positions[key] = position
+        return position
+
+    def add(self, key: str, amount: float):
+        position = self._positions.get(key)
+        if position is None:
+            position = self._append(key)
+        value = struct.unpack_from("d", self._map, position)[0]
+        struct.pack_into("d", self._map, position, value + amount)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def _entries(data, used) -> Iterator[Tuple[str, int, float]]:
+    """(key, value position, value) for every entry in a file's bytes."""
+    position = _HEADER
+    while position < used:
+        length = struct.unpack_from("i", data, position)[0]
+        key_start = position + 4
+        value_position = key_start + length + (-(length + 4) % 8)
+        key = bytes(data[key_start:key_start + length]).decode("utf-8")
+        yield key, value_position, struct.unpack_from("d", data, value_position)[0]
+        position = value_position + 8
+
+
+class _Store:
+    """The current process's value file; reopened after a fork or a METRICS_DIR change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owner = None
+        self._file = None
+
+    def add(self, key: str, amount: float):
+        owner = (os.getpid(), str(settings.METRICS_DIR))
+        with self._lock:
+            if self._owner != owner:
+                # After a fork the inherited map belongs to the parent; leave it alone
+                if self._file is not None and self._owner[0] == owner[0]:
+                    self._file.close()
+                directory = Path(owner[1])
+                if fcntl is not None:
+                    try:
+                        compact(directory)
+                    except OSError:
+                        pass  # retried by the next process that starts
+                self._file = _ValueFile(directory / f"metrics-{owner[0]}.db")
+                self._owner = owner
+            self._file.add(key, amount)
+
+
+_store = _Store()
+
+
+def _add(key: str, amount: float):
+    if settings.METRICS_ENABLED:
+        _store.add(key, amount)
+
+
+@contextmanager
+def _directory_lock(directory: Path, exclusive: bool):
+    """Shared for readers, exclusive for compaction. A no-op without fcntl."""
+    if fcntl is None:
+        yield
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / _LOCK, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+
+
+def _file_samples(path: Path) -> Iterator[Tuple[str, float]]:
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return
+    if len(data) < _HEADER:
+        return
+    used = min(struct.unpack_from("i", data, 0)[0], len(data))
+    for key, _, value in _entries(data, used):
+        yield key, value
+
+
+def _exited(path: Path) -> bool:
+    """True for metrics-<pid>.db files whose process is gone."""
+    pid = path.stem.partition("-")[2]
+    if not pid.isdigit() or int(pid) == os.getpid():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass  # alive, owned by another user
+    return False
+
+
+def compact(directory=None) -> int:
+    """
+    Fold the files of exited processes into metrics-archive.db and delete
+    them. Returns the number of files folded. Only sees processes on this
+    host: don't share METRICS_DIR between machines.
+    """
+    directory = Path(directory or settings.METRICS_DIR)
+    with _directory_lock(directory, exclusive=True):
+        exited = [path for path in directory.glob("metrics-*.db") if _exited(path)]
+        if not exited:
+            return 0
+        archive = directory / _ARCHIVE
+        totals: Dict[str, float] = defaultdict(float)
+        for path in [archive, *exited]:
+            for key, value in _file_samples(path):
+                totals[key] += value
+
+        staging = directory / f"{_ARCHIVE}.tmp"
+        staging.unlink(missing_ok=True)
+        merged = _ValueFile(staging)
+        for key, value in totals.items():
+            merged.add(key, value)
+        merged.close()
+        os.replace(staging, archive)
+        for path in exited:
+            path.unlink(missing_ok=True)
+    return len(exited)
+
+
+def read_samples(directory=None) -> Dict[str, float]:
+    """{sample key: value} summed over the archive and every process file in METRICS_DIR."""
+    directory = Path(directory or settings.METRICS_DIR)
+    totals: Dict[str, float] = defaultdict(float)
+    if not directory.is_dir():
+        return totals
+    with _directory_lock(directory, exclusive=False):
+        for path in sorted(directory.glob("metrics-*.db")):
+            for key, value in _file_samples(path):
+                totals[key] += value
+    return totals
+
+
+# =====================================================
+#  METRICS
+# =====================================================
+
+def _key(name: str, suffix: str, labels: dict) -> str:
+    return json.dumps([name, suffix, sorted(labels.items())], separators=(",", ":"))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        if name in REGISTRY:
+            raise ValueError(f"Metric {name} is already registered")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._keys: Dict[tuple, str] = {}
+        REGISTRY[name] = self
+
+    def _labels(self, labels: dict) -> dict:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return {k: str(v) for k, v in labels.items()}
+
+    def _sample_key(self, suffix: str, labels: dict, le: str = None) -> str:
+        """The encoded sample key, memoized: label values repeat constantly."""
+        cache_key = (suffix, le, *labels.items())
+        key = self._keys.get(cache_key)
+        if key is None:
+            encoded = self._labels(labels)
+            if le is not None:
+                encoded["le"] = le
+            key = self._keys[cache_key] = _key(self.name, suffix, encoded)
+        return key
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        _add(self._sample_key("_total", labels), amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        bound = next((b for b in self.buckets if value <= b), float("inf"))
+        _add(self._sample_key("_bucket", labels, _format_value(bound)), 1)
+        _add(self._sample_key("_sum", labels), value)
+        _add(self._sample_key("_count", labels), 1)
+
+    def time(self, **labels) -> "_Timer":
+        """Observe the duration (seconds) of a block or of every call to a function."""
+        return _Timer(self, labels)
+
+
+class _Timer(ContextDecorator):
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+        self._start = 0.0
+
+    def _recreate_cm(self):
+        return type(self)(self.histogram, self.labels)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self._start, **self.labels)
+        return False
+
+
+# =====================================================
+#  EXPOSITION
+# =====================================================
+
+def _format_value(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def render(samples: Dict[str, float] = None) -> str:
+    """Every registered metric in the Prometheus text format."""
+    samples = read_samples() if samples is None else samples
+    by_metric: Dict[str, List[Tuple[str, list, float]]] = defaultdict(list)
+    for key, value in samples.items():
+        name, suffix, labels = json.loads(key)
+        by_metric[name].append((suffix, [tuple(pair) for pair in labels], value))
+
+    lines = []
+    for name, metric in REGISTRY.items():
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        entries = sorted(by_metric.get(name, []), key=lambda e: (e[1], e[0]))
+        if metric.kind == "histogram":
+            lines.extend(_histogram_lines(metric, entries))
+        else:
+            for suffix, labels, value in entries:
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(metric: Histogram, entries) -> List[str]:
+    series: Dict[tuple, dict] = defaultdict(lambda: {"buckets": defaultdict(float)})
+    for suffix, labels, value in entries:
+        if suffix == "_bucket":
+            le = dict(labels)["le"]
+            series[tuple(pair for pair in labels if pair[0] != "le")]["buckets"][le] = value
+        else:
+            series[tuple(labels)][suffix] = value
+
+    lines = []
+    bounds = [_format_value(b) for b in metric.buckets] + ["+Inf"]
+    for labels, data in sorted(series.items()):
+        cumulative = 0.0
+        for le in bounds:
+            cumulative += data["buckets"].get(le, 0.0)
+            lines.append(f"{metric.name}_bucket{_format_labels(labels + (('le', le),))} "
+                         f"{_format_value(cumulative)}")
+        for suffix in ("_sum", "_count"):
+            lines.append(f"{metric.name}{suffix}{_format_labels(labels)} "
+                         f"{_format_value(data.get(suffix, 0.0))}")
+    return lines
+
+
+# =====================================================
+#  TRAJECT METRICS
+# =====================================================
+
+RECOMMENDATION_SECONDS = Histogram(
+    "traject_recommendation_seconds",
+    "Time spent scoring one kind of recommendation.", ["type"],
+)
+RECOMMENDATION_CANDIDATES = Histogram(
+    "traject_recommendation_candidates",
+    "Candidates with a positive score, before the result limit is applied.", ["type"],
+    buckets=(0, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+CAREERS_SCORED = Histogram(
+    "traject_careers_scored",
+    "Careers scored per ranking (one ranking per request).",
+    buckets=(10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000),
+)
+ROADMAP_BUILD_SECONDS = Histogram(
+    "traject_roadmap_build_seconds", "Time to build one multi-semester roadmap.",
+)
+CHART_RENDER_SECONDS = Histogram(
+    "traject_chart_render_seconds", "Time to render a chart image on a cache miss.", ["chart"],
+)
+CACHE_REQUESTS = Counter(
+    "traject_cache_requests", "Cache lookups by cache and result (hit or miss).", ["cache", "result"],
+)
+EXPORT_BYTES = Counter(
+    "traject_export_bytes", "Bytes streamed by the export endpoints.", ["dataset", "format"],
+)
+DAEMON_REQUESTS = Counter(
+    "traject_recommender_daemon_requests",
+    "Scoring requests sent to the recommender daemon, by outcome (ok, error, unavailable, skipped).",
+    ["kind", "result"],
+)
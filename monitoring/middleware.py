@@ -0,0 +1,80 @@
+"""
+Monitoring middleware.
+
+RequestTimingMiddleware: for a sampled fraction of requests (REQUEST_TIMING_SAMPLE_RATE) it records
+SQL queries, template time and engine phases (see monitoring/timing.py),
+adds them as a Server-Timing header (REQUEST_TIMING_HEADER; off in
+production, where it would show query counts to anyone) and logs one
+JSON line to the "monitoring.requests" logger at INFO (only production
+settings enable that level). Unsampled requests pay for
+one random() call. Requests over their view's @query_budget (see
+monitoring/queries.py) also log a warning.
+
+ProfilerMiddleware runs staff requests that ask for it under a profiler
+(see monitoring/profiling.py).
+"""
+
+import json
+import logging
+import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import profiling
+from .queries import budget_for
+from .timing import track
+
+logger = logging.getLogger("monitoring.requests")
+
+
+class RequestTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        self.add_header = settings.REQUEST_TIMING_HEADER
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        with track() as timings:
+            request.timings = timings
+            response = self.get_response(request)
+
+        if self.add_header:
+            response["Server-Timing"] = timings.server_timing()
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": getattr(request.resolver_match, "view_name", None),
+            "status": response.status_code,
+            "user": request.user.pk if getattr(request, "user", None) and request.user.is_authenticated else None,
+            **timings.as_dict(),
+        }
+        logger.info(json.dumps(record), extra={"timings": record})
+
+        budget = budget_for(getattr(request.resolver_match, "func", None))
+        if budget is not None and timings.queries > budget:
+            logger.warning("%s ran %d queries (budget %d)", record["view"], timings.queries, budget)
+        return response
+
+
+class ProfilerMiddleware:
+    """Must come after AuthenticationMiddleware (it checks request.user.is_staff)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        mode = profiling.requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+        response, profile_id = profiling.profile_request(self.get_response, request, mode)
+        response["X-Profile-Id"] = profile_id
+        return response
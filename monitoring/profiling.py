@@ -0,0 +1,186 @@
+"""
+On-demand request profiling for staff users.
+
+A staff user adds `X-Profile: cprofile|sample` (header) or
+`?_profile=cprofile|sample` (query string) to any request, and
+ProfilerMiddleware runs that request under:
+- "cprofile" (the default): cProfile, plus the stack sampler below,
+- "sample": only a sampling thread that records the request thread's
+  stack every PROFILER_SAMPLE_INTERVAL seconds (low overhead).
+
+Each profile is stored under PROFILER_DIR as
+
+    <id>.json           request metadata
+    <id>.pstats         cProfile stats (cprofile mode)
+    <id>.collapsed.txt  "frame;frame;frame count" lines, for flame graphs
+
+The directory is a ring buffer: only the newest PROFILER_MAX_PROFILES
+are kept. Staff list and download them at /admin/profiles/.
+
+Requests without the trigger only pay for a dict lookup.
+"""
+
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+MODES = ("cprofile", "sample")
+FILES = {"pstats": ".pstats", "collapsed": ".collapsed.txt"}
+_PROFILE_ID = re.compile(r"^\d{8}-\d{6}\.\d{6}-[0-9a-f]{4}$")
+
+
+def requested_mode(request) -> Optional[str]:
+    """The profiling mode a staff request asked for, or None."""
+    value = request.META.get("HTTP_X_PROFILE") or request.GET.get("_profile")
+    if not value:
+        return None
+    user = getattr(request, "user", None)
+    if user is None or not user.is_staff:
+        return None
+    value = value.lower()
+    return value if value in MODES else "cprofile"
+
+
+# =====================================================
+#  STACK SAMPLER
+# =====================================================
+
+def _frame_name(frame) -> str:
+    filename = frame.f_code.co_filename
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base):
+        filename = os.path.relpath(filename, base)
+    else:
+        filename = "/".join(Path(filename).parts[-2:])
+    return f"{filename}:{frame.f_code.co_qualname}"
+
+
+class StackSampler:
+    """Samples one thread's call stack from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+# =====================================================
+#  RUN + STORE
+# =====================================================
+
+def _profile_dir() -> Path:
+    return Path(settings.PROFILER_DIR)
+
+
+def profile_request(get_response, request, mode):
+    """Run get_response(request) under the profiler; returns (response, profile id)."""
+    profiler = cProfile.Profile() if mode == "cprofile" else None
+    started = time.perf_counter()
+    with StackSampler(threading.get_ident(), settings.PROFILER_SAMPLE_INTERVAL) as sampler:
+        if profiler:
+            profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            if profiler:
+                profiler.disable()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    profile_id = save_profile({
+        "method": request.method,
+        "path": request.get_full_path(),
+        "user": request.user.get_username(),
+        "status": response.status_code,
+        "mode": mode,
+        "duration_ms": round(elapsed_ms, 1),
+        "samples": sum(sampler.counts.values()),
+    }, profiler, sampler.collapsed())
+    return response, profile_id
+
+
+def save_profile(meta: dict, profiler, collapsed: str) -> str:
+    """Write one profile into the ring buffer and drop the oldest ones."""
+    directory = _profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    now = datetime.now()
+    # Sorts by creation time; the random suffix keeps concurrent workers apart
+    profile_id = f"{now:%Y%m%d-%H%M%S.%f}-{uuid.uuid4().hex[:4]}"
+    meta = {"id": profile_id, "created": f"{now:%Y-%m-%d %H:%M:%S}", **meta}
+
+    if profiler is not None:
+        profiler.dump_stats(directory / f"{profile_id}{FILES['pstats']}")
+    (directory / f"{profile_id}{FILES['collapsed']}").write_text(collapsed)
+    # Metadata last: a profile is listed only once its files exist
+    (directory / f"{profile_id}.json").write_text(json.dumps(meta))
+
+    _prune(directory, settings.PROFILER_MAX_PROFILES)
+    return profile_id
+
+
+def _prune(directory: Path, keep: int):
+    ids = sorted(path.stem for path in directory.glob("*.json"))
+    for stale in ids[:-keep] if keep > 0 else ids:
+        for suffix in (".json", *FILES.values()):
+            (directory / f"{stale}{suffix}").unlink(missing_ok=True)
+
+
+# =====================================================
+#  BROWSE
+# =====================================================
+
+def list_profiles() -> List[Dict]:
+    """Stored profiles' metadata, newest first."""
+    directory = _profile_dir()
+    profiles = []
+    for path in sorted(directory.glob("*.json"), reverse=True):
+        try:
+            meta = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue  # pruned or half-written by another worker
+        meta["files"] = [kind for kind, suffix in FILES.items()
+                         if (directory / f"{path.stem}{suffix}").exists()]
+        profiles.append(meta)
+    return profiles
+
+
+def profile_path(profile_id: str, kind: str) -> Optional[Path]:
+    """Path of one stored file, or None for unknown / malformed ids."""
+    if kind not in FILES or not _PROFILE_ID.match(profile_id):
+        return None
+    path = _profile_dir() / f"{profile_id}{FILES[kind]}"
+    return path if path.exists() else None
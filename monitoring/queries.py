@@ -0,0 +1,149 @@
+"""
+Query recording, N+1 detection and per-view query budgets.
+
+`record_queries()` captures every SQL statement run in a block (through
+connection.execute_wrapper, so it works with DEBUG off) together with where
+it came from: the innermost template node being rendered ("app/page.html:42")
+or else the innermost project code frame ("accounts/views.py:310 in
+dashboard_view").
+
+Statements are grouped by shape: the SQL with literals and IN-lists
+collapsed, so "WHERE id = 3" and "WHERE id = 4" are the same shape. A shape
+that runs `threshold` or more times in one block is reported as a likely
+N+1, with every origin that triggered it.
+
+Views declare their budget with a decorator:
+
+    @query_budget(25)
+    def dashboard_view(request): ...
+
+QueryBudgetMixin (monitoring/testing.py) checks views against it in tests.
+RequestTimingMiddleware logs a warning when a timed request goes over.
+"""
+
+import re
+import sys
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+N_PLUS_ONE_THRESHOLD = 5
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+# Frames from these paths are never an "origin" (nor this package, except its tests)
+_SKIP_PATHS = ("/django/", "/site-packages/", "/contextlib.py", "/threading.py")
+_OWN_DIR = str(Path(__file__).resolve().parent)
+
+
+def query_shape(sql: str) -> str:
+    """SQL with literals and IN-lists collapsed, for grouping repeats."""
+    shape = _STRING.sub("?", sql)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+def _template_origin(frame) -> Optional[str]:
+    """'template.html:LINE' of the innermost node rendering when the query ran."""
+    while frame is not None:
+        if frame.f_code.co_name == "render_annotated":
+            node = frame.f_locals.get("self")
+            origin = getattr(node, "origin", None)
+            token = getattr(node, "token", None)
+            if origin is not None and token is not None:
+                return f"{origin.template_name or origin.name}:{token.lineno}"
+        frame = frame.f_back
+    return None
+
+
+def _code_origin(frame) -> Optional[str]:
+    """'path.py:LINE in func' of the innermost project frame."""
+    base = str(settings.BASE_DIR)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (filename.startswith(base)
+                and not any(p in filename for p in _SKIP_PATHS)
+                and not (filename.startswith(_OWN_DIR) and not Path(filename).name.startswith("test"))):
+            relative = Path(filename).relative_to(base)
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+@dataclass
+class RecordedQuery:
+    sql: str
+    shape: str
+    origin: str
+
+
+@dataclass
+class QueryLog:
+    queries: List[RecordedQuery] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def record(self, execute, sql, params, many, context):
+        """connection.execute_wrapper() hook."""
+        frame = sys._getframe(1)
+        origin = _template_origin(frame) or _code_origin(frame) or "<unknown>"
+        self.queries.append(RecordedQuery(sql, query_shape(sql), origin))
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold=N_PLUS_ONE_THRESHOLD) -> Dict[str, Counter]:
+        """{shape: Counter(origin -> count)} for shapes run `threshold`+ times."""
+        counts = Counter(q.shape for q in self.queries)
+        origins: Dict[str, Counter] = defaultdict(Counter)
+        for q in self.queries:
+            if counts[q.shape] >= threshold:
+                origins[q.shape][q.origin] += 1
+        return dict(origins)
+
+    def report(self, threshold=N_PLUS_ONE_THRESHOLD) -> str:
+        lines = [f"{len(self.queries)} queries"]
+        repeated = self.repeated(threshold)
+        for shape, origins in sorted(repeated.items(), key=lambda kv: -sum(kv[1].values())):
+            lines.append(f"  {sum(origins.values())}x {shape[:200]}")
+            for origin, count in origins.most_common(5):
+                lines.append(f"      {count}x from {origin}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def record_queries():
+    """Capture every query (with its shape and origin) run in the block."""
+    log = QueryLog()
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(log.record))
+        yield log
+
+
+# =====================================================
+#  BUDGETS
+# =====================================================
+
+def query_budget(max_queries: int):
+    """Declare the most queries a view may run (function or class-based)."""
+    def decorate(view):
+        view.query_budget = max_queries
+        return view
+    return decorate
+
+
+def budget_for(view_func) -> Optional[int]:
+    """The declared budget of a resolved view (resolver_match.func), if any."""
+    budget = getattr(view_func, "query_budget", None)
+    if budget is None:
+        budget = getattr(getattr(view_func, "view_class", None), "query_budget", None)
+    return budget
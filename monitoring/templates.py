@@ -0,0 +1,31 @@
+"""
+Django template backend that reports render time to monitoring.timing.
+
+Configured as TEMPLATES[...]['BACKEND']; behaves exactly like
+DjangoTemplates otherwise.
+"""
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from .timing import current
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timings = current()
+        if timings is None:
+            return super().render(context, request)
+        with timings.template():
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
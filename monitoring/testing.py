@@ -0,0 +1,64 @@
+"""
+Test helpers for query budgets and N+1 detection.
+
+    class DashboardQueryTests(QueryBudgetMixin, TestCase):
+        def test_dashboard(self):
+            self.client.force_login(self.user)
+            self.assertViewWithinBudget(reverse("accounts:dashboard"))
+
+        def test_custom_block(self):
+            with self.assertQueryBudget(3):
+                list(Career.objects.all())
+
+Works with unittest (manage.py test) and pytest alike.
+create_test_dataset() gives view tests a small but complete catalog with
+several students, checklists and plans, so per-row queries show up as
+repeats.
+"""
+
+from contextlib import contextmanager
+
+from django.urls import resolve
+
+from .queries import N_PLUS_ONE_THRESHOLD, budget_for, record_queries
+
+
+def create_test_dataset(seed=42) -> dict:
+    """A small synthetic dataset (see benchmarks/synthetic.py). Returns row counts."""
+    from benchmarks.synthetic import Scale, generate
+
+    scale = Scale(
+        careers=25, portfolio_items=25, colleges=2, majors_per_college=3,
+        courses_per_major=6, clubs_per_college=4, users=4,
+        checklist_per_user=6, plans_per_user=6,
+    )
+    return generate(scale, seed=seed, prefix="TST")
+
+
+class QueryBudgetMixin:
+    n_plus_one_threshold = N_PLUS_ONE_THRESHOLD
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries, allow_repeats=False):
+        """Fail if the block runs more than `max_queries` queries or repeats a query shape."""
+        with record_queries() as log:
+            yield log
+        if len(log) > max_queries:
+            self.fail(f"Query budget exceeded ({len(log)} > {max_queries}):\n"
+                      f"{log.report(self.n_plus_one_threshold)}")
+        if not allow_repeats:
+            self.assertNoRepeatedQueries(log)
+
+    def assertNoRepeatedQueries(self, log):
+        repeated = log.repeated(self.n_plus_one_threshold)
+        if repeated:
+            self.fail(f"Repeated query shapes (likely N+1):\n{log.report(self.n_plus_one_threshold)}")
+
+    def assertViewWithinBudget(self, path, method="get", data=None, status=200, allow_repeats=False):
+        """Request `path` and check it against the view's @query_budget."""
+        budget = budget_for(resolve(path.split("?")[0]).func)
+        self.assertIsNotNone(budget, f"{path} has no @query_budget")
+        with self.assertQueryBudget(budget, allow_repeats) as log:
+            response = getattr(self.client, method)(path, data)
+        self.assertEqual(response.status_code, status, log.report())
+        return response
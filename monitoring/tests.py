@@ -0,0 +1,253 @@
+import importlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import skipIf
+
+from django.contrib.auth.models import User
+from django.template import Context, Template
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from careers.models import Career
+from monitoring import metrics, profiling
+from monitoring.queries import budget_for, query_budget, query_shape, record_queries
+from monitoring.testing import QueryBudgetMixin
+from monitoring.timing import phase, track
+
+
+class QueryShapeTests(SimpleTestCase):
+    def test_literals_and_in_lists_collapse(self):
+        self.assertEqual(
+            query_shape("SELECT * FROM t WHERE id = 3 AND name = 'x' AND pk IN (%s, %s, %s)"),
+            query_shape("SELECT * FROM t WHERE id = 14 AND name = 'it''s'  AND pk IN (%s)"),
+        )
+
+    def test_different_tables_differ(self):
+        self.assertNotEqual(query_shape("SELECT * FROM a"), query_shape("SELECT * FROM b"))
+
+
+class BudgetDeclarationTests(SimpleTestCase):
+    def test_function_and_class_views(self):
+        @query_budget(4)
+        def view(request):
+            pass
+
+        @query_budget(7)
+        class View:
+            pass
+
+        def as_view():
+            pass
+        as_view.view_class = View
+
+        self.assertEqual(budget_for(view), 4)
+        self.assertEqual(budget_for(as_view), 7)
+        self.assertIsNone(budget_for(lambda request: None))
+
+
+class RecorderTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Career.objects.bulk_create(Career(title=f"Career {i}") for i in range(6))
+
+    def test_repeats_name_the_code_frame(self):
+        with record_queries() as log:
+            for pk in Career.objects.values_list("pk", flat=True):
+                Career.objects.get(pk=pk)
+        repeated = log.repeated()
+        self.assertEqual(len(repeated), 1)
+        [origins] = repeated.values()
+        [origin] = origins
+        self.assertTrue(origin.startswith("monitoring/tests.py:"), origin)
+
+    def test_repeats_name_the_template_line(self):
+        template = Template(
+            "{% for c in careers %}\n{{ c.portfolio_items.count }}\n{% endfor %}"
+        )
+        with record_queries() as log:
+            template.render(Context({"careers": Career.objects.all()}))
+        [origins] = log.repeated().values()
+        self.assertEqual(list(origins), ["<unknown source>:2"])
+
+    def test_budget_failure(self):
+        with self.assertRaises(AssertionError):
+            with self.assertQueryBudget(1):
+                list(Career.objects.all())
+                list(Career.objects.all())
+
+    def test_within_budget(self):
+        with self.assertQueryBudget(1):
+            list(Career.objects.all())
+
+
+class PhaseTests(SimpleTestCase):
+    def test_noop_outside_track(self):
+        with phase("outside"):
+            pass
+
+    def test_decorator_records_each_call(self):
+        @phase("work")
+        def work():
+            return 1
+
+        with track() as timings:
+            work()
+            work()
+        self.assertEqual(timings.phases["work"][1], 2)
+        self.assertIn("work;dur=", timings.server_timing())
+
+
+class RequestTimingTests(TestCase):
+    def test_timed_requests_log_at_info_only(self):
+        logger = logging.getLogger("monitoring.requests")
+        self.assertFalse(logger.isEnabledFor(logging.INFO))  # production.py opts in
+
+        with self.assertLogs(logger, logging.INFO) as logs:
+            response = self.client.get(reverse("search:api"), {"q": "engineer"})
+        self.assertIn("db;dur=", response["Server-Timing"])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record["view"], record["status"]), ("search:api", 200))
+
+    @override_settings(REQUEST_TIMING_HEADER=False)
+    def test_header_can_be_turned_off(self):
+        response = self.client.get(reverse("search:api"), {"q": "engineer"})
+        self.assertNotIn("Server-Timing", response)
+
+    def test_production_does_not_send_the_header(self):
+        production = importlib.import_module("Assignment_Project_Om_opate22.settings.production")
+        self.assertFalse(production.REQUEST_TIMING_HEADER)
+
+
+class ProfilerTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings = override_settings(PROFILER_DIR=tmp.name, PROFILER_MAX_PROFILES=3)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        self.student = User.objects.create_user("student", password="pw")
+
+    def test_ring_buffer_keeps_newest(self):
+        ids = [profiling.save_profile({"path": f"/{i}"}, None, "a;b 1\n") for i in range(5)]
+        self.assertEqual([p["id"] for p in profiling.list_profiles()], ids[:1:-1])
+        self.assertIsNone(profiling.profile_path(ids[0], "collapsed"))
+        self.assertIsNotNone(profiling.profile_path(ids[-1], "collapsed"))
+
+    def test_staff_request_is_profiled(self):
+        self.client.force_login(self.staff)
+        response = self.client.get("/?_profile=cprofile")
+        profile_id = response["X-Profile-Id"]
+        self.assertIsNotNone(profiling.profile_path(profile_id, "pstats"))
+
+        download = self.client.get(reverse("monitoring:profile_download", args=[profile_id, "pstats"]))
+        self.assertEqual(download.status_code, 200)
+        self.assertContains(self.client.get(reverse("monitoring:profile_list")), profile_id)
+
+    def test_sample_mode_header(self):
+        self.client.force_login(self.staff)
+        response = self.client.get("/", headers={"X-Profile": "sample"})
+        profile_id = response["X-Profile-Id"]
+        self.assertIsNone(profiling.profile_path(profile_id, "pstats"))
+        self.assertIsNotNone(profiling.profile_path(profile_id, "collapsed"))
+
+    def test_non_staff_is_ignored(self):
+        self.client.force_login(self.student)
+        response = self.client.get("/?_profile=cprofile")
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(profiling.list_profiles(), [])
+        self.assertNotEqual(self.client.get(reverse("monitoring:profile_list")).status_code, 200)
+
+    def test_malformed_id_is_rejected(self):
+        self.assertIsNone(profiling.profile_path("../../settings", "pstats"))
+        self.assertIsNone(profiling.profile_path("20260101-000000.000000-abcd", "json"))
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        settings = override_settings(METRICS_DIR=self.dir, METRICS_ENABLED=True)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_counters_sum_across_process_files(self):
+        metrics.CACHE_REQUESTS.inc(cache="chart", result="hit")
+        metrics.CACHE_REQUESTS.inc(2, cache="chart", result="hit")
+        # Another worker's file
+        other = metrics._ValueFile(Path(self.dir) / "metrics-1.db")
+        other.add(metrics._key("traject_cache_requests", "_total", {"cache": "chart", "result": "hit"}), 4)
+        other.close()
+
+        text = metrics.render()
+        self.assertIn('traject_cache_requests_total{cache="chart",result="hit"} 7.0', text)
+        self.assertIn("# TYPE traject_cache_requests counter", text)
+
+    @skipIf(metrics.fcntl is None, "compaction needs fcntl")
+    def test_exited_workers_are_folded_into_the_archive(self):
+        key = metrics._key("traject_cache_requests", "_total", {"cache": "chart", "result": "hit"})
+        exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                                capture_output=True, text=True).stdout.strip()
+        for name, amount in ((f"metrics-{exited}.db", 4), ("metrics-archive.db", 1)):
+            values = metrics._ValueFile(Path(self.dir) / name)
+            values.add(key, amount)
+            values.close()
+
+        metrics.CACHE_REQUESTS.inc(2, cache="chart", result="hit")  # opening our file compacts
+        self.assertEqual({p.name for p in Path(self.dir).glob("metrics-*.db")},
+                         {"metrics-archive.db", f"metrics-{os.getpid()}.db"})
+        self.assertEqual(metrics.read_samples()[key], 7)
+        self.assertEqual(metrics.compact(), 0)
+
+    def test_histogram_buckets_are_cumulative(self):
+        for seconds in (0.003, 0.02, 0.02, 30):
+            metrics.ROADMAP_BUILD_SECONDS.observe(seconds)
+        text = metrics.render()
+        self.assertIn('traject_roadmap_build_seconds_bucket{le="0.005"} 1.0', text)
+        self.assertIn('traject_roadmap_build_seconds_bucket{le="0.025"} 3.0', text)
+        self.assertIn('traject_roadmap_build_seconds_bucket{le="10.0"} 3.0', text)
+        self.assertIn('traject_roadmap_build_seconds_bucket{le="+Inf"} 4.0', text)
+        self.assertIn("traject_roadmap_build_seconds_count 4.0", text)
+
+    def test_file_grows_past_initial_size(self):
+        for i in range(2000):
+            metrics.CHART_RENDER_SECONDS.observe(0.1, chart=f"chart-{i}")
+        samples = metrics.read_samples()
+        self.assertEqual(samples[metrics._key("traject_chart_render_seconds", "_count", {"chart": "chart-1999"})], 1)
+
+    def test_wrong_labels_are_rejected(self):
+        with self.assertRaises(ValueError):
+            metrics.CACHE_REQUESTS.inc(cache="chart")
+
+    def test_disabled_records_nothing(self):
+        with override_settings(METRICS_ENABLED=False):
+            metrics.CACHE_REQUESTS.inc(cache="chart", result="miss")
+        self.assertEqual(metrics.read_samples(), {})
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.5"])
+    def test_endpoint(self):
+        metrics.EXPORT_BYTES.inc(100, dataset="courses", format="csv")
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.5")
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        self.assertContains(response, 'traject_export_bytes_total{dataset="courses",format="csv"} 100.0')
+        self.assertEqual(self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.9").status_code, 403)
+
+    @override_settings(METRICS_ALLOWED_IPS=[], METRICS_TOKEN="s3cret")
+    def test_proxied_clients_need_the_token_or_staff(self):
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url).status_code, 403)  # loopback, as behind a proxy
+        self.assertEqual(self.client.get(url, headers={"Authorization": "Bearer wrong"}).status_code, 403)
+        self.assertEqual(self.client.get(url, headers={"Authorization": "Bearer s3cret"}).status_code, 200)
+        self.client.force_login(User.objects.create_user("ops", password="x", is_staff=True))
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_empty_token_grants_nothing(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.9", headers={"Authorization": "Bearer "})
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,146 @@
+"""
+Per-request timing: SQL queries, template rendering and named phases.
+
+`track()` starts a RequestTimings and makes it current (a ContextVar). While
+it is active:
+- every SQL query on every connection is counted and timed through
+  connection.execute_wrapper(),
+- templates loaded through monitoring.templates.TimedDjangoTemplates add
+  their render time,
+- code can mark its own phases, as a context manager or a decorator:
+
+    from monitoring.timing import phase
+
+    with phase("career_scoring"):
+        ...
+
+RequestTimingMiddleware wraps a sampled fraction of requests in track().
+Outside a tracked block phase() costs one ContextVar lookup, so it can stay
+in hot paths.
+"""
+
+import re
+import time
+from contextlib import ContextDecorator, ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from django.db import connections
+
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+_METRIC_NAME = re.compile(r"[^A-Za-z0-9_-]")
+
+
+class RequestTimings:
+    """Counters for one request (or any other tracked block)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.queries = 0
+        self.query_ms = 0.0
+        self.template_ms = 0.0
+        self.phases: Dict[str, list] = {}  # name -> [total ms, calls]
+        self._template_depth = 0
+
+    @property
+    def total_ms(self) -> float:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return (end - self.started) * 1000
+
+    def add_phase(self, name: str, ms: float):
+        entry = self.phases.setdefault(name, [0.0, 0])
+        entry[0] += ms
+        entry[1] += 1
+
+    def record_query(self, execute, sql, params, many, context):
+        """connection.execute_wrapper() hook."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_ms += (time.perf_counter() - start) * 1000
+
+    @contextmanager
+    def template(self):
+        """Time a template render; nested renders count once."""
+        self._template_depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._template_depth -= 1
+            if self._template_depth == 0:
+                self.template_ms += (time.perf_counter() - start) * 1000
+
+    def as_dict(self) -> dict:
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "queries": self.queries,
+            "db_ms": round(self.query_ms, 2),
+            "template_ms": round(self.template_ms, 2),
+            "phases": {
+                name: {"ms": round(ms, 2), "calls": calls}
+                for name, (ms, calls) in self.phases.items()
+            },
+        }
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header."""
+        metrics = [
+            f'db;dur={self.query_ms:.1f};desc="{self.queries} queries"',
+            f"tpl;dur={self.template_ms:.1f}",
+        ]
+        for name, (ms, calls) in self.phases.items():
+            metric = f"{_METRIC_NAME.sub('_', name)};dur={ms:.1f}"
+            if calls > 1:
+                metric += f';desc="{calls} calls"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={self.total_ms:.1f}")
+        return ", ".join(metrics)
+
+
+def current() -> Optional[RequestTimings]:
+    """The active RequestTimings, or None outside a tracked block."""
+    return _current.get()
+
+
+@contextmanager
+def track():
+    """Record queries, template time and phases for the enclosed block."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(timings.record_query))
+            yield timings
+    finally:
+        timings.finished = time.perf_counter()
+        _current.reset(token)
+
+
+class phase(ContextDecorator):
+    """Add the enclosed block's duration to the current request under `name`."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._timings = None
+        self._start = 0.0
+
+    def _recreate_cm(self):
+        # A fresh instance per decorated call, so recursion and threads are safe
+        return type(self)(self.name)
+
+    def __enter__(self):
+        self._timings = _current.get()
+        if self._timings is not None:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._timings is not None:
+            self._timings.add_phase(self.name, (time.perf_counter() - self._start) * 1000)
+        return False
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from django.urls import path
+
+from . import views
+
+app_name = "monitoring"
+
+# Mounted under /admin/profiles/; admin_view() limits them to active staff
+urlpatterns = [
+    path("", admin.site.admin_view(views.profile_list), name="profile_list"),
+    path("<str:profile_id>/<str:kind>/", admin.site.admin_view(views.profile_download),
+         name="profile_download"),
+]
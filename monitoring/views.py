@@ -0,0 +1,44 @@
+import hmac
+
+from django.conf import settings
+from django.contrib import admin
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden
+from django.shortcuts import render
+from django.views.decorators.cache import never_cache
+
+from . import metrics, profiling
+
+
+def _has_metrics_token(request) -> bool:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return (bool(settings.METRICS_TOKEN) and scheme.lower() == "bearer"
+            and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()))
+
+
+@never_cache
+def metrics_view(request):
+    """Prometheus scrape endpoint: for staff users, METRICS_ALLOWED_IPS or the METRICS_TOKEN bearer token."""
+    allowed = (request.user.is_staff
+               or request.META.get("REMOTE_ADDR") in settings.METRICS_ALLOWED_IPS
+               or _has_metrics_token(request))
+    if not allowed:
+        return HttpResponseForbidden("Metrics are not available to this client.")
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+def profile_list(request):
+    """Admin page: stored request profiles, newest first."""
+    context = {
+        **admin.site.each_context(request),
+        "title": "Request profiles",
+        "profiles": profiling.list_profiles(),
+        "max_profiles": profiling.settings.PROFILER_MAX_PROFILES,
+    }
+    return render(request, "monitoring/profile_list.html", context)
+
+
+def profile_download(request, profile_id, kind):
+    path = profiling.profile_path(profile_id, kind)
+    if path is None:
+        raise Http404("Profile not found (it may have been rotated out).")
+    return FileResponse(path.open("rb"), as_attachment=True, filename=path.name)
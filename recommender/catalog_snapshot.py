@@ -0,0 +1,420 @@
+"""
+Read-only catalog snapshot shared by every worker process.
+
+`build_snapshot()` flattens careers, portfolio items, courses and clubs
+into numpy arrays and publishes them through recommender/model_store.py:
+
+    <RECOMMENDER_MODEL_DIR>/catalog-<stamp>/*.npy
+
+Workers memory-map the files, so the OS page cache holds one copy however
+many workers there are, and a worker's own memory does not grow with the
+catalog. Layout:
+
+- strings:  every distinct text is stored once in `string_data` (UTF-8),
+            sliced by `string_offsets`; other arrays hold int32 string ids.
+- skills:   the sorted skill vocabulary (lower-cased, as the engine
+            compares them), as string ids; a skill's id is its position.
+- careers / portfolio items: ids and fields as parallel arrays, in the
+            engine's order (CAREER_ORDER / ITEM_ORDER), skills
+            as CSR lists (`*_skill_indptr`, `*_skill_ids`) and as bitsets,
+            one row of uint64 words per object (`*_skill_bits`).
+- courses / clubs: sorted by major / college, so one group is one slice.
+
+RecommendationEngine reads its scoring candidates from a current snapshot
+(careers(), portfolio_items(), courses_for_major(), clubs_for_college()
+yield the same projected rows as its database queries), decoding
+ROW_CHUNK rows at a time, so a request neither queries the catalog tables
+nor holds a copy of them.
+
+A snapshot belongs to one catalog version (catalog/version.py) of one
+database. `get_snapshot()` returns None while it is stale, and callers
+use the database. With CATALOG_SNAPSHOT_AUTO_REBUILD the first caller to
+notice starts a rebuild in a background thread, so no request waits for
+it; a file lock makes sure only one worker process builds, and everyone
+keeps using the database until the new build is published.
+
+Rebuild by hand (e.g. on deploy) with `python manage.py build_catalog_snapshot`.
+"""
+
+import fcntl
+import logging
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+
+from catalog.version import get_catalog_version
+
+from . import model_store
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "catalog"
+DIFFICULTY_LEVELS = ("BEGINNER", "INTERMEDIATE", "ADVANCED")
+NO_HOURS = -1
+ROW_CHUNK = 1024  # rows decoded at a time when streaming candidates
+# Row order, shared with the engine's queries so ties rank the same either way
+CAREER_ORDER = ("title", "pk")
+ITEM_ORDER = ("difficulty_level", "title", "pk")
+
+ARRAYS = (
+    "source", "string_data", "string_offsets", "skills",
+    "career_id", "career_title", "career_description",
+    "career_industry_indptr", "career_industry_ids",
+    "career_skill_indptr", "career_skill_ids", "career_skill_bits",
+    "item_id", "item_title", "item_type", "item_difficulty", "item_hours",
+    "item_skill_indptr", "item_skill_ids", "item_skill_bits",
+    "course_id", "course_major_id", "course_subject", "course_number", "course_title",
+    "club_id", "club_college_id", "club_name", "club_category", "club_description",
+)
+
+
+# The engine's projected candidate rows (CAREER_FIELDS etc. in recommender/engine.py)
+CareerRow = namedtuple("CareerRow", ("pk", "title", "description", "industries", "skills"))
+PortfolioRow = namedtuple("PortfolioRow", ("pk", "item_type", "difficulty_level", "estimated_hours",
+                                           "skills_gained"))
+CourseRow = namedtuple("CourseRow", ("pk", "subject", "number", "title"))
+ClubRow = namedtuple("ClubRow", ("pk", "name", "category", "description"))
+
+
+def split_skills(value) -> List[str]:
+    """Career.skills (a list, or a comma string in old rows) or skills_gained -> lower-cased names."""
+    if isinstance(value, str):
+        value = value.split(",")
+    return [s.lower().strip() for s in value or [] if str(s).strip()]
+
+
+def current_source() -> str:
+    """'<catalog version>@<database name>': what a fresh snapshot was built from."""
+    from django.db import connections
+    return f"{get_catalog_version()}@{connections['default'].settings_dict['NAME']}"
+
+
+# =====================================================
+#  BUILD
+# =====================================================
+
+class _Strings:
+    """Interned string table."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def __call__(self, text) -> int:
+        text = text or ""
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.ids)
+        return sid
+
+    def arrays(self):
+        import numpy as np
+
+        encoded = [s.encode("utf-8") for s in self.ids]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _csr(lists):
+    import numpy as np
+
+    indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum([len(values) for values in lists], out=indptr[1:])
+    flat = [value for values in lists for value in values]
+    return indptr, np.array(flat, dtype=np.int32)
+
+
+def _bitsets(skill_lists, n_skills):
+    import numpy as np
+
+    words = max((n_skills + 63) // 64, 1)
+    bits = np.zeros((len(skill_lists), words), dtype=np.uint64)
+    for row, skill_ids in enumerate(skill_lists):
+        for sid in skill_ids:
+            bits[row, sid >> 6] |= np.uint64(1) << np.uint64(sid & 63)
+    return bits
+
+
+def build_snapshot() -> dict:
+    """Flatten the current catalog and publish it. Returns stats."""
+    import numpy as np
+    from accounts.models import Club, Course, PortfolioItem
+    from careers.models import Career
+
+    source = current_source()
+    strings = _Strings()
+
+    careers = list(Career.objects.order_by(*CAREER_ORDER).values_list(
+        "pk", "title", "description", "industries", "skills"))
+    items = list(PortfolioItem.objects.order_by(*ITEM_ORDER).values_list(
+        "pk", "title", "item_type", "difficulty_level", "estimated_hours", "skills_gained"))
+    courses = list(Course.objects.order_by("major_id", "pk").values_list(
+        "pk", "major_id", "subject", "number", "title"))
+    clubs = list(Club.objects.filter(college__isnull=False).order_by("college_id", "pk").values_list(
+        "pk", "college_id", "name", "category", "description"))
+
+    career_skills = [split_skills(c[4]) for c in careers]
+    item_skills = [split_skills(i[5]) for i in items]
+    vocabulary = sorted({s for skills in career_skills + item_skills for s in skills})
+    skill_id = {name: i for i, name in enumerate(vocabulary)}
+    career_skill_ids = [sorted({skill_id[s] for s in skills}) for skills in career_skills]
+    item_skill_ids = [sorted({skill_id[s] for s in skills}) for skills in item_skills]
+
+    def ids(values):
+        return np.array(values, dtype=np.int64)
+
+    def strs(values):
+        return np.array([strings(v) for v in values], dtype=np.int32)
+
+    arrays = {
+        "source": np.frombuffer(source.encode("utf-8"), dtype=np.uint8),
+        "skills": strs(vocabulary),
+        "career_id": ids([c[0] for c in careers]),
+        "career_title": strs([c[1] for c in careers]),
+        "career_description": strs([c[2] for c in careers]),
+        "career_skill_bits": _bitsets(career_skill_ids, len(vocabulary)),
+        "item_id": ids([i[0] for i in items]),
+        "item_title": strs([i[1] for i in items]),
+        "item_type": strs([i[2] for i in items]),
+        "item_difficulty": np.array(
+            [DIFFICULTY_LEVELS.index(i[3]) if i[3] in DIFFICULTY_LEVELS else 0 for i in items],
+            dtype=np.int8),
+        "item_hours": np.array([NO_HOURS if i[4] is None else i[4] for i in items], dtype=np.int32),
+        "item_skill_bits": _bitsets(item_skill_ids, len(vocabulary)),
+        "course_id": ids([c[0] for c in courses]),
+        "course_major_id": ids([c[1] for c in courses]),
+        "course_subject": strs([c[2] for c in courses]),
+        "course_number": strs([c[3] for c in courses]),
+        "course_title": strs([c[4] for c in courses]),
+        "club_id": ids([c[0] for c in clubs]),
+        "club_college_id": ids([c[1] for c in clubs]),
+        "club_name": strs([c[2] for c in clubs]),
+        "club_category": strs([c[3] for c in clubs]),
+        "club_description": strs([c[4] for c in clubs]),
+    }
+    arrays["career_industry_indptr"], arrays["career_industry_ids"] = _csr(
+        [[strings(i.lower().strip()) for i in c[3] or [] if str(i).strip()] for c in careers])
+    arrays["career_skill_indptr"], arrays["career_skill_ids"] = _csr(career_skill_ids)
+    arrays["item_skill_indptr"], arrays["item_skill_ids"] = _csr(item_skill_ids)
+    # Last, so every string above is in the table
+    arrays["string_data"], arrays["string_offsets"] = strings.arrays()
+
+    target = model_store.publish(MODEL_NAME, arrays)
+    return {
+        "source": source,
+        "careers": len(careers),
+        "portfolio_items": len(items),
+        "courses": len(courses),
+        "clubs": len(clubs),
+        "skills": len(vocabulary),
+        "strings": len(strings.ids),
+        "bytes": sum(a.nbytes for a in arrays.values()),
+        "path": str(target),
+    }
+
+
+# =====================================================
+#  READ
+# =====================================================
+
+class CatalogSnapshot:
+    """Memory-mapped view over one published build."""
+
+    def __init__(self, path: Path):
+        self.arrays = model_store.load_arrays(path, ARRAYS)
+        self.source = bytes(self.arrays["source"]).decode("utf-8")
+        self._data = self.arrays["string_data"]
+        self._text = memoryview(self._data)
+        self._offsets = self.arrays["string_offsets"]
+        self._skills = self.arrays["skills"]
+
+    def __getattr__(self, name):
+        # snapshot.career_id etc. are the arrays themselves
+        try:
+            return self.__dict__["arrays"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def string(self, sid: int) -> str:
+        return bytes(self._data[self._offsets[sid]:self._offsets[sid + 1]]).decode("utf-8")
+
+    def strings(self, sids) -> List[str]:
+        """Decode an array of string ids."""
+        starts = self._offsets[sids].tolist()
+        ends = self._offsets[sids + 1].tolist()
+        return [str(self._text[start:end], "utf-8") for start, end in zip(starts, ends)]
+
+    # --- skills ---
+
+    @property
+    def skill_count(self) -> int:
+        return len(self._skills)
+
+    def skill_name(self, skill_id: int) -> str:
+        return self.string(self._skills[skill_id])
+
+    def skill_names(self) -> List[str]:
+        return [self.skill_name(i) for i in range(self.skill_count)]
+
+    def skill_id(self, name: str) -> Optional[int]:
+        """Id of a lower-cased skill name (binary search, no per-worker dict)."""
+        i = bisect_left(range(self.skill_count), name, key=self.skill_name)
+        return i if i < self.skill_count and self.skill_name(i) == name else None
+
+    def skill_mask(self, names) -> int:
+        """Bitset (Python int) of the known skills among `names`."""
+        mask = 0
+        for name in names:
+            sid = self.skill_id(name)
+            if sid is not None:
+                mask |= 1 << sid
+        return mask
+
+    @staticmethod
+    def row_mask(bits_row) -> int:
+        """One `*_skill_bits` row as a Python int."""
+        return int.from_bytes(bits_row.tobytes(), "little")
+
+    # --- grouped rows ---
+
+    def _group(self, key_array, key) -> slice:
+        import numpy as np
+        return slice(int(np.searchsorted(key_array, key, "left")),
+                     int(np.searchsorted(key_array, key, "right")))
+
+    def course_rows(self, major_id) -> slice:
+        return self._group(self.arrays["course_major_id"], major_id)
+
+    def club_rows(self, college_id) -> slice:
+        return self._group(self.arrays["club_college_id"], college_id)
+
+    # --- candidate rows ---
+
+    @staticmethod
+    def _chunks(rows: slice) -> Iterator[tuple]:
+        for start in range(rows.start, rows.stop, ROW_CHUNK):
+            yield start, min(start + ROW_CHUNK, rows.stop)
+
+    def _lists(self, indptr, ids, start, stop, decode) -> List[List[str]]:
+        """Rows start..stop of a CSR column, decoded."""
+        bounds = indptr[start:stop + 1].tolist()
+        flat = decode(ids[bounds[0]:bounds[-1]])
+        return [flat[low - bounds[0]:high - bounds[0]] for low, high in zip(bounds, bounds[1:])]
+
+    def _skill_names(self, skill_ids) -> List[str]:
+        return self.strings(self._skills[skill_ids])
+
+    def careers(self) -> Iterator[CareerRow]:
+        a = self.arrays
+        for start, stop in self._chunks(slice(0, len(a["career_id"]))):
+            yield from map(
+                CareerRow,
+                a["career_id"][start:stop].tolist(),
+                self.strings(a["career_title"][start:stop]),
+                self.strings(a["career_description"][start:stop]),
+                self._lists(a["career_industry_indptr"], a["career_industry_ids"], start, stop, self.strings),
+                self._lists(a["career_skill_indptr"], a["career_skill_ids"], start, stop, self._skill_names),
+            )
+
+    def portfolio_items(self) -> Iterator[PortfolioRow]:
+        a = self.arrays
+        for start, stop in self._chunks(slice(0, len(a["item_id"]))):
+            skills = self._lists(a["item_skill_indptr"], a["item_skill_ids"], start, stop, self._skill_names)
+            yield from map(
+                PortfolioRow,
+                a["item_id"][start:stop].tolist(),
+                self.strings(a["item_type"][start:stop]),
+                [DIFFICULTY_LEVELS[d] for d in a["item_difficulty"][start:stop].tolist()],
+                [None if h == NO_HOURS else h for h in a["item_hours"][start:stop].tolist()],
+                [", ".join(names) for names in skills],
+            )
+
+    def courses_for_major(self, major_id) -> Iterator[CourseRow]:
+        a = self.arrays
+        for start, stop in self._chunks(self.course_rows(major_id)):
+            yield from map(
+                CourseRow,
+                a["course_id"][start:stop].tolist(),
+                self.strings(a["course_subject"][start:stop]),
+                self.strings(a["course_number"][start:stop]),
+                self.strings(a["course_title"][start:stop]),
+            )
+
+    def clubs_for_college(self, college_id) -> Iterator[ClubRow]:
+        a = self.arrays
+        for start, stop in self._chunks(self.club_rows(college_id)):
+            yield from map(
+                ClubRow,
+                a["club_id"][start:stop].tolist(),
+                self.strings(a["club_name"][start:stop]),
+                self.strings(a["club_category"][start:stop]),
+                self.strings(a["club_description"][start:stop]),
+            )
+
+
+def _lock_path() -> Path:
+    return model_store.model_dir() / f"{MODEL_NAME}.lock"
+
+
+def rebuild_if_stale() -> bool:
+    """Rebuild unless another process is already doing it. True if this call rebuilt."""
+    model_store.model_dir().mkdir(parents=True, exist_ok=True)
+    with open(_lock_path(), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        current = model_store.get_published(MODEL_NAME, CatalogSnapshot)
+        if current is not None and current.source == current_source():
+            return False  # published while we waited for the lock
+        build_snapshot()
+        return True
+
+
+_background_rebuild = threading.Lock()  # held while this process has a rebuild running
+
+
+def _rebuild_worker():
+    from django.db import connection
+
+    try:
+        rebuild_if_stale()
+    except Exception:
+        logger.exception("Catalog snapshot rebuild failed")
+    finally:
+        connection.close()  # the thread's own connection
+        _background_rebuild.release()
+
+
+def rebuild_in_background() -> bool:
+    """Start rebuild_if_stale() in a thread unless one is already running. True if started."""
+    if not _background_rebuild.acquire(blocking=False):
+        return False
+    threading.Thread(target=_rebuild_worker, name="catalog-snapshot", daemon=True).start()
+    return True
+
+
+def get_snapshot(rebuild: bool = None) -> Optional[CatalogSnapshot]:
+    """
+    The snapshot for the current catalog version, or None (use the database).
+    rebuild=True rebuilds a stale snapshot before returning (start-up and
+    commands); the default only schedules a background rebuild when
+    CATALOG_SNAPSHOT_AUTO_REBUILD is set.
+    """
+    source = current_source()
+    snapshot = model_store.get_published(MODEL_NAME, CatalogSnapshot)
+    if snapshot is not None and snapshot.source == source:
+        return snapshot
+    if rebuild is None:
+        if settings.CATALOG_SNAPSHOT_AUTO_REBUILD:
+            rebuild_in_background()
+        return None
+    if rebuild and rebuild_if_stale():
+        snapshot = model_store.get_published(MODEL_NAME, CatalogSnapshot)
+        if snapshot is not None and snapshot.source == source:
+            return snapshot
+    return None
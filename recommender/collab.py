@@ -0,0 +1,229 @@
+"""
+Item-item collaborative filtering from student behaviour.
+
+Signals: which portfolio items students put on their checklist (weighted
+by status), which careers they build a CareerPlan around, and which
+portfolio items they add to a plan. Careers and portfolio items share a
+single item space, so "students who planned for Data Scientist also
+picked the Kaggle project" is learned directly.
+
+`build_model()` turns those signals into a cosine item-item similarity
+matrix (top-N neighbours per item) stored as CSR arrays:
+
+    <RECOMMENDER_MODEL_DIR>/cf-<stamp>/{indptr,indices,data,item_kind,item_id}.npy
+
+published and memory-mapped through recommender/model_store.py, so every
+worker process shares one copy. numpy is imported lazily.
+
+Rebuild with `python manage.py build_cf_model`.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+
+from . import model_store
+
+PORTFOLIO = 0
+CAREER = 1
+
+ItemKey = Tuple[int, int]  # (PORTFOLIO | CAREER, object id)
+
+CHECKLIST_WEIGHTS = {
+    'COMPLETED': 1.0,
+    'IN_PROGRESS': 0.8,
+    'PLANNED': 0.5,
+    'ABANDONED': 0.0,
+}
+PRIMARY_PLAN_WEIGHT = 1.0
+ACTIVE_PLAN_WEIGHT = 0.8
+INACTIVE_PLAN_WEIGHT = 0.3
+PLAN_ITEM_WEIGHT = 0.7
+
+MODEL_NAME = "cf"
+ARRAYS = ("indptr", "indices", "data", "item_kind", "item_id")
+
+
+# =====================================================
+#  SIGNALS -> USER x ITEM WEIGHTS
+# =====================================================
+
+def collect_interactions(user_profile=None) -> Dict[int, Dict[ItemKey, float]]:
+    """{profile id: {item key: weight}}, keeping the strongest signal per item."""
+    from accounts.models import CareerPlan, PlanItem, UserChecklist
+
+    interactions: Dict[int, Dict[ItemKey, float]] = {}
+
+    def add(profile_id, key, weight):
+        if weight <= 0:
+            return
+        items = interactions.setdefault(profile_id, {})
+        items[key] = max(items.get(key, 0.0), weight)
+
+    checklists = UserChecklist.objects.all()
+    plans = CareerPlan.objects.all()
+    plan_items = PlanItem.objects.filter(portfolio_item__isnull=False)
+    if user_profile is not None:
+        checklists = checklists.filter(user_profile=user_profile)
+        plans = plans.filter(user_profile=user_profile)
+        plan_items = plan_items.filter(career_plan__user_profile=user_profile)
+
+    for profile_id, item_id, status in checklists.values_list(
+            'user_profile_id', 'portfolio_item_id', 'status').iterator():
+        add(profile_id, (PORTFOLIO, item_id), CHECKLIST_WEIGHTS.get(status, 0.5))
+
+    for profile_id, career_id, is_primary, is_active in plans.values_list(
+            'user_profile_id', 'target_career_id', 'is_primary', 'is_active').iterator():
+        if is_primary:
+            weight = PRIMARY_PLAN_WEIGHT
+        else:
+            weight = ACTIVE_PLAN_WEIGHT if is_active else INACTIVE_PLAN_WEIGHT
+        add(profile_id, (CAREER, career_id), weight)
+
+    for profile_id, item_id in plan_items.values_list(
+            'career_plan__user_profile_id', 'portfolio_item_id').iterator():
+        add(profile_id, (PORTFOLIO, item_id), PLAN_ITEM_WEIGHT)
+
+    return interactions
+
+
+# =====================================================
+#  BUILD
+# =====================================================
+
+def compute_similarity(interactions, neighbours):
+    """
+    Cosine item-item similarity over the user x item weights.
+    Returns (item_keys, indptr, indices, data) with at most `neighbours`
+    entries per row, strongest first.
+    """
+    import numpy as np
+
+    keys = sorted({key for items in interactions.values() for key in items})
+    position = {key: i for i, key in enumerate(keys)}
+    n_items = len(keys)
+
+    rows, cols, vals = [], [], []
+    norms = np.zeros(n_items)
+    for items in interactions.values():
+        idx = np.fromiter((position[k] for k in items), dtype=np.int64, count=len(items))
+        weights = np.fromiter(items.values(), dtype=np.float64, count=len(items))
+        norms[idx] += weights ** 2
+        if len(idx) < 2:
+            continue
+        # Every ordered pair of distinct items this user touched
+        r, c = np.meshgrid(idx, idx, indexing="ij")
+        w = np.outer(weights, weights)
+        off_diagonal = r != c
+        rows.append(r[off_diagonal])
+        cols.append(c[off_diagonal])
+        vals.append(w[off_diagonal])
+
+    indptr = np.zeros(n_items + 1, dtype=np.int64)
+    if not rows:
+        return keys, indptr, np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+
+    rows, cols, vals = np.concatenate(rows), np.concatenate(cols), np.concatenate(vals)
+
+    # Sum duplicate (row, col) pairs: co-occurrence dot products
+    flat = rows * n_items + cols
+    order = np.argsort(flat, kind="stable")
+    flat, vals = flat[order], vals[order]
+    starts = np.flatnonzero(np.r_[True, flat[1:] != flat[:-1]])
+    dots = np.add.reduceat(vals, starts)
+    rows, cols = np.divmod(flat[starts], n_items)
+
+    norms = np.sqrt(norms)
+    sims = dots / (norms[rows] * norms[cols])
+
+    # Keep the strongest `neighbours` per row
+    order = np.lexsort((-sims, rows))
+    rows, cols, sims = rows[order], cols[order], sims[order]
+    row_start = np.searchsorted(rows, np.arange(n_items))
+    rank = np.arange(len(rows)) - row_start[rows]
+    keep = rank < neighbours
+    rows, cols, sims = rows[keep], cols[keep], sims[keep]
+
+    np.add.at(indptr, rows + 1, 1)
+    indptr = np.cumsum(indptr)
+    return keys, indptr, cols.astype(np.int32), sims.astype(np.float32)
+
+
+def build_model(neighbours=None) -> dict:
+    """Rebuild the CF model from the database and publish it. Returns stats."""
+    import numpy as np
+
+    neighbours = neighbours or settings.RECOMMENDER_CF_NEIGHBOURS
+    interactions = collect_interactions()
+    keys, indptr, indices, data = compute_similarity(interactions, neighbours)
+
+    target = model_store.publish(MODEL_NAME, {
+        "indptr": indptr,
+        "indices": indices,
+        "data": data,
+        "item_kind": np.array([k[0] for k in keys], dtype=np.int8),
+        "item_id": np.array([k[1] for k in keys], dtype=np.int64),
+    })
+
+    return {
+        "users": len(interactions),
+        "items": len(keys),
+        "pairs": int(len(data)),
+        "path": str(target),
+    }
+
+
+# =====================================================
+#  SERVE
+# =====================================================
+
+class CFModel:
+    """Read-only view over one published build."""
+
+    def __init__(self, path: Path):
+        arrays = model_store.load_arrays(path, ARRAYS)
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.data = arrays["data"]
+        self.position = {
+            (int(kind), int(pk)): i
+            for i, (kind, pk) in enumerate(zip(arrays["item_kind"], arrays["item_id"]))
+        }
+        self.keys = list(self.position)
+
+    def scores(self, history: Dict[ItemKey, float]) -> Dict[ItemKey, float]:
+        """
+        Score every item similar to the user's history, scaled to 0..1.
+        Items already in the history are left out.
+        """
+        totals: Dict[int, float] = {}
+        for key, weight in history.items():
+            row = self.position.get(key)
+            if row is None:
+                continue
+            start, end = self.indptr[row], self.indptr[row + 1]
+            for col, sim in zip(self.indices[start:end].tolist(), self.data[start:end].tolist()):
+                totals[col] = totals.get(col, 0.0) + weight * sim
+
+        results = {self.keys[col]: s for col, s in totals.items() if self.keys[col] not in history}
+        if not results:
+            return {}
+        top = max(results.values())
+        return {key: s / top for key, s in results.items()}
+
+
+def get_model() -> Optional[CFModel]:
+    """The currently published model (None until build_cf_model has run)."""
+    return model_store.get_published(MODEL_NAME, CFModel)
+
+
+def cf_scores_for(user_profile) -> Dict[ItemKey, float]:
+    """Collaborative scores (0..1) for one student, or {} without a model or history."""
+    model = get_model()
+    if model is None:
+        return {}
+    history = collect_interactions(user_profile).get(user_profile.pk, {})
+    if not history:
+        return {}
+    return model.scores(history)
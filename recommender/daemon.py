@@ -0,0 +1,340 @@
+"""
+Standalone recommendation daemon and its client.
+
+`python manage.py run_recommender_daemon` loads the catalog (careers,
+portfolio items, courses, clubs), the skill index and the CF model once,
+then answers scoring requests on a Unix socket (RECOMMENDER_SOCKET).
+The catalog is reloaded when the catalog version changes.
+
+Protocol: JSON lines, one request and one response per line, over a
+connection that stays open between requests.
+
+    -> {"kind": "portfolio", "profile": {...profile fields...}, "params": {"limit": 8}}
+    <- {"ok": true, "results": [{"id": 12, "relevance_score": 70, "reasoning": "..."}]}
+
+kind is "careers", "portfolio", "courses", "clubs", "all" or "ping".
+params may only hold the keyword arguments in KIND_PARAMS ("limit", plus
+"semester" for courses), and profile only PROFILE_FIELDS. A line longer
+than MAX_MESSAGE_BYTES (or cut off without its newline) gets an error
+response and the connection is closed.
+Results name catalog objects by id; the client turns them into the same
+result objects as in-process scoring (recommender/results.py), which load
+their model instances with one in_bulk() per list on first access.
+
+With RECOMMENDER_BACKEND = 'daemon', RecommendationEngine asks the daemon
+first and scores in-process when it is unreachable or fails. After a
+connection failure the daemon is skipped for RECOMMENDER_DAEMON_RETRY
+seconds, so an outage costs one timeout rather than one per request.
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+from accounts.models import Club, Course, PortfolioItem, UserProfile
+from careers.models import Career
+from catalog.version import get_catalog_version
+from monitoring.metrics import DAEMON_REQUESTS
+
+from .engine import CAREER_FIELDS, CLUB_FIELDS, COURSE_FIELDS, PORTFOLIO_FIELDS, RecommendationEngine
+from .results import CareerMatch, ClubMatch, CourseMatch, ObjectBatch, PortfolioMatch
+from .skills import get_skill_index
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+PROFILE_FIELDS = (
+    "id", "skills", "personal_interests", "preferred_industries", "career_goals",
+    "work_experience", "academic_year", "major_id", "college_id",
+)
+
+# kind -> result type
+RESULT_TYPES = {
+    "careers": CareerMatch,
+    "portfolio": PortfolioMatch,
+    "courses": CourseMatch,
+    "clubs": ClubMatch,
+}
+# kind -> keyword arguments a request may pass to its scoring method
+KIND_PARAMS = {
+    "careers": {"limit"},
+    "portfolio": {"limit"},
+    "courses": {"limit", "semester"},
+    "clubs": {"limit"},
+    "all": set(),
+}
+MAX_LIMIT = 100
+
+# get_all_recommendations() key -> kind
+ALL_KINDS = {
+    "careers": "careers",
+    "portfolio_items": "portfolio",
+    "courses": "courses",
+    "clubs": "clubs",
+}
+
+
+def profile_payload(profile) -> dict:
+    return {field: getattr(profile, field) for field in PROFILE_FIELDS}
+
+
+def _invalid_request(kind: str, message: dict) -> Optional[str]:
+    """Why a scoring request can't be served, or None."""
+    profile = message.get("profile")
+    if not isinstance(profile, dict) or not set(profile) <= set(PROFILE_FIELDS):
+        return "profile must be an object with fields from PROFILE_FIELDS"
+    params = message.get("params") or {}
+    if not isinstance(params, dict):
+        return "params must be an object"
+    unknown = set(params) - KIND_PARAMS[kind]
+    if unknown:
+        return f"unknown params for {kind}: {', '.join(sorted(unknown))}"
+    limit = params.get("limit", 1)
+    if type(limit) is not int or not 1 <= limit <= MAX_LIMIT:
+        return f"limit must be an integer from 1 to {MAX_LIMIT}"
+    if not isinstance(params.get("semester", ""), str):
+        return "semester must be a string"
+    return None
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+# =====================================================
+#  SERVER
+# =====================================================
+
+class Catalog:
+    """Every scoring candidate (the engine's projected rows), held in memory for one catalog version."""
+
+    def __init__(self):
+        self.version = get_catalog_version()
+        self.careers = list(Career.objects.values_list(*CAREER_FIELDS, named=True))
+        self.portfolio_items = list(PortfolioItem.objects.values_list(*PORTFOLIO_FIELDS, named=True))
+        self.courses_by_major: Dict[int, list] = defaultdict(list)
+        for course in Course.objects.order_by("pk").values_list(*COURSE_FIELDS, "major_id", named=True):
+            self.courses_by_major[course.major_id].append(course)
+        self.clubs_by_college: Dict[int, list] = defaultdict(list)
+        for club in (Club.objects.filter(college__isnull=False).order_by("pk")
+                     .values_list(*CLUB_FIELDS, "college_id", named=True)):
+            self.clubs_by_college[club.college_id].append(club)
+
+    def __len__(self):
+        return (len(self.careers) + len(self.portfolio_items)
+                + sum(map(len, self.courses_by_major.values()))
+                + sum(map(len, self.clubs_by_college.values())))
+
+
+class CatalogEngine(RecommendationEngine):
+    """RecommendationEngine scoring against the in-memory catalog."""
+
+    def __init__(self, user_profile, catalog: Catalog):
+        super().__init__(user_profile, backend="local")
+        self.catalog = catalog
+
+    def _careers(self):
+        return self.catalog.careers
+
+    def _portfolio_items(self):
+        return self.catalog.portfolio_items
+
+    def _major_courses(self):
+        return self.catalog.courses_by_major.get(self.profile.major_id, [])
+
+    def _college_clubs(self):
+        return self.catalog.clubs_by_college.get(self.profile.college_id, [])
+
+
+def _serialize(results) -> List[Dict]:
+    return [r.as_payload() for r in results]
+
+
+class RecommenderService:
+    """Scores requests; shared by every connection of one daemon."""
+
+    def __init__(self):
+        self._catalog: Optional[Catalog] = None
+        self._lock = threading.Lock()
+
+    def catalog(self) -> Catalog:
+        version = get_catalog_version()
+        if self._catalog is None or self._catalog.version != version:
+            with self._lock:
+                if self._catalog is None or self._catalog.version != version:
+                    started = time.perf_counter()
+                    self._catalog = Catalog()
+                    logger.info("Loaded catalog %s: %d objects in %.0f ms", self._catalog.version,
+                                len(self._catalog), (time.perf_counter() - started) * 1000)
+        return self._catalog
+
+    def warm(self):
+        """Load everything a request needs, so the first one is not slow."""
+        from . import collab
+
+        self.catalog()
+        get_skill_index()
+        collab.get_model()
+
+    def handle(self, message: dict) -> dict:
+        kind = message.get("kind")
+        if kind == "ping":
+            return {"ok": True, "pid": os.getpid(), "catalog_version": self.catalog().version}
+        if kind not in KIND_PARAMS:
+            return {"ok": False, "error": f"unknown kind {kind!r}"}
+        error = _invalid_request(kind, message)
+        if error:
+            return {"ok": False, "error": error}
+
+        profile = UserProfile(**message["profile"])
+        engine = CatalogEngine(profile, self.catalog())
+        params = message.get("params") or {}
+        if kind == "all":
+            results = engine.get_all_recommendations()
+            return {"ok": True, "results": {
+                key: _serialize(value) for key, value in results.items()
+            }}
+        method = {
+            "careers": engine.get_career_recommendations,
+            "portfolio": engine.get_portfolio_recommendations,
+            "courses": engine.get_course_recommendations,
+            "clubs": engine.get_club_recommendations,
+        }[kind]
+        return {"ok": True, "results": _serialize(method(**params))}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            while True:
+                line = self.rfile.readline(MAX_MESSAGE_BYTES)
+                if not line:
+                    break
+                if not line.endswith(b"\n"):
+                    # Over MAX_MESSAGE_BYTES or cut off: the rest of the stream can't be framed
+                    self.wfile.write(_encode({"ok": False, "error": "message too long or truncated"}))
+                    break
+                try:
+                    response = self.server.service.handle(json.loads(line))
+                except Exception as exc:
+                    logger.exception("Recommender daemon request failed")
+                    response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+                self.wfile.write(_encode(response))
+        finally:
+            connections.close_all()
+
+
+class RecommenderServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, service: RecommenderService):
+        self.service = service
+        super().__init__(str(path), _Handler)
+        os.chmod(path, 0o660)
+
+
+# =====================================================
+#  CLIENT
+# =====================================================
+
+class DaemonUnavailable(Exception):
+    pass
+
+
+class DaemonClient:
+    """One persistent connection per thread (and per process, after a fork)."""
+
+    def __init__(self, path, timeout: float):
+        self.path = str(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and conn[0] == os.getpid():
+            return conn[1], conn[2]
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self._local.conn = (os.getpid(), sock, sock.makefile("rb"))
+        return sock, self._local.conn[2]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None and conn[0] == os.getpid():
+            conn[2].close()
+            conn[1].close()
+
+    def request(self, message: dict) -> dict:
+        payload = _encode(message)
+        for attempt in (1, 2):
+            try:
+                sock, reader = self._connection()
+                sock.sendall(payload)
+                line = reader.readline(MAX_MESSAGE_BYTES)
+                if not line:
+                    raise ConnectionResetError("daemon closed the connection")
+                return json.loads(line)
+            except OSError as exc:
+                self.close()
+                # A kept-alive connection may predate a daemon restart; retry once
+                if attempt == 2 or isinstance(exc, (FileNotFoundError, ConnectionRefusedError, socket.timeout)):
+                    raise DaemonUnavailable(str(exc)) from exc
+
+
+_client: Optional[DaemonClient] = None
+_down_until = 0.0
+
+
+def get_client() -> DaemonClient:
+    global _client
+    if _client is None or _client.path != str(settings.RECOMMENDER_SOCKET):
+        _client = DaemonClient(settings.RECOMMENDER_SOCKET, settings.RECOMMENDER_DAEMON_TIMEOUT)
+    return _client
+
+
+def _hydrate(kind: str, results: List[Dict]) -> list:
+    result_type = RESULT_TYPES[kind]
+    batch = ObjectBatch.for_results(result_type, [r["id"] for r in results])
+    return [result_type.from_payload(r, batch) for r in results]
+
+
+def score(profile, kind: str, **params):
+    """Daemon results shaped like RecommendationEngine's, or None to score in-process."""
+    global _down_until
+    if time.monotonic() < _down_until:
+        DAEMON_REQUESTS.inc(kind=kind, result="skipped")
+        return None
+    try:
+        response = get_client().request({"kind": kind, "profile": profile_payload(profile), "params": params})
+    except (DaemonUnavailable, ValueError) as exc:
+        _down_until = time.monotonic() + settings.RECOMMENDER_DAEMON_RETRY
+        logger.warning("Recommender daemon unavailable, scoring in-process for %ss: %s",
+                       settings.RECOMMENDER_DAEMON_RETRY, exc)
+        DAEMON_REQUESTS.inc(kind=kind, result="unavailable")
+        return None
+    if not response.get("ok"):
+        logger.warning("Recommender daemon error for %s: %s", kind, response.get("error"))
+        DAEMON_REQUESTS.inc(kind=kind, result="error")
+        return None
+
+    DAEMON_REQUESTS.inc(kind=kind, result="ok")
+    results = response["results"]
+    if kind == "all":
+        return {key: _hydrate(ALL_KINDS[key], results[key]) for key in ALL_KINDS}
+    return _hydrate(kind, results)
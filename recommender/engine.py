@@ -3,10 +3,29 @@ Traject AI Recommendation Engine
 Provides skill-based career matching with reasoning
 """
 
+from functools import cached_property
 from typing import List, Dict
+from django.conf import settings
 from django.db.models import Q
 from careers.models import Career
 from accounts.models import UserProfile, PortfolioItem, Course, Club
+from monitoring.metrics import CAREERS_SCORED, RECOMMENDATION_CANDIDATES, RECOMMENDATION_SECONDS
+from monitoring.timing import phase
+from . import collab
+from .catalog_snapshot import CAREER_ORDER, ITEM_ORDER
+from .results import CareerMatch, ClubMatch, CourseMatch, ObjectBatch, PortfolioMatch, top
+from .skills import get_skill_index
+
+# The columns scoring reads. Candidates are values_list(named=True) rows
+# with these attributes; only the returned top results are loaded as model
+# instances (recommender/results.py).
+CAREER_FIELDS = ("pk", "title", "description", "industries", "skills")
+PORTFOLIO_FIELDS = ("pk", "item_type", "difficulty_level", "estimated_hours", "skills_gained")
+COURSE_FIELDS = ("pk", "subject", "number", "title")
+CLUB_FIELDS = ("pk", "name", "category", "description")
+
+ITEM_TYPE_LABELS = dict(PortfolioItem.ITEM_TYPES)
+DIFFICULTY_LABELS = dict(PortfolioItem._meta.get_field("difficulty_level").choices)
 
 
 class RecommendationEngine:
@@ -15,40 +34,125 @@ class RecommendationEngine:
     courses, clubs, and portfolio items based on skills and interests.
     """
 
-    def __init__(self, user_profile: UserProfile):
+    def __init__(self, user_profile: UserProfile, backend: str = None):
         self.profile = user_profile
-        self.user_skills = set(self.profile.get_skills_list())
-        self.user_interests = set(self.profile.get_interests_list())
+        # 'daemon' scores in `manage.py run_recommender_daemon`, falling back to 'local'
+        self.backend = backend or settings.RECOMMENDER_BACKEND
+        # Skills as typed plus their catalog spelling ("NLP" -> "natural language
+        # processing"). Interests are matched as substrings of career and club
+        # text, so they are kept exactly as the student wrote them.
+        self.user_skills = get_skill_index().expand(self.profile.get_skills_list())
+        self.user_interests = {i.lower() for i in self.profile.get_interests_list()}
+        self._cf_scores = None
+        self._career_ranking = None
+
+    # =====================================================
+    #  COLLABORATIVE SIGNAL
+    # =====================================================
+
+    @property
+    def cf_scores(self) -> Dict:
+        """Item-item CF scores (0..1) from recommender/collab.py, fetched once."""
+        if self._cf_scores is None:
+            self._cf_scores = collab.cf_scores_for(self.profile)
+        return self._cf_scores
+
+    def _blend(self, content_score: int, cf_score: float) -> int:
+        """Add up to RECOMMENDER_CF_WEIGHT points for what similar students picked."""
+        return min(content_score + round(settings.RECOMMENDER_CF_WEIGHT * cf_score), 100)
+
+    # =====================================================
+    #  CANDIDATES
+    # =====================================================
+    # Projected rows (see *_FIELDS above), streamed from the shared catalog
+    # snapshot (recommender/catalog_snapshot.py) while it is current and
+    # queried otherwise. The recommender daemon (recommender/daemon.py)
+    # overrides these to read the same rows from its in-memory catalog.
+
+    @cached_property
+    def snapshot(self):
+        """The current catalog snapshot, or None (read the database)."""
+        from .catalog_snapshot import get_snapshot
+        return get_snapshot()
+
+    def _careers(self):
+        if self.snapshot is not None:
+            return self.snapshot.careers()
+        return Career.objects.order_by(*CAREER_ORDER).values_list(*CAREER_FIELDS, named=True)
+
+    def _portfolio_items(self):
+        if self.snapshot is not None:
+            return self.snapshot.portfolio_items()
+        return PortfolioItem.objects.order_by(*ITEM_ORDER).values_list(*PORTFOLIO_FIELDS, named=True)
+
+    def _major_courses(self):
+        if self.snapshot is not None:
+            return self.snapshot.courses_for_major(self.profile.major_id)
+        return (Course.objects.filter(major_id=self.profile.major_id).order_by("pk")
+                .values_list(*COURSE_FIELDS, named=True))
+
+    def _college_clubs(self):
+        if self.snapshot is not None:
+            return self.snapshot.clubs_for_college(self.profile.college_id)
+        return (Club.objects.filter(college_id=self.profile.college_id).order_by("pk")
+                .values_list(*CLUB_FIELDS, named=True))
+
+    def _from_daemon(self, kind: str, **params):
+        """Results from the recommender daemon, or None to score in-process."""
+        if self.backend != "daemon":
+            return None
+        from . import daemon
+        return daemon.score(self.profile, kind, **params)
 
     # =====================================================
     #  CAREER RECOMMENDATIONS
     # =====================================================
 
-    def get_career_recommendations(self, limit: int = 5) -> List[Dict]:
+    def get_career_recommendations(self, limit: int = 5) -> List[CareerMatch]:
         """
         Match user profile with careers based on skill overlap.
         Returns careers with match scores and reasoning.
         """
-        all_careers = Career.objects.all()
+        # Portfolio and course scoring also start from the career ranking,
+        # so it is computed once per engine
+        if self._career_ranking is None:
+            remote = self._from_daemon("careers", limit=limit)
+            if remote is not None:
+                return remote
+            self._career_ranking = self._rank_careers()
+        return top(self._career_ranking, limit)
+
+    @phase("career_scoring")
+    @RECOMMENDATION_SECONDS.time(type="careers")
+    def _rank_careers(self) -> List[CareerMatch]:
+        batch = ObjectBatch.for_results(CareerMatch)
         recommendations = []
+        scored = 0
 
-        for career in all_careers:
+        for career in self._careers():
+            scored += 1
             match_data = self._calculate_career_match(career)
-
-            if match_data['match_score'] > 0:
-                recommendations.append({
-                    'career': career,
-                    'match_score': match_data['match_score'],
-                    'matched_skills': match_data['matched_skills'],
-                    'missing_skills': match_data['missing_skills'],
-                    'reasoning': match_data['reasoning'],
-                })
+            cf_score = self.cf_scores.get((collab.CAREER, career.pk), 0.0)
+            match_score = self._blend(match_data['match_score'], cf_score)
+
+            if match_score > 0:
+                reasoning = match_data['reasoning']
+                if cf_score >= 0.5:
+                    reasoning += " Students with plans like yours also chose this path."
+                recommendations.append(CareerMatch(
+                    career.pk, match_score,
+                    tuple(match_data['matched_skills']), tuple(match_data['missing_skills']),
+                    reasoning, batch,
+                ))
+
+        CAREERS_SCORED.observe(scored)
+        RECOMMENDATION_CANDIDATES.observe(len(recommendations), type="careers")
 
         # Sort by match score descending
-        recommendations.sort(key=lambda x: x['match_score'], reverse=True)
-        return recommendations[:limit]
+        recommendations.sort(key=lambda x: x.match_score, reverse=True)
+        return recommendations
 
-    def _calculate_career_match(self, career: Career) -> Dict:
+    def _calculate_career_match(self, career) -> Dict:
         """
         IMPROVED: Calculate how well a career matches the user's profile using
         multi-factor scoring: skills, interests, industries, career goals.
@@ -136,7 +240,7 @@ class RecommendationEngine:
         }
 
     def _generate_career_reasoning(
-            self, career: Career, matched: set, missing: set, score: int,
+            self, career, matched: set, missing: set, score: int,
             interest_matches: list = None, industry_overlap: set = None
     ) -> str:
         """IMPROVED: Generate comprehensive explanation for why a career matches."""
@@ -221,43 +325,51 @@ class RecommendationEngine:
     #  PORTFOLIO ITEM RECOMMENDATIONS
     # =====================================================
 
-    def get_portfolio_recommendations(self, limit: int = 8) -> List[Dict]:
+    @phase("portfolio_scoring")
+    @RECOMMENDATION_SECONDS.time(type="portfolio")
+    def get_portfolio_recommendations(self, limit: int = 8) -> List[PortfolioMatch]:
         """
         Recommend portfolio items (projects, certs) based on:
         1. Current skill level
         2. Career goals
         3. Skill gaps
         """
+        remote = self._from_daemon("portfolio", limit=limit)
+        if remote is not None:
+            return remote
+
         recommendations = []
-        all_items = PortfolioItem.objects.all()
+        all_items = self._portfolio_items()
+        batch = ObjectBatch.for_results(PortfolioMatch)
 
         # Get user's target careers
         career_recs = self.get_career_recommendations(limit=3)
         target_skills = set()
         for rec in career_recs:
-            target_skills.update(rec['missing_skills'])
+            target_skills.update(rec.missing_skills)
 
         for item in all_items:
-            item_skills = set([s.lower().strip() for s in item.get_skills_list()])
+            item_skills = set([s.lower().strip() for s in (item.skills_gained or '').split(',') if s.strip()])
 
             # Calculate relevance score
             skill_overlap = len(item_skills & target_skills)
             difficulty_match = self._assess_difficulty_match(item.difficulty_level)
 
             relevance_score = (skill_overlap * 20) + (difficulty_match * 10)
-            relevance_score = min(relevance_score, 100)
+            cf_score = self.cf_scores.get((collab.PORTFOLIO, item.pk), 0.0)
+            relevance_score = self._blend(min(relevance_score, 100), cf_score)
 
             if relevance_score > 0:
                 reasoning = self._generate_portfolio_reasoning(item, item_skills, target_skills)
-                recommendations.append({
-                    'item': item,
-                    'relevance_score': relevance_score,
-                    'reasoning': reasoning,
-                })
+                if cf_score >= 0.5:
+                    reasoning += " Popular with students on similar paths."
+                recommendations.append(PortfolioMatch(item.pk, relevance_score, reasoning, batch))
+
+        RECOMMENDATION_CANDIDATES.observe(len(recommendations), type="portfolio")
 
         # Sort by relevance
-        recommendations.sort(key=lambda x: x['relevance_score'], reverse=True)
-        return recommendations[:limit]
+        recommendations.sort(key=lambda x: x.relevance_score, reverse=True)
+        return top(recommendations, limit)
 
     def _assess_difficulty_match(self, difficulty: str) -> int:
         """
@@ -277,21 +389,22 @@ class RecommendationEngine:
         return difficulty_map.get(year, {}).get(difficulty, 5)
 
     def _generate_portfolio_reasoning(
-            self, item: PortfolioItem, item_skills: set, target_skills: set
+            self, item, item_skills: set, target_skills: set
     ) -> str:
         """Generate reasoning for portfolio item recommendation."""
         overlap = item_skills & target_skills
+        item_type = ITEM_TYPE_LABELS.get(item.item_type, item.item_type)
 
         if overlap:
-            reason = f"This {item.get_item_type_display().lower()} will help you develop {', '.join(list(overlap)[:2])}, "
+            reason = f"This {item_type.lower()} will help you develop {', '.join(list(overlap)[:2])}, "
             reason += f"which are important for your target careers. "
         else:
-            reason = f"This {item.get_item_type_display().lower()} will broaden your skill set. "
+            reason = f"This {item_type.lower()} will broaden your skill set. "
 
         if item.estimated_hours:
             reason += f"Estimated time: {item.estimated_hours} hours. "
 
-        reason += f"Difficulty: {item.get_difficulty_level_display()}."
+        reason += f"Difficulty: {DIFFICULTY_LABELS.get(item.difficulty_level, item.difficulty_level)}."
 
         return reason
 
@@ -299,26 +412,32 @@ class RecommendationEngine:
     #  COURSE RECOMMENDATIONS
     # =====================================================
 
-    def get_course_recommendations(self, semester: str = 'FALL', limit: int = 6) -> List[Dict]:
+    @phase("course_scoring")
+    @RECOMMENDATION_SECONDS.time(type="courses")
+    def get_course_recommendations(self, semester: str = 'FALL', limit: int = 6) -> List[CourseMatch]:
         """
         Recommend courses based on:
         1. Major requirements
         2. Career skill gaps
         3. Interests
         """
-        recommendations = []
-
-        if not self.profile.major:
+        if not self.profile.major_id:
             return []
+        remote = self._from_daemon("courses", semester=semester, limit=limit)
+        if remote is not None:
+            return remote
+
+        recommendations = []
 
         # Get courses for user's major
-        major_courses = Course.objects.filter(major=self.profile.major)
+        major_courses = self._major_courses()
+        batch = ObjectBatch.for_results(CourseMatch)
 
         # Get target skills from career recommendations
         career_recs = self.get_career_recommendations(limit=3)
         target_skills = set()
         for rec in career_recs:
-            target_skills.update([s.lower() for s in rec['missing_skills']])
+            target_skills.update([s.lower() for s in rec.missing_skills])
 
         for course in major_courses:
             # Simple relevance scoring based on course subject/title
@@ -340,30 +459,36 @@ class RecommendationEngine:
                 pass
 
             if relevance > 0:
-                recommendations.append({
-                    'course': course,
-                    'relevance_score': relevance,
-                    'reasoning': f"Aligns with your major requirements and career interests."
-                })
+                recommendations.append(CourseMatch(
+                    course.pk, relevance,
+                    "Aligns with your major requirements and career interests.", batch,
+                ))
 
-        recommendations.sort(key=lambda x: x['relevance_score'], reverse=True)
-        return recommendations[:limit]
+        RECOMMENDATION_CANDIDATES.observe(len(recommendations), type="courses")
+        recommendations.sort(key=lambda x: x.relevance_score, reverse=True)
+        return top(recommendations, limit)
 
     # =====================================================
     #  CLUB RECOMMENDATIONS
     # =====================================================
 
-    def get_club_recommendations(self, limit: int = 5) -> List[Dict]:
+    @phase("club_scoring")
+    @RECOMMENDATION_SECONDS.time(type="clubs")
+    def get_club_recommendations(self, limit: int = 5) -> List[ClubMatch]:
         """
         Recommend clubs based on:
         1. User interests
         2. Career goals
         3. College availability
         """
-        if not self.profile.college:
+        if not self.profile.college_id:
             return []
+        remote = self._from_daemon("clubs", limit=limit)
+        if remote is not None:
+            return remote
 
-        clubs = Club.objects.filter(college=self.profile.college)
+        clubs = self._college_clubs()
+        batch = ObjectBatch.for_results(ClubMatch)
         recommendations = []
 
         for club in clubs:
@@ -381,14 +506,31 @@ class RecommendationEngine:
                     relevance += 10
 
             if relevance > 0:
-                recommendations.append({
-                    'club': club,
-                    'relevance_score': relevance,
-                    'reasoning': f"This club aligns with your interests and can help you network with like-minded students."
-                })
+                recommendations.append(ClubMatch(
+                    club.pk, relevance,
+                    "This club aligns with your interests and can help you network with like-minded students.",
+                    batch,
+                ))
+
+        RECOMMENDATION_CANDIDATES.observe(len(recommendations), type="clubs")
+        recommendations.sort(key=lambda x: x.relevance_score, reverse=True)
+        return top(recommendations, limit)
 
-        recommendations.sort(key=lambda x: x['relevance_score'], reverse=True)
-        return recommendations[:limit]
+    # =====================================================
+    #  ALL AT ONCE
+    # =====================================================
+
+    def get_all_recommendations(self) -> Dict:
+        """Careers, portfolio items, courses and clubs (one daemon round trip)."""
+        remote = self._from_daemon("all")
+        if remote is not None:
+            return remote
+        return {
+            'careers': self.get_career_recommendations(limit=5),
+            'portfolio_items': self.get_portfolio_recommendations(limit=8),
+            'courses': self.get_course_recommendations(limit=6),
+            'clubs': self.get_club_recommendations(limit=5),
+        }
 
 
 # =====================================================
@@ -400,11 +542,4 @@ def get_all_recommendations(user_profile: UserProfile) -> Dict:
     Get all recommendations for a user in one call.
     Returns dict with careers, portfolio items, courses, and clubs.
     """
-    engine = RecommendationEngine(user_profile)
-
-    return {
-        'careers': engine.get_career_recommendations(limit=5),
-        'portfolio_items': engine.get_portfolio_recommendations(limit=8),
-        'courses': engine.get_course_recommendations(limit=6),
-        'clubs': engine.get_club_recommendations(limit=5),
-    }
\ No newline at end of file
+    return RecommendationEngine(user_profile).get_all_recommendations()
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Published recommender models on disk.
+
+Offline jobs write a set of numpy arrays to a fresh directory
+<RECOMMENDER_MODEL_DIR>/<name>-<stamp>/ and then atomically replace the
+pointer file <RECOMMENDER_MODEL_DIR>/<name>_current. Readers open the
+arrays with mmap_mode="r" so all worker processes share one copy through
+the OS page cache, and pick up a new build when the pointer changes.
+"""
+
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+
+from monitoring.metrics import CACHE_REQUESTS
+
+_loaded: Dict[str, tuple] = {}  # name -> (build directory name, loaded object)
+_lock = threading.Lock()
+
+
+def model_dir() -> Path:
+    return Path(settings.RECOMMENDER_MODEL_DIR)
+
+
+def _pointer(name: str) -> Path:
+    return model_dir() / f"{name}_current"
+
+
+def publish(name: str, arrays: dict) -> Path:
+    """Write `arrays` as .npy files, switch the pointer to them and drop older builds."""
+    import numpy as np
+
+    root = model_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    # Unique even for two publishes by one process within a second
+    build = f"{name}-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    target = root / build
+    target.mkdir()
+    for array_name, array in arrays.items():
+        np.save(target / f"{array_name}.npy", array)
+
+    pointer_tmp = root / f"{name}_current.{os.getpid()}.tmp"
+    pointer_tmp.write_text(build)
+    os.replace(pointer_tmp, _pointer(name))
+
+    # Processes that still map an old build keep their pages after unlink
+    for old in root.glob(f"{name}-*"):
+        if old.is_dir() and old.name != build:
+            shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+def load_arrays(path: Path, names) -> dict:
+    import numpy as np
+    return {n: np.load(path / f"{n}.npy", mmap_mode="r") for n in names}
+
+
+def get_published(name: str, factory: Callable[[Path], object]) -> Optional[object]:
+    """
+    Return factory(<current build directory>) for model `name`, cached
+    until a new build is published. None if nothing has been published.
+    """
+    try:
+        build = _pointer(name).read_text().strip()
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get(name)
+    if cached and cached[0] == build:
+        CACHE_REQUESTS.inc(cache=f"model:{name}", result="hit")
+        return cached[1]
+    CACHE_REQUESTS.inc(cache=f"model:{name}", result="miss")
+    with _lock:
+        cached = _loaded.get(name)
+        if cached and cached[0] == build:
+            return cached[1]
+        try:
+            obj = factory(model_dir() / build)
+        except FileNotFoundError:
+            # Replaced while we were reading; keep serving the previous build
+            return cached[1] if cached else None
+        _loaded[name] = (build, obj)
+        return obj
@@ -0,0 +1,212 @@
+"""
+Nearest-peer lookup: students with similar skills, interests and major.
+
+Every UserProfile is embedded into a fixed-width float32 vector with the
+hashing trick: skills and interests (canonicalized through
+recommender/skills.py), preferred industries, major, college and
+academic year each hash to a signed bucket. Rows are L2-normalized, so a
+dot product is the cosine similarity.
+
+`build_index()` writes the matrix, plus a 64-bit random-projection (SimHash)
+signature per row, through recommender/model_store.py:
+
+    <RECOMMENDER_MODEL_DIR>/peers-<stamp>/{profile_id,vectors,signatures}.npy
+
+Search modes:
+- "exact": one matrix-vector product over all rows, then argpartition.
+- "lsh":   rank rows by Hamming distance between signatures, then
+           re-score only the closest candidates exactly.
+- "auto":  "lsh" once the cohort is larger than PEER_LSH_THRESHOLD.
+
+The query vector is always computed from the live profile, so edits
+count immediately. Profiles created after the last build can search but
+are not found as peers until `python manage.py build_peer_index` runs.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from . import model_store
+
+MODEL_NAME = "peers"
+ARRAYS = ("profile_id", "vectors", "signatures")
+SIGNATURE_BITS = 64
+PROJECTION_SEED = 390
+
+FEATURE_WEIGHTS = {
+    "skill": 1.0,
+    "interest": 0.8,
+    "industry": 0.6,
+    "major": 1.5,
+    "college": 0.4,
+    "year": 0.3,
+}
+
+
+# =====================================================
+#  EMBEDDING
+# =====================================================
+
+def _bucket(feature: str, dim: int) -> Tuple[int, float]:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dim, (1.0 if value >> 63 else -1.0)
+
+
+def profile_features(profile, skill_index=None) -> Dict[str, float]:
+    """{feature name: weight} for one profile."""
+    from .skills import get_skill_index
+
+    skill_index = skill_index or get_skill_index()
+    features = {}
+    for skill in skill_index.canonicalize(profile.get_skills_list()):
+        features[f"skill:{skill}"] = FEATURE_WEIGHTS["skill"]
+    # Interests as written, like RecommendationEngine: canonicalizing turns words into skills
+    for interest in profile.get_interests_list():
+        if interest.strip():
+            features[f"interest:{interest.lower().strip()}"] = FEATURE_WEIGHTS["interest"]
+    for industry in (profile.preferred_industries or "").split(","):
+        if industry.strip():
+            features[f"industry:{industry.lower().strip()}"] = FEATURE_WEIGHTS["industry"]
+    if profile.major_id:
+        features[f"major:{profile.major_id}"] = FEATURE_WEIGHTS["major"]
+    if profile.college_id:
+        features[f"college:{profile.college_id}"] = FEATURE_WEIGHTS["college"]
+    if profile.academic_year:
+        features[f"year:{profile.academic_year}"] = FEATURE_WEIGHTS["year"]
+    return features
+
+
+def embed(features: Dict[str, float], dim: int):
+    import numpy as np
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for name, weight in features.items():
+        bucket, sign = _bucket(name, dim)
+        vector[bucket] += sign * weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _projections(dim: int):
+    import numpy as np
+    return np.random.default_rng(PROJECTION_SEED).standard_normal((dim, SIGNATURE_BITS)).astype(np.float32)
+
+
+def signatures(vectors):
+    """One uint64 SimHash signature per row."""
+    import numpy as np
+
+    bits = (vectors @ _projections(vectors.shape[1])) > 0
+    weights = np.left_shift(np.uint64(1), np.arange(SIGNATURE_BITS, dtype=np.uint64))
+    return (bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+
+
+# =====================================================
+#  BUILD
+# =====================================================
+
+def build_index(dim=None) -> dict:
+    """Embed every profile and publish the matrix. Returns stats."""
+    import numpy as np
+    from accounts.models import UserProfile
+    from .skills import get_skill_index
+
+    dim = dim or settings.PEER_EMBEDDING_DIM
+    skill_index = get_skill_index()
+    ids, rows = [], []
+    for profile in UserProfile.objects.order_by("pk").iterator(chunk_size=2000):
+        ids.append(profile.pk)
+        rows.append(embed(profile_features(profile, skill_index), dim))
+
+    vectors = np.vstack(rows) if rows else np.zeros((0, dim), dtype=np.float32)
+    target = model_store.publish(MODEL_NAME, {
+        "profile_id": np.array(ids, dtype=np.int64),
+        "vectors": vectors,
+        "signatures": signatures(vectors) if rows else np.zeros(0, dtype=np.uint64),
+    })
+    return {"profiles": len(ids), "dim": dim, "path": str(target)}
+
+
+# =====================================================
+#  SEARCH
+# =====================================================
+
+class PeerIndex:
+    """Read-only view over one published build."""
+
+    def __init__(self, path: Path):
+        arrays = model_store.load_arrays(path, ARRAYS)
+        self.profile_ids = arrays["profile_id"]
+        self.vectors = arrays["vectors"]
+        self.signatures = arrays["signatures"]
+        self.dim = self.vectors.shape[1]
+
+    def __len__(self):
+        return len(self.profile_ids)
+
+    def _top(self, scores, rows, k):
+        import numpy as np
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(self.profile_ids[rows[i]]), float(scores[i])) for i in top]
+
+    def search_exact(self, query, k, exclude=None):
+        import numpy as np
+
+        scores = self.vectors @ query
+        if exclude is not None:
+            scores[self.profile_ids == exclude] = -np.inf
+        return self._top(scores, np.arange(len(scores)), k)
+
+    def search_lsh(self, query, k, exclude=None):
+        import numpy as np
+
+        query_signature = signatures(query[None, :])[0]
+        distance = np.bitwise_count(np.bitwise_xor(self.signatures, query_signature))
+        n_candidates = min(len(distance), max(k * settings.PEER_LSH_CANDIDATES, k))
+        candidates = np.argpartition(distance, n_candidates - 1)[:n_candidates]
+        scores = self.vectors[candidates] @ query
+        if exclude is not None:
+            scores[self.profile_ids[candidates] == exclude] = -np.inf
+        return self._top(scores, candidates, k)
+
+
+def get_peer_index() -> Optional[PeerIndex]:
+    return model_store.get_published(MODEL_NAME, PeerIndex)
+
+
+def nearest_peer_ids(profile, k=10, mode=None) -> List[Tuple[int, float]]:
+    """[(profile id, cosine similarity)], most similar first; [] before the first build."""
+    index = get_peer_index()
+    if index is None or len(index) == 0:
+        return []
+    mode = mode or settings.PEER_SEARCH_MODE
+    if mode == "auto":
+        mode = "lsh" if len(index) > settings.PEER_LSH_THRESHOLD else "exact"
+
+    query = embed(profile_features(profile), index.dim)
+    search = index.search_lsh if mode == "lsh" else index.search_exact
+    return [(pk, score) for pk, score in search(query, k + 1, exclude=profile.pk) if score > 0][:k]
+
+
+def nearest_peers(profile, k=10, mode=None) -> List[Dict]:
+    """[{'profile': UserProfile, 'similarity': int %}] for the k most similar students."""
+    from accounts.models import UserProfile
+
+    pairs = nearest_peer_ids(profile, k, mode)
+    profiles = UserProfile.objects.select_related("user", "major", "college").in_bulk(
+        [pk for pk, _ in pairs]
+    )
+    return [
+        {'profile': profiles[pk], 'similarity': round(score * 100)}
+        for pk, score in pairs
+        if pk in profiles
+    ]
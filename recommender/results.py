@@ -0,0 +1,201 @@
+"""
+Recommendation results.
+
+Every scoring method returns a list of small slotted objects instead of
+dicts: ids, scores, skill tuples and the reasoning text. Scoring reads
+projected rows (only the columns it needs), so no model instance exists
+until a result asks for one. Each returned list shares one `ObjectBatch`,
+which loads every instance the list refers to with a single
+in_bulk() + only(<the type's display fields>) on first access:
+
+    recs = engine.get_portfolio_recommendations()
+    recs[0].item          # one query for all of recs, then none
+    recs[0].relevance_score
+
+`fields` lists what the templates show; touching any other field of a
+hydrated instance costs a query, so extend it when a template needs more.
+
+Templates keep using `rec.item.title`, `rec.match_score`, ... unchanged:
+Django falls back to attribute lookup when a dict lookup fails.
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple
+
+from accounts.models import Club, Course, PortfolioItem
+from careers.models import Career
+
+
+class ObjectBatch:
+    """Instances of one model for one result list, loaded together."""
+
+    __slots__ = ("model", "fields", "ids", "objects", "loaded")
+
+    def __init__(self, model, ids: Iterable[int] = (), fields: Tuple[str, ...] = (),
+                 objects: Dict[int, object] = None):
+        self.model = model
+        self.fields = fields
+        self.ids: List[int] = list(ids)
+        self.objects: Dict[int, object] = objects or {}
+        self.loaded = False
+
+    @classmethod
+    def for_results(cls, result_type, ids: Iterable[int] = ()) -> "ObjectBatch":
+        return cls(result_type.model, ids, result_type.fields)
+
+    def get(self, pk: int):
+        """The instance, loading every registered id on the first miss. None if deleted."""
+        if pk not in self.objects and not self.loaded:
+            missing = [i for i in self.ids if i not in self.objects]
+            if pk not in missing:
+                missing.append(pk)
+            queryset = self.model.objects.all()
+            if self.fields:
+                queryset = queryset.only(*self.fields)
+            self.objects.update(queryset.in_bulk(missing))
+            self.loaded = True
+        return self.objects.get(pk)
+
+
+def top(results: list, limit: int) -> list:
+    """The first `limit` results, sharing a batch of just their ids."""
+    results = results[:limit]
+    if not results:
+        return results
+    source = results[0].batch
+    ids = [r.object_id for r in results]
+    batch = ObjectBatch(source.model, ids, source.fields,
+                        {pk: source.objects[pk] for pk in ids if pk in source.objects})
+    return [replace(r, batch=batch) for r in results]
+
+
+# =====================================================
+#  RESULT TYPES
+# =====================================================
+
+@dataclass(slots=True)
+class CareerMatch:
+    model: ClassVar = Career
+    fields: ClassVar = ("title", "company", "description")
+
+    career_id: int
+    match_score: int
+    matched_skills: Tuple[str, ...]
+    missing_skills: Tuple[str, ...]
+    reasoning: str
+    batch: ObjectBatch = field(repr=False, compare=False)
+
+    @property
+    def career(self) -> Optional[Career]:
+        return self.batch.get(self.career_id)
+
+    @property
+    def object_id(self) -> int:
+        return self.career_id
+
+    def as_payload(self) -> dict:
+        """JSON-safe form (the daemon protocol)."""
+        return {
+            "id": self.career_id,
+            "match_score": self.match_score,
+            "matched_skills": list(self.matched_skills),
+            "missing_skills": list(self.missing_skills),
+            "reasoning": self.reasoning,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict, batch: ObjectBatch) -> "CareerMatch":
+        return cls(payload["id"], payload["match_score"], tuple(payload["matched_skills"]),
+                   tuple(payload["missing_skills"]), payload["reasoning"], batch)
+
+
+@dataclass(slots=True)
+class ItemMatch:
+    """A scored catalog object; subclasses name it the way templates expect."""
+    model: ClassVar = None
+    fields: ClassVar = ()
+
+    object_id: int
+    relevance_score: int
+    reasoning: str
+    batch: ObjectBatch = field(repr=False, compare=False)
+
+    @property
+    def object(self):
+        return self.batch.get(self.object_id)
+
+    def as_payload(self) -> dict:
+        return {"id": self.object_id, "relevance_score": self.relevance_score,
+                "reasoning": self.reasoning}
+
+    @classmethod
+    def from_payload(cls, payload: dict, batch: ObjectBatch) -> "ItemMatch":
+        return cls(payload["id"], payload["relevance_score"], payload["reasoning"], batch)
+
+
+class PortfolioMatch(ItemMatch):
+    __slots__ = ()
+    model = PortfolioItem
+    fields = ("title", "item_type", "description", "difficulty_level", "estimated_hours")
+
+    @property
+    def item(self) -> Optional[PortfolioItem]:
+        return self.batch.get(self.object_id)
+
+
+class CourseMatch(ItemMatch):
+    __slots__ = ()
+    model = Course
+    fields = ("subject", "number", "title", "credits")
+
+    @property
+    def course(self) -> Optional[Course]:
+        return self.batch.get(self.object_id)
+
+
+class ClubMatch(ItemMatch):
+    __slots__ = ()
+    model = Club
+    fields = ("name", "category", "description")
+
+    @property
+    def club(self) -> Optional[Club]:
+        return self.batch.get(self.object_id)
+
+
+# =====================================================
+#  ROADMAP ENTRIES
+# =====================================================
+
+@dataclass(slots=True)
+class PlannedCourse:
+    """A course placed in one semester of a roadmap."""
+    match: CourseMatch
+    credits: float
+
+    @property
+    def course(self) -> Optional[Course]:
+        return self.match.course
+
+    @property
+    def reasoning(self) -> str:
+        return self.match.reasoning
+
+
+@dataclass(slots=True)
+class PlannedItem:
+    """A portfolio item placed in one semester of a roadmap."""
+    match: PortfolioMatch
+
+    @property
+    def item(self) -> Optional[PortfolioItem]:
+        return self.match.item
+
+    @property
+    def reasoning(self) -> str:
+        return self.match.reasoning
+
+    @property
+    def estimated_hours(self) -> int:
+        item = self.item
+        return (item.estimated_hours or 0) if item is not None else 0
@@ -6,18 +6,21 @@ Creates semester-by-semester academic and career preparation plans
 from typing import List, Dict
 from dataclasses import dataclass
 from accounts.models import UserProfile, Course
+from monitoring.metrics import ROADMAP_BUILD_SECONDS
+from monitoring.timing import phase
 from recommender.engine import RecommendationEngine
+from recommender.results import PlannedCourse, PlannedItem, PortfolioMatch
 
 
-@dataclass
+@dataclass(slots=True)
 class SemesterPlan:
     """Represents a single semester in the roadmap."""
     semester_number: int
     season: str  # 'Fall' or 'Spring'
     year: int
-    courses: List[Dict]
+    courses: List[PlannedCourse]
     clubs: List[str]
-    portfolio_items: List[Dict]
+    portfolio_items: List[PlannedItem]
     total_credits: float
     milestones: List[str]
 
@@ -36,6 +39,13 @@ class RoadmapGenerator:
         self.target_credits_per_semester = 15  # Typical full-time load
         self.max_semesters = 8  # 4 years = 8 semesters
 
+        # Recommendations don't change between semesters; fetch each once
+        self._course_recs = {}
+        self._club_recs = None
+        self._portfolio_recs = None
+
+    @phase("roadmap_build")
+    @ROADMAP_BUILD_SECONDS.time()
     def generate_roadmap(self, start_year: int = None, start_season: str = 'Fall') -> List[SemesterPlan]:
         """
         Generate a complete semester-by-semester roadmap.
@@ -90,34 +100,36 @@ class RoadmapGenerator:
         """Generate plan for a single semester."""
 
         # Get course recommendations
-        course_recs = self.rec_engine.get_course_recommendations(
-            semester=season, limit=5
-        )
+        if season not in self._course_recs:
+            self._course_recs[season] = self.rec_engine.get_course_recommendations(
+                semester=season, limit=5
+            )
+        course_recs = self._course_recs[season]
 
         # Select courses up to target credit hours
         selected_courses = []
         total_credits = 0.0
 
         for rec in course_recs:
-            course = rec['course']
-            if total_credits + float(course.credits) <= self.target_credits_per_semester:
-                selected_courses.append({
-                    'course': course,
-                    'credits': float(course.credits),
-                    'reasoning': rec.get('reasoning', '')
-                })
-                total_credits += float(course.credits)
+            credits = float(rec.course.credits)
+            if total_credits + credits <= self.target_credits_per_semester:
+                selected_courses.append(PlannedCourse(rec, credits))
+                total_credits += credits
 
             # Stop if we've reached target credits
             if total_credits >= self.target_credits_per_semester - 2:
                 break
 
         # Get club recommendations (consistent across semesters)
-        club_recs = self.rec_engine.get_club_recommendations(limit=3)
-        club_names = [rec['club'].name for rec in club_recs[:2]]
+        if self._club_recs is None:
+            self._club_recs = self.rec_engine.get_club_recommendations(limit=3)
+        club_recs = self._club_recs
+        club_names = [rec.club.name for rec in club_recs[:2]]
 
         # Get portfolio item recommendations (distributed across semesters)
-        portfolio_recs = self.rec_engine.get_portfolio_recommendations(limit=8)
+        if self._portfolio_recs is None:
+            self._portfolio_recs = self.rec_engine.get_portfolio_recommendations(limit=8)
+        portfolio_recs = self._portfolio_recs
 
         # Assign 1-2 portfolio items per semester based on semester number
         semester_portfolio = self._assign_portfolio_items(
@@ -138,7 +150,8 @@ class RoadmapGenerator:
             milestones=milestones
         )
 
-    def _assign_portfolio_items(self, semester_number: int, portfolio_recs: List[Dict]) -> List[Dict]:
+    def _assign_portfolio_items(self, semester_number: int,
+                                portfolio_recs: List[PortfolioMatch]) -> List[PlannedItem]:
         """
         Distribute portfolio items across semesters.
         Earlier semesters get easier items, later ones get advanced items.
@@ -153,14 +166,7 @@ class RoadmapGenerator:
         # Get items for this semester
         semester_items = portfolio_recs[start_idx:end_idx]
 
-        return [
-            {
-                'item': rec['item'],
-                'reasoning': rec.get('reasoning', ''),
-                'estimated_hours': rec['item'].estimated_hours or 0
-            }
-            for rec in semester_items
-        ]
+        return [PlannedItem(rec) for rec in semester_items]
 
     def _generate_milestones(self, semester_number: int, season: str) -> List[str]:
         """
@@ -0,0 +1,179 @@
+"""
+Precomputed "similar careers".
+
+`build_similarity()` scores every pair of careers by the weighted
+Jaccard overlap of their skills and industries and keeps the top-N
+neighbours of each career. Overlaps come from per-term posting lists, a
+block of rows at a time (BLOCK_CELLS scores in memory), so memory stays
+linear in the number of careers:
+
+    <RECOMMENDER_MODEL_DIR>/career_sim-<stamp>/{career_id,neighbours,scores}.npy
+
+neighbours[i] / scores[i] are fixed-width rows (padded with -1 / 0)
+for career_id[i]. They are published and memory-mapped through
+recommender/model_store.py. A lookup is one dict access plus a row slice.
+
+Rebuild with `python manage.py build_career_similarity`.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from . import model_store
+
+MODEL_NAME = "career_sim"
+ARRAYS = ("career_id", "neighbours", "scores")
+
+SKILL_WEIGHT = 0.75
+INDUSTRY_WEIGHT = 0.25
+BLOCK_CELLS = 1 << 23  # similarity scores held at once (block rows x careers)
+
+
+def _terms(value) -> set:
+    if isinstance(value, str):
+        value = value.split(",")
+    return {str(v).lower().strip() for v in value or [] if str(v).strip()}
+
+
+class _Postings:
+    """Term sets as CSR rows (term ids), plus the rows that contain each term."""
+
+    def __init__(self, sets: List[set]):
+        import numpy as np
+
+        vocab: Dict[str, int] = {}
+        indices, indptr = [], [0]
+        for terms in sets:
+            indices.extend(vocab.setdefault(t, len(vocab)) for t in sorted(terms))
+            indptr.append(len(indices))
+        self.n = len(sets)
+        self.indices = np.array(indices, dtype=np.int64)
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.sizes = np.diff(self.indptr).astype(np.float32)
+
+        rows = np.repeat(np.arange(self.n, dtype=np.int64), np.diff(self.indptr))
+        self.posting_rows = rows[np.argsort(self.indices, kind="stable")]
+        self.posting_ptr = np.concatenate(([0], np.cumsum(np.bincount(self.indices, minlength=len(vocab)))))
+
+    def jaccard(self, start: int, stop: int):
+        """Jaccard similarity of rows start..stop against every row, as a float32 matrix."""
+        import numpy as np
+
+        n, block = self.n, stop - start
+        terms = self.indices[self.indptr[start]:self.indptr[stop]]
+        owners = np.repeat(np.arange(block, dtype=np.int64), np.diff(self.indptr[start:stop + 1]))
+        # Concatenate the posting list of every (row, term) entry
+        lengths = self.posting_ptr[terms + 1] - self.posting_ptr[terms]
+        offsets = np.repeat(self.posting_ptr[terms] - np.cumsum(lengths) + lengths, lengths)
+        others = self.posting_rows[offsets + np.arange(int(lengths.sum()), dtype=np.int64)]
+
+        cells = np.repeat(owners, lengths) * n + others
+        overlap = np.bincount(cells, minlength=block * n).reshape(block, n).astype(np.float32)
+        union = self.sizes[start:stop, None] + self.sizes[None, :] - overlap
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(union > 0, overlap / union, 0.0).astype(np.float32)
+
+
+def compute_neighbours(careers, top_n):
+    """
+    careers: list of (id, skills, industries).
+    Returns (career_id, neighbours, scores) arrays.
+    """
+    import numpy as np
+
+    ids = np.array([c[0] for c in careers], dtype=np.int64)
+    n = len(ids)
+    width = max(min(top_n, n - 1), 0)
+    neighbours = np.full((n, width), -1, dtype=np.int64)
+    scores = np.zeros((n, width), dtype=np.float32)
+    if n < 2:
+        return ids, neighbours, scores
+
+    skills = _Postings([_terms(c[1]) for c in careers])
+    industries = _Postings([_terms(c[2]) for c in careers])
+    step = max(BLOCK_CELLS // n, 1)
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        similarity = SKILL_WEIGHT * skills.jaccard(start, stop) + INDUSTRY_WEIGHT * industries.jaccard(start, stop)
+        similarity[np.arange(stop - start), np.arange(start, stop)] = -1.0
+
+        # Top `width` per row without a full sort, then order those few
+        top = np.argpartition(-similarity, width - 1, axis=1)[:, :width]
+        top_scores = np.take_along_axis(similarity, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        has_overlap = top_scores > 0
+        neighbours[start:stop][has_overlap] = ids[top][has_overlap]
+        scores[start:stop][has_overlap] = top_scores[has_overlap]
+    return ids, neighbours, scores
+
+
+def build_similarity(top_n=None) -> dict:
+    """Recompute and publish the career neighbour lists. Returns stats."""
+    from careers.models import Career
+
+    top_n = top_n or settings.RECOMMENDER_SIMILAR_CAREERS
+    careers = list(Career.objects.order_by("pk").values_list("pk", "skills", "industries"))
+    career_id, neighbours, scores = compute_neighbours(careers, top_n)
+    target = model_store.publish(MODEL_NAME, {
+        "career_id": career_id,
+        "neighbours": neighbours,
+        "scores": scores,
+    })
+    return {
+        "careers": len(careers),
+        "neighbours": int((neighbours >= 0).sum()),
+        "path": str(target),
+    }
+
+
+# =====================================================
+#  LOOKUP
+# =====================================================
+
+class CareerNeighbours:
+    """Read-only view over one published build."""
+
+    def __init__(self, path: Path):
+        arrays = model_store.load_arrays(path, ARRAYS)
+        self.neighbours = arrays["neighbours"]
+        self.scores = arrays["scores"]
+        self.row = {int(pk): i for i, pk in enumerate(arrays["career_id"])}
+
+    def lookup(self, career_id: int, limit: int) -> List[Tuple[int, float]]:
+        row = self.row.get(career_id)
+        if row is None:
+            return []
+        ids = self.neighbours[row, :limit].tolist()
+        scores = self.scores[row, :limit].tolist()
+        return [(pk, score) for pk, score in zip(ids, scores) if pk >= 0]
+
+
+def get_neighbours() -> Optional[CareerNeighbours]:
+    return model_store.get_published(MODEL_NAME, CareerNeighbours)
+
+
+def similar_career_ids(career_id: int, limit: int = 5) -> List[Tuple[int, float]]:
+    """[(career id, similarity 0..1)], most similar first; [] before the first build."""
+    neighbours = get_neighbours()
+    return neighbours.lookup(career_id, limit) if neighbours else []
+
+
+def similar_careers(career_id: int, limit: int = 5) -> List[Dict]:
+    """
+    Template/context helper: [{'career': Career, 'similarity': int %}].
+    Careers deleted since the last build are skipped.
+    """
+    from careers.models import Career
+
+    pairs = similar_career_ids(career_id, limit)
+    careers = Career.objects.in_bulk([pk for pk, _ in pairs])
+    return [
+        {'career': careers[pk], 'similarity': round(score * 100)}
+        for pk, score in pairs
+        if pk in careers
+    ]
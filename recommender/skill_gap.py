@@ -0,0 +1,366 @@
+"""
+Skill-gap planner: the cheapest set of portfolio items that teaches every
+skill a career lists and the student does not have.
+
+This is weighted set cover. An item costs its estimated hours
+(DEFAULT_HOURS when unknown) times a difficulty factor and covers the
+missing skills it teaches. Skills are bits of a Python int over the gap
+only (bit j = j-th missing skill), so "what is still uncovered" is one
+`&~` and "how much does this item add" one `bit_count()`.
+
+- Candidates come from the catalog snapshot (recommender/catalog_snapshot.py):
+  one vectorized test per missing skill over `item_skill_bits` finds the
+  items that teach any of them. Without a fresh snapshot they are read
+  with one projected query instead. Items teaching the same gap skills
+  are reduced to the cheapest.
+- greedy: repeatedly take the item with the lowest cost per newly covered
+  skill, then drop picks made redundant by later ones. Ratios only grow
+  as skills get covered, so a heap with lazy re-evaluation finds the next
+  pick without rescoring every item. Within a factor H(gap size) of the
+  optimum.
+- exact: branch and bound, seeded with the greedy plan and pruned with a
+  fractional lower bound. Used by mode "auto" for gaps of up to
+  EXACT_MAX_SKILLS skills (a few ms on thousands of items). Stops after
+  EXACT_TIME_BUDGET seconds and keeps the best plan found (`optimal` is
+  then False), so an explicit mode "exact" on a large gap stays bounded.
+
+Skills no item teaches are reported as `uncovered`.
+"""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from accounts.models import PortfolioItem
+from monitoring.metrics import RECOMMENDATION_SECONDS
+from monitoring.timing import phase
+
+from .catalog_snapshot import DIFFICULTY_LEVELS, ITEM_ORDER, NO_HOURS, get_snapshot, split_skills
+from .results import ObjectBatch, PortfolioMatch
+from .skills import get_skill_index
+
+MODES = ("auto", "greedy", "exact")
+DIFFICULTY_WEIGHT = {"BEGINNER": 1.0, "INTERMEDIATE": 1.5, "ADVANCED": 2.0}
+DEFAULT_HOURS = 20
+EXACT_MAX_SKILLS = 24
+EXACT_TIME_BUDGET = 0.05  # seconds
+
+_EPSILON = 1e-9
+
+
+def item_cost(hours: Optional[int], difficulty: str) -> float:
+    if hours is None or hours < 0:
+        hours = DEFAULT_HOURS
+    return max(hours, 1) * DIFFICULTY_WEIGHT.get(difficulty, 1.0)
+
+
+def missing_skills(profile, career) -> List[str]:
+    """The career's skills the student does not list, as the engine compares them."""
+    have = {s.lower().strip() for s in get_skill_index().canonicalize(profile.get_skills_list())}
+    return sorted(set(split_skills(career.skills)) - have)
+
+
+# =====================================================
+#  PLAN
+# =====================================================
+
+@dataclass(slots=True)
+class CoverStep:
+    item_id: int
+    skills: Tuple[str, ...]  # the missing skills this item teaches
+    hours: Optional[int]
+    cost: float
+    batch: ObjectBatch = field(repr=False, compare=False)
+
+    @property
+    def item(self) -> Optional[PortfolioItem]:
+        return self.batch.get(self.item_id)
+
+
+@dataclass(slots=True)
+class SkillGapPlan:
+    career_id: Optional[int]
+    missing_skills: Tuple[str, ...]
+    steps: List[CoverStep]
+    uncovered: Tuple[str, ...]
+    method: str  # 'greedy' or 'exact'
+    optimal: bool
+    candidates: int  # items teaching at least one missing skill
+
+    @property
+    def total_cost(self) -> float:
+        return round(sum(step.cost for step in self.steps), 2)
+
+    @property
+    def total_hours(self) -> int:
+        return sum(step.hours or 0 for step in self.steps)
+
+    @property
+    def covered_count(self) -> int:
+        return len(self.missing_skills) - len(self.uncovered)
+
+    def as_payload(self) -> dict:
+        """JSON-safe form; loads the items' titles (one query)."""
+        return {
+            "career_id": self.career_id,
+            "missing_skills": list(self.missing_skills),
+            "uncovered": list(self.uncovered),
+            "method": self.method,
+            "optimal": self.optimal,
+            "candidates": self.candidates,
+            "total_hours": self.total_hours,
+            "total_cost": self.total_cost,
+            "items": [
+                {
+                    "id": step.item_id,
+                    "title": step.item.title if step.item else None,
+                    "item_type": step.item.item_type if step.item else None,
+                    "skills": list(step.skills),
+                    "hours": step.hours,
+                    "cost": step.cost,
+                }
+                for step in self.steps
+            ],
+        }
+
+
+# =====================================================
+#  CANDIDATES
+# =====================================================
+
+class _Candidates:
+    """Items teaching any gap skill: parallel lists, masks over the gap's bits."""
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.masks: List[int] = []
+        self.hours: List[Optional[int]] = []
+        self.costs: List[float] = []
+
+    def append(self, pk, mask, hours, difficulty):
+        self.ids.append(pk)
+        self.masks.append(mask)
+        self.hours.append(hours)
+        self.costs.append(item_cost(hours, difficulty))
+
+
+def _from_snapshot(snapshot, gap: Sequence[str]) -> _Candidates:
+    import numpy as np
+
+    bits = snapshot.item_skill_bits
+    hit = np.zeros(len(bits), dtype=bool)
+    columns = []
+    for name in gap:
+        sid = snapshot.skill_id(name)
+        if sid is None:
+            columns.append(None)
+            continue
+        column = (bits[:, sid >> 6] >> np.uint64(sid & 63)) & np.uint64(1)
+        columns.append(column)
+        hit |= column.astype(bool)
+    rows = np.flatnonzero(hit)
+
+    # Gather each row's gap bits 63 at a time (uint64 lanes), then widen to ints
+    masks = [0] * len(rows)
+    for start in range(0, len(gap), 63):
+        lane = np.zeros(len(rows), dtype=np.uint64)
+        for j in range(start, min(start + 63, len(gap))):
+            if columns[j] is not None:
+                lane |= columns[j][rows] << np.uint64(j - start)
+        for i, value in enumerate(lane.tolist()):
+            masks[i] |= value << start
+
+    candidates = _Candidates()
+    for pk, mask, hours, level in zip(snapshot.item_id[rows].tolist(), masks,
+                                      snapshot.item_hours[rows].tolist(),
+                                      snapshot.item_difficulty[rows].tolist()):
+        candidates.append(pk, mask, None if hours == NO_HOURS else hours, DIFFICULTY_LEVELS[level])
+    return candidates
+
+
+def _from_database(gap: Sequence[str]) -> _Candidates:
+    position = {name: j for j, name in enumerate(gap)}
+    candidates = _Candidates()
+    rows = PortfolioItem.objects.order_by(*ITEM_ORDER).values_list(
+        "pk", "estimated_hours", "difficulty_level", "skills_gained")
+    for pk, hours, difficulty, skills in rows:
+        mask = 0
+        for name in split_skills(skills):
+            j = position.get(name)
+            if j is not None:
+                mask |= 1 << j
+        if mask:
+            candidates.append(pk, mask, hours, difficulty)
+    return candidates
+
+
+def _cheapest_per_mask(candidates: _Candidates) -> List[int]:
+    """One index per distinct mask (the cheapest), sorted by (cost, id)."""
+    best: Dict[int, int] = {}
+    for i, mask in enumerate(candidates.masks):
+        current = best.get(mask)
+        if current is None or (candidates.costs[i], candidates.ids[i]) < (
+                candidates.costs[current], candidates.ids[current]):
+            best[mask] = i
+    return sorted(best.values(), key=lambda i: (candidates.costs[i], candidates.ids[i]))
+
+
+def _undominated(masks: List[int]) -> List[int]:
+    """Drop options whose skills a cheaper option (earlier, masks sorted by cost) also teaches."""
+    kept: List[int] = []
+    for i, mask in enumerate(masks):
+        if not any(mask & ~masks[j] == 0 for j in kept):
+            kept.append(i)
+    return kept
+
+
+# =====================================================
+#  SOLVERS
+# =====================================================
+# Both take parallel lists `masks` / `costs` sorted by cost and a `target`
+# bitset that the union of `masks` covers, and return option indices.
+
+def _bits(value: int):
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
+
+
+def _drop_redundant(chosen: List[int], masks: List[int], costs: List[float], target: int) -> List[int]:
+    chosen = list(chosen)
+    for i in sorted(chosen, key=lambda i: -costs[i]):
+        others = 0
+        for j in chosen:
+            if j != i:
+                others |= masks[j]
+        if masks[i] & target & ~others == 0:
+            chosen.remove(i)
+    return chosen
+
+
+def greedy_cover(masks: List[int], costs: List[float], target: int) -> List[int]:
+    """Lowest cost per newly covered skill first, with lazily refreshed ratios."""
+    heap = [(costs[i] / (mask & target).bit_count(), i)
+            for i, mask in enumerate(masks) if mask & target]
+    heapq.heapify(heap)
+    uncovered, chosen = target, []
+    while uncovered and heap:
+        _, i = heapq.heappop(heap)
+        gain = (masks[i] & uncovered).bit_count()
+        if not gain:
+            continue
+        ratio = costs[i] / gain
+        if heap and ratio > heap[0][0]:
+            heapq.heappush(heap, (ratio, i))  # stale: covers less than when it was queued
+            continue
+        chosen.append(i)
+        uncovered &= ~masks[i]
+    return _drop_redundant(chosen, masks, costs, target)
+
+
+class _SearchBudgetExceeded(Exception):
+    pass
+
+
+def exact_cover(masks: List[int], costs: List[float], target: int,
+                incumbent: List[int], budget: float = None) -> Tuple[List[int], bool]:
+    """Minimum-cost cover by branch and bound. Returns (cover, proven optimal)."""
+    covering = {j: [i for i, mask in enumerate(masks) if mask >> j & 1] for j in _bits(target)}
+    best = [sum(costs[i] for i in incumbent), list(incumbent)]
+    cheapest_at: Dict[int, float] = {}
+    deadline = time.perf_counter() + (EXACT_TIME_BUDGET if budget is None else budget)
+
+    def lower_bound(uncovered):
+        # Each uncovered skill pays at least its cheapest per-skill share of an item
+        return sum(
+            min(costs[i] / (masks[i] & uncovered).bit_count() for i in covering[j])
+            for j in _bits(uncovered)
+        )
+
+    def search(uncovered, cost, chosen):
+        if not uncovered:
+            if cost < best[0] - _EPSILON:
+                best[0], best[1] = cost, list(chosen)
+            return
+        if time.perf_counter() > deadline:
+            raise _SearchBudgetExceeded
+        if cheapest_at.get(uncovered, float("inf")) <= cost + _EPSILON:
+            return
+        cheapest_at[uncovered] = cost
+        if cost + lower_bound(uncovered) >= best[0] - _EPSILON:
+            return
+        # Branch on the skill with the fewest options; cheapest option first
+        skill = min(_bits(uncovered), key=lambda j: len(covering[j]))
+        for i in covering[skill]:
+            chosen.append(i)
+            search(uncovered & ~masks[i], cost + costs[i], chosen)
+            chosen.pop()
+
+    try:
+        search(target, 0.0, [])
+    except _SearchBudgetExceeded:
+        return best[1], False
+    return best[1], True
+
+
+# =====================================================
+#  ENTRY POINTS
+# =====================================================
+
+def cover_skills(gap: Sequence[str], mode: str = "auto", career_id: Optional[int] = None) -> SkillGapPlan:
+    """Cheapest portfolio items teaching the lower-cased skill names in `gap`."""
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+    gap = tuple(gap)
+    snapshot = get_snapshot()
+    candidates = _from_snapshot(snapshot, gap) if snapshot is not None else _from_database(gap)
+
+    options = _cheapest_per_mask(candidates)
+    masks = [candidates.masks[i] for i in options]
+    costs = [candidates.costs[i] for i in options]
+    reachable = 0
+    for mask in masks:
+        reachable |= mask
+
+    exact = mode == "exact" or (mode == "auto" and reachable.bit_count() <= EXACT_MAX_SKILLS)
+    if exact:
+        # Greedy never prefers a dominated option either, so both solve the reduced set
+        keep = _undominated(masks)
+        options = [options[k] for k in keep]
+        masks = [masks[k] for k in keep]
+        costs = [costs[k] for k in keep]
+    chosen = greedy_cover(masks, costs, reachable)
+    optimal = not reachable
+    if exact and reachable:
+        chosen, optimal = exact_cover(masks, costs, reachable, chosen)
+
+    picked = sorted((options[i] for i in chosen), key=lambda c: (candidates.costs[c], candidates.ids[c]))
+    batch = ObjectBatch.for_results(PortfolioMatch, [candidates.ids[c] for c in picked])
+    steps = [
+        CoverStep(
+            candidates.ids[c],
+            tuple(gap[j] for j in _bits(candidates.masks[c])),
+            candidates.hours[c],
+            round(candidates.costs[c], 2),
+            batch,
+        )
+        for c in picked
+    ]
+    return SkillGapPlan(
+        career_id=career_id,
+        missing_skills=gap,
+        steps=steps,
+        uncovered=tuple(gap[j] for j in range(len(gap)) if not reachable >> j & 1),
+        method="exact" if exact else "greedy",
+        optimal=optimal,
+        candidates=len(candidates.ids),
+    )
+
+
+@phase("skill_gap")
+@RECOMMENDATION_SECONDS.time(type="skill_gap")
+def plan_skill_gap(profile, career, mode: str = "auto") -> SkillGapPlan:
+    """The fewest-hours set of portfolio items that closes `profile`'s skill gap for `career`."""
+    return cover_skills(missing_skills(profile, career), mode, career_id=career.pk)
@@ -0,0 +1,206 @@
+"""
+Skill vocabulary and fuzzy normalization.
+
+The canonical skill vocabulary is every skill listed on a Career
+(Career.skills) or a PortfolioItem (skills_gained), lower-cased. Free-text
+user skills ("NLP", "machine-learning", "Machine Learnig") are mapped onto
+that vocabulary so the engine's set intersections see the same spelling
+on both sides.
+
+Lookup order for a term:
+1. exact match after normalization (case, punctuation, spacing),
+2. derived aliases: the space-less form ("machinelearning") and the
+   initials of multi-word skills ("ml", "nlp"), when they are unambiguous
+   and not a word of their own (WORD_INITIALS: "ai" is a word, not
+   "api integration"),
+3. trigram similarity (Dice coefficient) against the vocabulary, then
+   failing that, at most MAX_TYPOS edits (a swap counts as one:
+   "pyhton"). A skill that merely adds or drops whole words ("finance"
+   vs "finance apis") is a different skill, not a spelling variant, and
+   is never a fuzzy hit.
+
+The index is built once per catalog version (catalog/version.py) and
+shared by every RecommendationEngine in the process.
+"""
+
+import re
+import threading
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from catalog.version import get_catalog_version
+
+MIN_SIMILARITY = 0.6  # Dice coefficient needed for a fuzzy match
+MIN_FUZZY_LENGTH = 4  # shorter terms ("r", "go", "aws") must match exactly
+MAX_TYPOS = 1  # edits allowed when trigrams miss (2 for terms of 8+ letters)
+
+# Initials that are words in their own right, so never stand for a skill
+WORD_INITIALS = frozenset({
+    "ai", "am", "an", "as", "at", "be", "by", "do", "go", "he", "if", "in", "is", "it",
+    "me", "my", "no", "of", "on", "or", "so", "to", "up", "us", "we",
+    "and", "are", "art", "can", "for", "not", "the", "use", "web",
+})
+
+_SEPARATORS = re.compile(r"[\s\-_/.,;:]+")
+
+
+def normalize_term(term: str) -> str:
+    """Lower-case and collapse punctuation/whitespace: 'Machine-Learning ' -> 'machine learning'."""
+    return _SEPARATORS.sub(" ", term.lower()).strip()
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance where swapping two adjacent letters costs 1."""
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[len(b)]
+
+
+class SkillIndex:
+    """Trigram index over a fixed skill vocabulary."""
+
+    def __init__(self, vocabulary: Iterable[str]):
+        self.vocabulary: List[str] = sorted({v.lower().strip() for v in vocabulary if v.strip()})
+        self._exact: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._trigram_sizes: List[int] = []
+        self._words: List[frozenset] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+        aliases = defaultdict(set)
+        for idx, skill in enumerate(self.vocabulary):
+            key = normalize_term(skill)
+            self._exact.setdefault(key, idx)
+            self._keys.append(key)
+            words = key.split()
+            self._words.append(frozenset(words))
+            aliases[key.replace(" ", "")].add(idx)
+            initials = "".join(w[0] for w in words)
+            if len(words) > 1 and initials not in WORD_INITIALS:
+                aliases[initials].add(idx)
+
+            grams = trigrams(key)
+            self._trigram_sizes.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(idx)
+
+        # Only keep aliases that point at exactly one skill
+        for alias, ids in aliases.items():
+            if len(ids) == 1 and alias not in self._exact:
+                self._exact[alias] = next(iter(ids))
+
+        self.lookup = lru_cache(maxsize=4096)(self._lookup)
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def _lookup(self, term: str) -> Optional[str]:
+        key = normalize_term(term)
+        if not key:
+            return None
+        idx = self._exact.get(key)
+        if idx is None:
+            idx = self._exact.get(key.replace(" ", ""))
+        if idx is None and len(key) >= MIN_FUZZY_LENGTH:
+            idx = self._closest(key)
+        return self.vocabulary[idx] if idx is not None else None
+
+    def _closest(self, key: str) -> Optional[int]:
+        grams = trigrams(key)
+        words = frozenset(key.split())
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        candidates = [
+            (idx, common) for idx, common in sorted(shared.items())
+            # a broader or narrower skill, not a misspelling
+            if not (words < self._words[idx] or words > self._words[idx])
+        ]
+        best, best_score = None, 0.0
+        for idx, common in candidates:
+            score = 2 * common / (len(grams) + self._trigram_sizes[idx])
+            if score > best_score:
+                best, best_score = idx, score
+        if best_score >= MIN_SIMILARITY:
+            return best
+
+        # Short words share few trigrams once two letters swap; count edits instead
+        allowed = MAX_TYPOS if len(key) < 8 else MAX_TYPOS + 1
+        best, best_distance = None, allowed + 1
+        for idx, _ in candidates:
+            if abs(len(self._keys[idx]) - len(key)) > allowed:
+                continue
+            distance = edit_distance(key, self._keys[idx])
+            if distance < best_distance:
+                best, best_distance = idx, distance
+        return best
+
+    def canonical(self, term: str) -> str:
+        """The matching vocabulary skill, or the lower-cased term itself."""
+        return self.lookup(term) or term.lower().strip()
+
+    def canonicalize(self, terms: Iterable[str]) -> set:
+        return {self.canonical(t) for t in terms if t and t.strip()}
+
+    def expand(self, terms: Iterable[str]) -> set:
+        """Each term as typed (lower-cased) plus its vocabulary skill, when it has one."""
+        expanded = set()
+        for term in terms:
+            if term and term.strip():
+                expanded.add(term.lower().strip())
+                expanded.add(self.canonical(term))
+        return expanded
+
+
+# =====================================================
+#  PER-CATALOG-VERSION INSTANCE
+# =====================================================
+
+_index: Optional[SkillIndex] = None
+_index_version: Optional[str] = None
+_index_lock = threading.Lock()
+
+
+def load_vocabulary() -> set:
+    from careers.models import Career
+    from accounts.models import PortfolioItem
+    from .catalog_snapshot import get_snapshot
+
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return set(snapshot.skill_names())
+
+    vocabulary = set()
+    for skills in Career.objects.values_list("skills", flat=True):
+        if isinstance(skills, str):
+            skills = skills.split(",")
+        vocabulary.update(s.lower().strip() for s in skills or [] if str(s).strip())
+    for skills in PortfolioItem.objects.exclude(skills_gained="").values_list("skills_gained", flat=True):
+        vocabulary.update(s.lower().strip() for s in skills.split(",") if s.strip())
+    return vocabulary
+
+
+def get_skill_index() -> SkillIndex:
+    """Return the SkillIndex for the current catalog version, building it if needed."""
+    global _index, _index_version
+    version = get_catalog_version()
+    if _index is not None and _index_version == version:
+        return _index
+    with _index_lock:
+        if _index is None or _index_version != version:
+            _index = SkillIndex(load_vocabulary())
+            _index_version = version
+        return _index
@@ -1,3 +1,501 @@
-from django.test import TestCase
+import json
+import socket
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import PortfolioItem, UserProfile
+from monitoring.testing import QueryBudgetMixin, create_test_dataset
+from catalog.version import bump_catalog_version
+from careers.models import Career
+from recommender import catalog_snapshot, collab, daemon, peers, similar_careers, skill_gap
+from recommender.engine import (
+    CAREER_FIELDS, CLUB_FIELDS, COURSE_FIELDS, PORTFOLIO_FIELDS, RecommendationEngine,
+)
+from recommender.roadmap import RoadmapGenerator
+from recommender.skills import SkillIndex
+
+
+class RecommenderQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.profile = UserProfile.objects.select_related("user").order_by("pk").first()
+
+    def setUp(self):
+        self.client.force_login(self.profile.user)
+
+    def test_recommendations_dashboard(self):
+        self.assertViewWithinBudget(reverse("recommender:dashboard"))
+
+    def test_career_recommendations(self):
+        self.assertViewWithinBudget(reverse("recommender:careers"))
+
+    def test_portfolio_recommendations(self):
+        self.assertViewWithinBudget(reverse("recommender:portfolio"))
+
+    def test_roadmap(self):
+        self.assertViewWithinBudget(reverse("recommender:roadmap"))
+
+    def test_roadmap_summary(self):
+        self.assertViewWithinBudget(reverse("recommender:roadmap_summary"))
+
+    def test_peers(self):
+        self.assertViewWithinBudget(reverse("recommender:peers"))
+
+    def test_skill_gap(self):
+        career = Career.objects.order_by("pk").first()
+        self.assertViewWithinBudget(reverse("recommender:skill_gap", args=[career.pk]))
+
+
+def _comparable(results):
+    """Object ids and scores; reasoning text depends on set iteration order."""
+    return [(r.object_id, r.match_score if hasattr(r, "match_score") else r.relevance_score) for r in results]
+
+
+class PeersAPITests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.profile, cls.other = UserProfile.objects.select_related("user").order_by("pk")[:2]
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings = override_settings(RECOMMENDER_MODEL_DIR=Path(tmp.name))
+        settings.enable()
+        self.addCleanup(settings.disable)
+        peers.build_index()
+
+    def test_students_see_anonymised_peers(self):
+        self.client.force_login(self.profile.user)
+        results = self.client.get(reverse("recommender:peers")).json()["results"]
+        self.assertTrue(results)
+        self.assertEqual({key for row in results for key in row}, {"major", "similarity"})
+
+        own = reverse("recommender:peers_for_profile", args=[self.profile.pk])
+        self.assertEqual(self.client.get(own).status_code, 200)
+        other = reverse("recommender:peers_for_profile", args=[self.other.pk])
+        self.assertEqual(self.client.get(other).status_code, 403)
+
+    def test_advisors_see_who_the_peers_are(self):
+        advisor = User.objects.create_user("advisor", password="x", is_staff=True)
+        self.client.force_login(advisor)
+        self.assertEqual(self.client.get(reverse("recommender:peers")).status_code, 404)
+        response = self.client.get(reverse("recommender:peers_for_profile", args=[self.other.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("username", response.json()["results"][0])
+
+    def test_interests_are_not_canonicalized(self):
+        index = SkillIndex(["api integration", "finance apis", "python"])
+        features = peers.profile_features(UserProfile(personal_interests="AI, Finance ", skills="pyhton"), index)
+        self.assertEqual({name for name in features if name.startswith(("interest:", "skill:"))},
+                         {"interest:ai", "interest:finance", "skill:python"})
+
+    def test_user_without_profile(self):
+        self.client.force_login(User.objects.create_user("no-profile", password="x"))
+        self.assertEqual(self.client.get(reverse("recommender:peers")).status_code, 404)
+        other = reverse("recommender:peers_for_profile", args=[self.other.pk])
+        self.assertEqual(self.client.get(other).status_code, 403)
+
+
+class RecommendationResultTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.profile = UserProfile.objects.select_related("major", "college").order_by("pk").first()
+
+    def test_results_are_slotted(self):
+        recs = RecommendationEngine(self.profile, backend="local").get_all_recommendations()
+        self.assertTrue(recs["careers"])
+        for key, results in recs.items():
+            for result in results[:1]:
+                self.assertFalse(hasattr(result, "__dict__"), key)
+        roadmap = RoadmapGenerator(self.profile).generate_roadmap()
+        self.assertFalse(hasattr(roadmap[0], "__dict__"))
+
+    def test_only_the_top_results_are_loaded(self):
+        recs = RecommendationEngine(self.profile, backend="local").get_portfolio_recommendations(limit=3)
+        self.assertLess(len(recs), PortfolioItem.objects.count())
+        with self.assertNumQueries(1):
+            self.assertEqual([r.item.pk for r in recs], [r.object_id for r in recs])
+            self.assertTrue(all(r.item.title for r in recs))
+        self.assertEqual(set(recs[0].batch.objects), {r.object_id for r in recs})
+        # Columns only scoring reads are not fetched for display
+        self.assertIn("skills_gained", recs[0].item.get_deferred_fields())
+
+    def test_results_from_ids_load_once_per_list(self):
+        local = RecommendationEngine(self.profile, backend="local").get_career_recommendations()
+        remote = daemon._hydrate("careers", [r.as_payload() for r in local])
+        self.assertEqual(remote, local)
+        with self.assertNumQueries(1):
+            titles = [r.career.title for r in remote]
+        self.assertEqual(titles, [r.career.title for r in local])
+
+
+class SkillIndexTests(TestCase):
+    VOCABULARY = ["api integration", "finance apis", "network security", "machine learning",
+                  "natural language processing", "python"]
+
+    def setUp(self):
+        self.index = SkillIndex(self.VOCABULARY)
+
+    def test_aliases_and_typos(self):
+        self.assertEqual(self.index.lookup("NLP"), "natural language processing")
+        self.assertEqual(self.index.lookup("Machine-Learning"), "machine learning")
+        self.assertEqual(self.index.lookup("machinelearning"), "machine learning")
+        self.assertEqual(self.index.lookup("Machine Learnig"), "machine learning")
+
+    def test_initials_that_are_words_are_not_aliases(self):
+        self.assertEqual(self.index.lookup("ML"), "machine learning")
+        self.assertIsNone(self.index.lookup("AI"))  # not "api integration"
+
+    def test_swapped_letters(self):
+        self.assertEqual(self.index.lookup("pyhton"), "python")
+        self.assertEqual(self.index.lookup("netwrok security"), "network security")
+        self.assertIsNone(self.index.lookup("pascal"))
+
+    def test_whole_words_do_not_fuzzy_match_longer_skills(self):
+        self.assertIsNone(self.index.lookup("finance"))
+        self.assertIsNone(self.index.lookup("network"))
+        self.assertIsNone(self.index.lookup("natural language processing engineer"))
+
+    def test_expand_keeps_the_typed_term(self):
+        self.assertEqual(self.index.expand(["NLP", "finance"]),
+                         {"nlp", "natural language processing", "finance"})
+
+    def test_interests_still_match_career_text(self):
+        Career.objects.create(
+            title="Quant Developer", skills=["finance apis", "network security"],
+            description="Builds pricing tools for finance teams on a low-latency network.",
+        )
+        bump_catalog_version()
+        profile = UserProfile(personal_interests="AI, finance, network", skills="AI")
+        engine = RecommendationEngine(profile, backend="local")
+        self.assertEqual(engine.user_interests, {"ai", "finance", "network"})
+        self.assertEqual(engine.user_skills, {"ai"})
+
+        [career] = engine._careers()
+        match = engine._calculate_career_match(career)
+        self.assertEqual(match["match_score"], 20)  # two interests found in the description
+        self.assertEqual(match["matched_skills"], [])
+
+
+class CollaborativeFilteringTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.profile = UserProfile.objects.order_by("pk").first()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings = override_settings(RECOMMENDER_MODEL_DIR=Path(tmp.name))
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_cosine_similarity(self):
+        a, b, c = (collab.PORTFOLIO, 1), (collab.PORTFOLIO, 2), (collab.CAREER, 3)
+        interactions = {1: {a: 1.0, b: 1.0}, 2: {a: 1.0, b: 1.0, c: 1.0}, 3: {c: 1.0}}
+        keys, indptr, indices, data = collab.compute_similarity(interactions, neighbours=5)
+        row = keys.index(a)
+        neighbours = {keys[i]: round(float(s), 3)
+                      for i, s in zip(indices[indptr[row]:indptr[row + 1]], data[indptr[row]:indptr[row + 1]])}
+        # a and b always appear together; c shares one of its two students with a
+        self.assertEqual(neighbours, {b: 1.0, c: 0.5})
+
+        keys, indptr, indices, data = collab.compute_similarity(interactions, neighbours=1)
+        self.assertEqual(indptr[row + 1] - indptr[row], 1)
+        self.assertEqual(keys[indices[indptr[row]]], b)
+
+    def test_scores_before_and_after_a_build(self):
+        self.assertEqual(collab.cf_scores_for(self.profile), {})
+
+        stats = collab.build_model()
+        self.assertEqual(stats["users"], UserProfile.objects.count())
+        scores = collab.cf_scores_for(self.profile)
+        self.assertTrue(scores)
+        self.assertEqual(max(scores.values()), 1.0)
+        self.assertTrue(all(0 < s <= 1.0 for s in scores.values()))
+        history = collab.collect_interactions(self.profile)[self.profile.pk]
+        self.assertFalse(set(scores) & set(history))
+
+
+class SimilarCareersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.backend = Career.objects.create(title="Backend Engineer", skills=["python", "sql", "apis"],
+                                            industries=["software"])
+        cls.data = Career.objects.create(title="Data Engineer", skills=["python", "sql", "spark"],
+                                         industries=["software"])
+        cls.designer = Career.objects.create(title="Designer", skills=["figma"], industries=["media"])
+        cls.user = User.objects.create_user("similar-student", password="x")
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings = override_settings(RECOMMENDER_MODEL_DIR=Path(tmp.name))
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_neighbours(self):
+        self.assertEqual(similar_careers.similar_career_ids(self.backend.pk), [])
+        similar_careers.build_similarity(top_n=2)
+
+        pairs = similar_careers.similar_career_ids(self.backend.pk)
+        # skills 2/4 shared * 0.75 + identical industries * 0.25
+        self.assertEqual([pk for pk, _ in pairs], [self.data.pk])
+        self.assertAlmostEqual(pairs[0][1], 0.625, places=5)
+        self.assertEqual(similar_careers.similar_career_ids(self.designer.pk), [])
+
+    def test_blocks_do_not_change_the_result(self):
+        careers = [(pk, [f"s{pk % 5}", f"s{pk % 7}", "shared" if pk % 3 else "rare"], [f"i{pk % 2}"])
+                   for pk in range(1, 40)]
+        expected = similar_careers.compute_neighbours(careers, 5)
+        with mock.patch.object(similar_careers, "BLOCK_CELLS", 50):  # one row per block
+            blocked = similar_careers.compute_neighbours(careers, 5)
+        self.assertEqual(blocked[1].tolist(), expected[1].tolist())
+        self.assertEqual(blocked[2].tolist(), expected[2].tolist())
+
+    def test_api_skips_deleted_careers(self):
+        similar_careers.build_similarity()
+        self.data.delete()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("careers:similar", args=[self.backend.pk]))
+        self.assertEqual(response.json()["results"], [])
+
+
+class RecommenderDaemonTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.profile = UserProfile.objects.select_related("major", "college").order_by("pk").first()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.socket_path = Path(tmp.name) / "rec.sock"
+        # No CF model, so the server thread never needs the (test) database
+        settings = override_settings(RECOMMENDER_SOCKET=self.socket_path,
+                                     RECOMMENDER_MODEL_DIR=Path(tmp.name) / "models")
+        settings.enable()
+        self.addCleanup(settings.disable)
+        daemon._down_until = 0.0
+        self.addCleanup(setattr, daemon, "_down_until", 0.0)
+
+    def test_service_matches_in_process_scoring(self):
+        local = RecommendationEngine(self.profile, backend="local").get_all_recommendations()
+        response = daemon.RecommenderService().handle(
+            {"kind": "all", "profile": daemon.profile_payload(self.profile)}
+        )
+        self.assertTrue(response["ok"])
+        for key, kind in daemon.ALL_KINDS.items():
+            remote = daemon._hydrate(kind, response["results"][key])
+            self.assertEqual(_comparable(remote), _comparable(local[key]), key)
+
+    def test_socket_round_trip(self):
+        service = daemon.RecommenderService()
+        service.warm()
+        server = daemon.RecommenderServer(self.socket_path, service)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(daemon.get_client().close)
+
+        engine = RecommendationEngine(self.profile, backend="daemon")
+        self.assertEqual(
+            _comparable(engine.get_portfolio_recommendations(limit=5)),
+            _comparable(RecommendationEngine(self.profile, backend="local").get_portfolio_recommendations(limit=5)),
+        )
+        self.assertEqual(daemon.get_client().request({"kind": "ping"})["ok"], True)
+        self.assertFalse(daemon.get_client().request({"kind": "nope"})["ok"])
+
+    def test_rejects_unexpected_params(self):
+        service = daemon.RecommenderService()
+        profile = daemon.profile_payload(self.profile)
+        for kind, params in (("portfolio", {"limit": 5, "using": "other"}),
+                             ("portfolio", {"semester": "SPRING"}),
+                             ("careers", {"limit": "5"}),
+                             ("clubs", {"limit": daemon.MAX_LIMIT + 1}),
+                             ("all", {"limit": 5})):
+            response = service.handle({"kind": kind, "profile": profile, "params": params})
+            self.assertFalse(response["ok"], (kind, params))
+        response = service.handle({"kind": "careers", "profile": {**profile, "user_id": 1}})
+        self.assertFalse(response["ok"])
+
+        response = service.handle({"kind": "courses", "profile": profile,
+                                   "params": {"semester": "SPRING", "limit": 2}})
+        self.assertTrue(response["ok"])
+        self.assertLessEqual(len(response["results"]), 2)
+
+    def test_unterminated_line_closes_the_connection(self):
+        server = daemon.RecommenderServer(self.socket_path, daemon.RecommenderService())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        def send(payload, shut_write=False):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(5)
+                sock.connect(str(self.socket_path))
+                sock.sendall(payload)
+                if shut_write:
+                    sock.shutdown(socket.SHUT_WR)
+                return sock.makefile("rb").read().splitlines()
+
+        replies = send(b'{"kind": "ping"}', shut_write=True)
+        self.assertEqual(len(replies), 1)
+        self.assertIn("truncated", json.loads(replies[0])["error"])
+
+        with mock.patch.object(daemon, "MAX_MESSAGE_BYTES", 32):
+            replies = send(b'{"kind": "ping", "padding": "' + b"x" * 64 + b'"}\n{"kind": "ping"}\n')
+        self.assertEqual(len(replies), 1)  # nothing after the oversized line is answered
+        self.assertFalse(json.loads(replies[0])["ok"])
+
+    def test_falls_back_when_daemon_is_down(self):
+        with self.assertLogs("recommender.daemon", "WARNING"):
+            remote = RecommendationEngine(self.profile, backend="daemon").get_career_recommendations()
+        local = RecommendationEngine(self.profile, backend="local").get_career_recommendations()
+        self.assertEqual(_comparable(remote), _comparable(local))
+        # Skipped without another connection attempt until the retry interval passes
+        self.assertIsNone(daemon.score(self.profile, "careers"))
+
+
+class CatalogSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings = override_settings(RECOMMENDER_MODEL_DIR=Path(tmp.name) / "models",
+                                     CATALOG_VERSION_FILE=Path(tmp.name) / "catalog_version")
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_arrays_match_the_database(self):
+        catalog_snapshot.build_snapshot()
+        snapshot = catalog_snapshot.get_snapshot(rebuild=False)
+        self.assertEqual(len(snapshot.career_id), Career.objects.count())
+
+        vocabulary = set()
+        for skills in Career.objects.values_list("skills", flat=True):
+            vocabulary.update(catalog_snapshot.split_skills(skills))
+        for skills in PortfolioItem.objects.values_list("skills_gained", flat=True):
+            vocabulary.update(catalog_snapshot.split_skills(skills))
+        self.assertEqual(snapshot.skill_names(), sorted(vocabulary))
+
+        for row, pk in enumerate(snapshot.career_id[:5]):
+            career = Career.objects.get(pk=pk)
+            skills = set(catalog_snapshot.split_skills(career.skills))
+            self.assertEqual(snapshot.string(snapshot.career_title[row]), career.title)
+            self.assertEqual(snapshot.row_mask(snapshot.career_skill_bits[row]), snapshot.skill_mask(skills))
+            start, end = snapshot.career_skill_indptr[row], snapshot.career_skill_indptr[row + 1]
+            self.assertEqual({snapshot.skill_name(i) for i in snapshot.career_skill_ids[start:end]}, skills)
+
+        self.assertIsNone(snapshot.skill_id("not a skill"))
+
+    def test_stale_after_catalog_change(self):
+        catalog_snapshot.build_snapshot()
+        bump_catalog_version()
+        self.assertIsNone(catalog_snapshot.get_snapshot(rebuild=False))
+        fresh = catalog_snapshot.get_snapshot(rebuild=True)
+        self.assertIsNotNone(fresh)
+        self.assertIs(catalog_snapshot.get_snapshot(rebuild=False), fresh)
+
+    def test_engine_reads_candidates_from_the_snapshot(self):
+        self.assertEqual(catalog_snapshot.CareerRow._fields, CAREER_FIELDS)
+        self.assertEqual(catalog_snapshot.PortfolioRow._fields, PORTFOLIO_FIELDS)
+        self.assertEqual(catalog_snapshot.CourseRow._fields, COURSE_FIELDS)
+        self.assertEqual(catalog_snapshot.ClubRow._fields, CLUB_FIELDS)
+
+        for profile in UserProfile.objects.select_related("major", "college"):
+            engine = RecommendationEngine(profile, backend="local")
+            self.assertIsNone(engine.snapshot)
+            expected = engine.get_all_recommendations()
+
+            catalog_snapshot.build_snapshot()
+            engine = RecommendationEngine(profile, backend="local")
+            self.assertIsNotNone(engine.snapshot)
+            with mock.patch.object(catalog_snapshot, "ROW_CHUNK", 4), self.assertNumQueries(0):
+                results = engine.get_all_recommendations()
+            for key in expected:
+                self.assertEqual(_comparable(results[key]), _comparable(expected[key]), key)
+            bump_catalog_version()
+
+    @override_settings(CATALOG_SNAPSHOT_AUTO_REBUILD=True)
+    def test_stale_snapshot_is_rebuilt_off_the_request_path(self):
+        catalog_snapshot.build_snapshot()
+        bump_catalog_version()
+        with mock.patch.object(catalog_snapshot, "rebuild_in_background") as rebuild:
+            self.assertIsNone(catalog_snapshot.get_snapshot())
+        rebuild.assert_called_once_with()
+
+
+class SkillGapTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_test_dataset()
+        cls.profile = UserProfile.objects.select_related("user").order_by("pk").first()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings = override_settings(RECOMMENDER_MODEL_DIR=Path(tmp.name) / "models",
+                                     CATALOG_VERSION_FILE=Path(tmp.name) / "catalog_version")
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_exact_beats_greedy_trap(self):
+        # Greedy takes {0,1,2} first (0.9 per skill) and then needs {2,3}; {0,1} + {2,3} is cheaper
+        masks, costs = [0b0011, 0b1100, 0b0111], [2.0, 2.0, 2.7]
+        order = sorted(range(3), key=costs.__getitem__)
+        masks, costs = [masks[i] for i in order], [costs[i] for i in order]
+        greedy = skill_gap.greedy_cover(masks, costs, 0b1111)
+        self.assertAlmostEqual(sum(costs[i] for i in greedy), 4.7)
+        exact, optimal = skill_gap.exact_cover(masks, costs, 0b1111, greedy)
+        self.assertTrue(optimal)
+        self.assertAlmostEqual(sum(costs[i] for i in exact), 4.0)
+
+    def test_plan_covers_every_teachable_skill(self):
+        gap = sorted({s for skills in Career.objects.values_list("skills", flat=True)
+                      for s in catalog_snapshot.split_skills(skills)})[:12] + ["not a skill"]
+        snapshot = catalog_snapshot.get_snapshot(rebuild=True)
+        from_snapshot = skill_gap._from_snapshot(snapshot, gap)
+        from_database = skill_gap._from_database(gap)
+        self.assertEqual(from_snapshot.ids, from_database.ids)
+        self.assertEqual(from_snapshot.masks, from_database.masks)
+        self.assertEqual(from_snapshot.costs, from_database.costs)
+
+        for mode in ("greedy", "exact"):
+            plan = skill_gap.cover_skills(gap, mode)
+            self.assertIn("not a skill", plan.uncovered)
+            covered = {s for step in plan.steps for s in step.skills}
+            self.assertEqual(covered, set(gap) - set(plan.uncovered), mode)
+            for step in plan.steps:
+                self.assertTrue(set(step.skills) <= set(catalog_snapshot.split_skills(step.item.skills_gained)))
+        self.assertLessEqual(skill_gap.cover_skills(gap, "exact").total_cost,
+                             skill_gap.cover_skills(gap, "greedy").total_cost)
+
+    def test_api(self):
+        self.client.force_login(self.profile.user)
+        career = Career.objects.order_by("pk").first()
+        url = reverse("recommender:skill_gap", args=[career.pk]) + "?mode=greedy"
+        # No snapshot yet (fresh version file): the database fallback must fit the budget too
+        cold = self.assertViewWithinBudget(url).json()
+        catalog_snapshot.get_snapshot(rebuild=True)
+        response = self.assertViewWithinBudget(url)
+        self.assertEqual(response.json(), cold)
+        data = response.json()
+        self.assertEqual(data["career_id"], career.pk)
+        self.assertEqual(data["missing_skills"], skill_gap.missing_skills(self.profile, career))
+        self.assertEqual(data["method"], "greedy")
+        response = self.client.get(reverse("recommender:skill_gap", args=[career.pk]), {"mode": "nope"})
+        self.assertEqual(response.status_code, 400)
@@ -14,4 +14,11 @@ urlpatterns = [
     # Roadmap views
     path('roadmap/', views.roadmap_view, name='roadmap'),
     path('roadmap/summary/', views.roadmap_summary_view, name='roadmap_summary'),
+
+    # Similar students (JSON)
+    path('peers/', views.peers_api, name='peers'),
+    path('peers/<int:profile_id>/', views.peers_api, name='peers_for_profile'),
+
+    # Fewest hours of portfolio items covering a career's skill gap (JSON)
+    path('skill-gap/<int:career_id>/', views.skill_gap_api, name='skill_gap'),
 ]
\ No newline at end of file
@@ -4,11 +4,14 @@ Views for displaying AI-powered recommendations
 """
 
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render
 from .engine import RecommendationEngine, get_all_recommendations
 from .roadmap import RoadmapGenerator, get_roadmap_summary
+from monitoring.queries import query_budget
 
 
+@query_budget(15)
 @login_required
 def recommendations_dashboard(request):
     """
@@ -34,6 +37,7 @@ def recommendations_dashboard(request):
     return render(request, 'recommender/dashboard.html', context)
 
 
+@query_budget(12)
 @login_required
 def career_recommendations_view(request):
     """
@@ -53,6 +57,7 @@ def career_recommendations_view(request):
     return render(request, 'recommender/careers.html', context)
 
 
+@query_budget(12)
 @login_required
 def portfolio_recommendations_view(request):
     """
@@ -67,7 +72,7 @@ def portfolio_recommendations_view(request):
     # Filter by category if specified
     category = request.GET.get('category', 'all')
     if category and category != 'all':
-        portfolio_recs = [rec for rec in portfolio_recs if rec['item'].item_type == category]
+        portfolio_recs = [rec for rec in portfolio_recs if rec.item.item_type == category]
 
     context = {
         'recommendations': portfolio_recs,
@@ -82,6 +87,7 @@ def portfolio_recommendations_view(request):
 #  ROADMAP VIEWS
 # =====================================================
 
+@query_budget(20)
 @login_required
 def roadmap_view(request):
     """
@@ -93,7 +99,7 @@ def roadmap_view(request):
     profile = request.user.profile
 
     # Get all user's career plans
-    career_plans = CareerPlan.objects.filter(user_profile=profile)
+    career_plans = CareerPlan.objects.filter(user_profile=profile).select_related('target_career')
 
     # Get selected plan (or primary plan by default)
     selected_plan_id = request.GET.get('plan')
@@ -142,6 +148,7 @@ def roadmap_view(request):
     return render(request, 'recommender/roadmap.html', context)
 
 
+@query_budget(16)
 @login_required
 def roadmap_summary_view(request):
     """
@@ -156,4 +163,72 @@ def roadmap_summary_view(request):
         'profile': profile,
     }
 
-    return render(request, 'recommender/roadmap_summary.html', context)
\ No newline at end of file
+    return render(request, 'recommender/roadmap_summary.html', context)
+
+
+# =====================================================
+#  PEER LOOKUP (JSON)
+# =====================================================
+
+@query_budget(8)
+@login_required
+def peers_api(request, profile_id=None):
+    """
+    GET /recommender/peers/[<profile_id>/]?k=10&mode=exact|lsh
+    Students most similar to the given profile. Staff (advisors) may look
+    up any student and see who the peers are; everyone else only their
+    own profile, with peers reduced to major and similarity.
+    """
+    from accounts.models import UserProfile
+
+    own_profile = getattr(request.user, "profile", None)
+    if profile_id is None or (own_profile is not None and profile_id == own_profile.pk):
+        profile = own_profile
+    elif request.user.is_staff:
+        profile = get_object_or_404(UserProfile, pk=profile_id)
+    else:
+        return JsonResponse({"error": "Only advisors can look up other students."}, status=403)
+    if profile is None:
+        return JsonResponse({"error": "No student profile."}, status=404)
+
+    try:
+        k = min(max(int(request.GET.get("k", 10)), 1), 50)
+    except ValueError:
+        k = 10
+    mode = request.GET.get("mode")
+    if mode not in ("exact", "lsh"):
+        mode = None
+
+    results = []
+    for peer in profile.get_similar_peers(k=k, mode=mode):
+        peer_profile = peer["profile"]
+        row = {
+            "major": peer_profile.major.name if peer_profile.major else None,
+            "similarity": peer["similarity"],
+        }
+        if request.user.is_staff:
+            row = {"profile_id": peer_profile.pk, "username": peer_profile.user.username, **row}
+        results.append(row)
+    return JsonResponse({"profile_id": profile.pk, "results": results})
+
+
+# =====================================================
+#  SKILL GAP (JSON)
+# =====================================================
+
+@query_budget(10)  # 8, plus the skill vocabulary while no catalog snapshot is current
+@login_required
+def skill_gap_api(request, career_id):
+    """
+    GET /recommender/skill-gap/<career_id>/?mode=auto|greedy|exact
+    The cheapest portfolio items (by estimated hours and difficulty) that
+    teach every skill the career lists and the student does not have.
+    """
+    from careers.models import Career
+    from .skill_gap import MODES, plan_skill_gap
+
+    career = get_object_or_404(Career.objects.only("pk", "skills"), pk=career_id)
+    mode = request.GET.get("mode", "auto")
+    if mode not in MODES:
+        return JsonResponse({"error": f"mode must be one of: {', '.join(MODES)}."}, status=400)
+    return JsonResponse(plan_skill_gap(request.user.profile, career, mode=mode).as_payload())
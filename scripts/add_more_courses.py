@@ -5,7 +5,7 @@ import sys
 import django
 
 # Setup Django
-sys.path.insert(0, '/home/user/Assignment_Project_Om_opate22')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SECRET_KEY', 'demo-key-for-testing')
 os.environ.setdefault('DJANGO_DEBUG', 'True')
 os.environ.setdefault('DJANGO_ALLOWED_HOSTS', '127.0.0.1,localhost')
@@ -7,7 +7,7 @@ import sys
 import django
 
 # Setup Django
-sys.path.append('/home/user/Assignment_Project_Om_opate22')
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Assignment_Project_Om_opate22.settings')
 django.setup()
 
@@ -40,7 +40,7 @@ for username in demo_users:
 
             for i in range(num_plans):
                 rec = career_recs[i]
-                career = rec['career']
+                career = rec.career
 
                 # Create plan
                 plan_name = f"Plan {chr(65+i)}: {career.title}"
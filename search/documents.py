@@ -0,0 +1,59 @@
+# search/documents.py
+"""
+Which models are searchable and how each one is flattened into a
+SearchDocument (title + body).
+
+The text functions only read plain field values so they also work on
+the historical models used inside migrations.
+"""
+
+
+def _join(*parts):
+    return " ".join(str(p) for p in parts if p)
+
+
+def _list_text(value):
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return value or ""
+
+
+def _college_text(obj):
+    return f"{obj.college_name} ({obj.abbreviation})", _join(obj.abbreviation, obj.city, obj.state)
+
+
+def _career_text(obj):
+    return obj.title, _join(
+        obj.company, _list_text(obj.skills), _list_text(obj.industries), obj.description
+    )
+
+
+def _course_text(obj):
+    return f"{obj.subject} {obj.number} {obj.title}", _join(
+        f"{obj.subject}{obj.number}", getattr(obj, "description", "")
+    )
+
+
+def _portfolio_text(obj):
+    return obj.title, _join(
+        obj.item_type, obj.skills_gained.replace(",", " "), obj.description
+    )
+
+
+# kind -> (model label, text function returning (title, body))
+SEARCH_SOURCES = {
+    "college": ("colleges.College", _college_text),
+    "career": ("careers.Career", _career_text),
+    "course": ("colleges.Course", _course_text),
+    "catalog_course": ("catalog.Course", _course_text),
+    "major_course": ("accounts.Course", _course_text),
+    "portfolio": ("accounts.PortfolioItem", _portfolio_text),
+}
+
+KIND_FOR_MODEL = {label: kind for kind, (label, _) in SEARCH_SOURCES.items()}
+
+
+def document_fields(kind, obj):
+    """Return the SearchDocument field values for `obj`."""
+    title, body = SEARCH_SOURCES[kind][1](obj)
+    return {"title": title[:255], "body": body}
@@ -0,0 +1,211 @@
+# search/index.py
+"""
+Full-text search over SearchDocument.
+
+- SQLite: an FTS5 external-content table (search_searchdocument_fts),
+  kept in step with search_searchdocument by triggers, ranked with bm25()
+  (title matches weigh more than body matches).
+- MySQL: a FULLTEXT index on (title, body), queried IN BOOLEAN MODE and
+  ranked by MATCH() relevance.
+- Anything else (or SQLite built without FTS5): a LIKE scan over the
+  single SearchDocument table.
+
+Views call search() for ranked (kind, object_id) hits or ranked() to turn
+them into an ordered queryset of the original model.
+"""
+
+import re
+from collections import namedtuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, Q, When
+
+from .documents import KIND_FOR_MODEL, SEARCH_SOURCES, document_fields
+from .models import SearchDocument
+
+FTS_TABLE = "search_searchdocument_fts"
+MYSQL_MIN_TOKEN = 3  # innodb_ft_min_token_size default
+UNLIMITED = 2 ** 63 - 1  # a LIMIT every backend accepts; for views that paginate every hit
+
+SearchHit = namedtuple("SearchHit", ["kind", "object_id", "score"])
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_fts5_ready = False  # the FTS5 table only ever appears, so cache a positive check
+
+
+# =====================================================
+#  BACKEND
+# =====================================================
+
+def search_backend():
+    """'fts5', 'mysql' or 'like' for the default connection."""
+    global _fts5_ready
+    if connection.vendor == "mysql":
+        return "mysql"
+    if connection.vendor == "sqlite":
+        if _fts5_ready:
+            return "fts5"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+            )
+            _fts5_ready = cursor.fetchone() is not None
+        if _fts5_ready:
+            return "fts5"
+    return "like"
+
+
+# =====================================================
+#  QUERY BUILDING
+# =====================================================
+
+def _terms(query):
+    """A search string becomes one term per word; a list is taken as given terms."""
+    if isinstance(query, str):
+        return [[t] for t in _TOKEN.findall(query.lower())]
+    terms = [_TOKEN.findall(str(q).lower()) for q in query]
+    return [t for t in terms if t]
+
+
+def fts5_query(terms, match_any=False):
+    """Prefix-matching FTS5 query; multi-word terms become phrases."""
+    parts = ['"%s"*' % " ".join(tokens) for tokens in terms]
+    return (" OR " if match_any else " AND ").join(parts)
+
+
+def mysql_boolean_query(terms, match_any=False):
+    parts = []
+    for tokens in terms:
+        tokens = [t for t in tokens if len(t) >= MYSQL_MIN_TOKEN]
+        if not tokens:
+            continue
+        part = '"%s"' % " ".join(tokens) if len(tokens) > 1 else f"{tokens[0]}*"
+        parts.append(part if match_any else f"+{part}")
+    return " ".join(parts)
+
+
+# =====================================================
+#  SEARCH API
+# =====================================================
+
+def _kind_clause(kinds, column):
+    if not kinds:
+        return "", []
+    return f" AND {column} IN ({', '.join(['%s'] * len(kinds))})", list(kinds)
+
+
+def _search_fts5(terms, kinds, limit, match_any):
+    kind_sql, kind_params = _kind_clause(kinds, "d.kind")
+    sql = (
+        f"SELECT d.kind, d.object_id, bm25({FTS_TABLE}, 10.0, 1.0) AS score "
+        f"FROM {FTS_TABLE} JOIN search_searchdocument d ON d.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s{kind_sql} "
+        f"ORDER BY score LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [fts5_query(terms, match_any), *kind_params, limit])
+        # bm25() is lower-is-better; flip it so every backend sorts descending
+        return [SearchHit(kind, pk, -score) for kind, pk, score in cursor.fetchall()]
+
+
+def _search_mysql(terms, kinds, limit, match_any):
+    boolean = mysql_boolean_query(terms, match_any)
+    if not boolean:
+        return None  # only words shorter than the FULLTEXT minimum
+    kind_sql, kind_params = _kind_clause(kinds, "kind")
+    sql = (
+        "SELECT kind, object_id, MATCH(title, body) AGAINST (%s IN BOOLEAN MODE) AS score "
+        "FROM search_searchdocument "
+        f"WHERE MATCH(title, body) AGAINST (%s IN BOOLEAN MODE){kind_sql} "
+        "ORDER BY score DESC LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [boolean, boolean, *kind_params, limit])
+        return [SearchHit(kind, pk, float(score)) for kind, pk, score in cursor.fetchall()]
+
+
+def _search_like(terms, kinds, limit, match_any):
+    condition = Q()
+    for tokens in terms:
+        phrase = " ".join(tokens)
+        term_q = Q(title__icontains=phrase) | Q(body__icontains=phrase)
+        condition = (condition | term_q) if match_any else (condition & term_q)
+    docs = SearchDocument.objects.filter(condition)
+    if kinds:
+        docs = docs.filter(kind__in=kinds)
+    rows = docs.order_by("title").values_list("kind", "object_id")[:limit]
+    return [SearchHit(kind, pk, 0.0) for kind, pk in rows]
+
+
+def search(query, kinds=None, limit=None, match_any=False):
+    """
+    Ranked full-text search. `query` is either user-typed text (every word
+    must match, as a prefix) or a list of terms; with match_any=True any
+    term may match. Returns SearchHit(kind, object_id, score), best first.
+    At most `limit` hits (default SEARCH_RESULT_LIMIT); pass UNLIMITED for all.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    limit = limit or settings.SEARCH_RESULT_LIMIT
+
+    backend = search_backend()
+    hits = None
+    if backend == "fts5":
+        hits = _search_fts5(terms, kinds, limit, match_any)
+    elif backend == "mysql":
+        hits = _search_mysql(terms, kinds, limit, match_any)
+    if hits is None:
+        hits = _search_like(terms, kinds, limit, match_any)
+    return hits
+
+
+def ranked(queryset, query, kind, limit=None, match_any=False):
+    """Filter `queryset` to the search hits of `kind`, ordered by relevance."""
+    ids = [hit.object_id for hit in search(query, [kind], limit, match_any)]
+    if not ids:
+        return queryset.none()
+    order = Case(*[When(pk=pk, then=pos) for pos, pk in enumerate(ids)])
+    return queryset.filter(pk__in=ids).order_by(order)
+
+
+# =====================================================
+#  SYNC
+# =====================================================
+
+def index_object(instance):
+    kind = KIND_FOR_MODEL[instance._meta.label]
+    SearchDocument.objects.update_or_create(
+        kind=kind, object_id=instance.pk, defaults=document_fields(kind, instance)
+    )
+
+
+def remove_object(instance):
+    kind = KIND_FOR_MODEL[instance._meta.label]
+    SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def iter_documents(kind, model, chunk_size=1000):
+    for obj in model.objects.all().iterator(chunk_size=chunk_size):
+        yield SearchDocument(kind=kind, object_id=obj.pk, **document_fields(kind, obj))
+
+
+@transaction.atomic
+def rebuild_index(kinds=None, batch_size=1000):
+    """Re-create the documents for `kinds` (default: all). Returns counts per kind."""
+    counts = {}
+    for kind in kinds or SEARCH_SOURCES:
+        model = apps.get_model(SEARCH_SOURCES[kind][0])
+        SearchDocument.objects.filter(kind=kind).delete()
+        created = SearchDocument.objects.bulk_create(
+            iter_documents(kind, model, batch_size), batch_size=batch_size
+        )
+        counts[kind] = len(created)
+
+    if search_backend() == "fts5":
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+    return counts
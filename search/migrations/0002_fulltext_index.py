@@ -0,0 +1,102 @@
+from django.db import migrations
+
+FTS_TABLE = 'search_searchdocument_fts'
+MYSQL_INDEX = 'search_document_fulltext'
+
+SQLITE_CREATE = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, body,
+        content='search_searchdocument', content_rowid='id',
+        tokenize='porter unicode61', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER search_searchdocument_ai AFTER INSERT ON search_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    f"""
+    CREATE TRIGGER search_searchdocument_ad AFTER DELETE ON search_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    f"""
+    CREATE TRIGGER search_searchdocument_au AFTER UPDATE ON search_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS search_searchdocument_ai',
+    'DROP TRIGGER IF EXISTS search_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS search_searchdocument_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def _sqlite_has_fts5(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute('CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)')
+            cursor.execute('DROP TABLE temp._fts5_probe')
+            return True
+        except Exception:
+            return False
+
+
+def create_fulltext_index(apps, schema_editor):
+    """FTS5 table + triggers on SQLite, a FULLTEXT index on MySQL, nothing elsewhere."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite' and _sqlite_has_fts5(schema_editor):
+        for sql in SQLITE_CREATE:
+            schema_editor.execute(sql)
+    elif vendor == 'mysql':
+        schema_editor.execute(
+            f'ALTER TABLE search_searchdocument ADD FULLTEXT INDEX {MYSQL_INDEX} (title, body)'
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in SQLITE_DROP:
+            schema_editor.execute(sql)
+    elif vendor == 'mysql':
+        schema_editor.execute(f'ALTER TABLE search_searchdocument DROP INDEX {MYSQL_INDEX}')
+
+
+def populate_documents(apps, schema_editor):
+    """Index the rows that already exist."""
+    from search.documents import SEARCH_SOURCES, document_fields
+
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    for kind, (label, _) in SEARCH_SOURCES.items():
+        model = apps.get_model(label)
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(kind=kind, object_id=obj.pk, **document_fields(kind, obj))
+                for obj in model.objects.all().iterator()
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('accounts', '0011_exportjob'),
+        ('careers', '0002_alter_career_options_remove_career_position_and_more'),
+        ('catalog', '0001_initial'),
+        ('colleges', '0004_rollup_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(populate_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Flattened, searchable text for one catalog object.
+
+    On SQLite the rows are mirrored into an FTS5 table
+    (search_searchdocument_fts) by triggers; on MySQL the table carries a
+    FULLTEXT index on (title, body). See search/index.py.
+    """
+    kind = models.CharField(max_length=30)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("kind", "object_id")
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.title}"
@@ -0,0 +1,28 @@
+# search/signals.py
+"""
+Keeps SearchDocument rows in step with the searchable models
+(see search/documents.py).
+"""
+
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+
+from .documents import SEARCH_SOURCES
+from .index import index_object, remove_object
+
+
+def _index_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return  # loaddata; run rebuild_search_index afterwards
+    index_object(instance)
+
+
+def _remove_on_delete(sender, instance, **kwargs):
+    remove_object(instance)
+
+
+def connect_search_signals():
+    for kind, (label, _) in SEARCH_SOURCES.items():
+        model = apps.get_model(label)
+        post_save.connect(_index_on_save, sender=model, dispatch_uid=f"search_index_{kind}")
+        post_delete.connect(_remove_on_delete, sender=model, dispatch_uid=f"search_remove_{kind}")
@@ -0,0 +1,136 @@
+import sqlite3
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from careers.models import Career
+from colleges.models import College
+
+from . import index
+from .index import rebuild_index, search, search_backend
+
+
+def _fts5_available():
+    if connection.vendor != "sqlite":
+        return False
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+class SearchTestData:
+    @classmethod
+    def setUpTestData(cls):
+        cls.ml = Career.objects.create(
+            title="Machine Learning Engineer", company="Acme",
+            skills=["python", "statistics"], description="Trains models.",
+        )
+        cls.analyst = Career.objects.create(
+            title="Data Analyst", company="Initech",
+            skills=["sql", "excel"], description="Machine reports and dashboards.",
+        )
+        cls.chef = Career.objects.create(title="Pastry Chef", skills=["baking"])
+        cls.college = College.objects.create(
+            college_name="Lakeside University", abbreviation="LSU", city="Springfield", state="IL",
+        )
+
+    def career_ids(self, query, **kwargs):
+        return [hit.object_id for hit in search(query, ["career"], **kwargs)]
+
+
+class SearchBehaviourMixin(SearchTestData):
+    """Checks that hold for every backend."""
+
+    def test_words_match_as_prefixes(self):
+        self.assertIn(self.ml.pk, self.career_ids("mach"))
+
+    def test_every_word_must_match_unless_match_any(self):
+        self.assertEqual(self.career_ids("machine python"), [self.ml.pk])
+        self.assertEqual(set(self.career_ids(["python", "baking"], match_any=True)),
+                         {self.ml.pk, self.chef.pk})
+
+    def test_kind_filter_and_limit(self):
+        self.assertEqual(search("lakeside", ["career"]), [])
+        self.assertEqual([h.object_id for h in search("lakeside", ["college"])], [self.college.pk])
+        self.assertEqual(len(self.career_ids("machine", limit=1)), 1)
+
+    def test_signals_keep_the_index_current(self):
+        career = Career.objects.create(title="Glassblower")
+        self.assertEqual(self.career_ids("glassblower"), [career.pk])
+
+        career.title = "Potter"
+        career.save()
+        self.assertEqual(self.career_ids("glassblower"), [])
+        self.assertEqual(self.career_ids("potter"), [career.pk])
+
+        career.delete()
+        self.assertEqual(self.career_ids("potter"), [])
+
+    def test_raw_saves_are_not_indexed(self):
+        career = Career(title="Glassblower", created_at=timezone.now())
+        career.save_base(raw=True)  # as loaddata does
+        self.assertEqual(self.career_ids("glassblower"), [])
+
+    def test_rebuild_restores_missing_documents(self):
+        Career.objects.bulk_create([Career(title="Cartographer")])  # no signals
+        self.assertEqual(self.career_ids("cartographer"), [])
+        rebuild_index(["career"])
+        self.assertEqual(len(self.career_ids("cartographer")), 1)
+
+
+@skipUnless(_fts5_available(), "SQLite was built without FTS5")
+class FTS5SearchTests(SearchBehaviourMixin, TestCase):
+    def test_backend(self):
+        self.assertEqual(search_backend(), "fts5")
+
+    def test_words_do_not_match_mid_word(self):
+        self.assertEqual(self.career_ids("achine"), [])
+
+    def test_title_matches_rank_above_body_matches(self):
+        self.assertEqual(self.career_ids("machine"), [self.ml.pk, self.analyst.pk])
+
+
+class LikeFallbackSearchTests(SearchBehaviourMixin, TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(index, "search_backend", return_value="like")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_words_match_anywhere(self):
+        self.assertIn(self.ml.pk, self.career_ids("achine"))
+
+
+class CollegeSearchViewTests(SearchTestData, TestCase):
+    def test_matches_word_prefixes_not_substrings(self):
+        url = reverse("colleges:college_search")
+        results = self.client.get(url, {"q": "lake univ"}).context["results"]
+        self.assertEqual(list(results), [self.college])
+        self.assertEqual(list(self.client.get(url, {"q": "side"}).context["results"]), [])
+
+    @override_settings(SEARCH_RESULT_LIMIT=2)
+    def test_results_are_capped(self):
+        College.objects.bulk_create(
+            College(college_name=f"Lakeside College {n}", abbreviation=f"LC{n}") for n in range(3)
+        )
+        rebuild_index(["college"])
+        results = self.client.get(reverse("colleges:college_search"), {"q": "lakeside"}).context["results"]
+        self.assertEqual(len(results), 2)
+
+    @override_settings(SEARCH_RESULT_LIMIT=2)
+    def test_list_view_counts_every_match(self):
+        College.objects.bulk_create(
+            College(college_name=f"Lakeside College {n}", abbreviation=f"LC{n}") for n in range(3)
+        )
+        rebuild_index(["college"])
+        response = self.client.get(reverse("colleges:list"), {"q": "lakeside"})
+        self.assertEqual(response.context["result_count"], 4)
+
+    def test_api(self):
+        payload = self.client.get(reverse("search:api"), {"q": "machine", "kind": "career"}).json()
+        self.assertEqual(payload["results"][0]["title"], "Machine Learning Engineer")
+        self.assertEqual(payload["count"], len(payload["results"]))
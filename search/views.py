@@ -0,0 +1,38 @@
+from django.http import JsonResponse
+
+from .documents import SEARCH_SOURCES
+from .index import search
+from .models import SearchDocument
+
+SEARCH_API_MAX_LIMIT = 100
+
+
+def search_api(request):
+    """
+    GET /search/api/?q=<text>[&kind=college&kind=career][&limit=20]
+    Ranked full-text search over colleges, careers, courses and portfolio items.
+    """
+    q = (request.GET.get("q") or "").strip()
+    kinds = [k for k in request.GET.getlist("kind") if k in SEARCH_SOURCES] or None
+    try:
+        limit = min(max(int(request.GET.get("limit", 20)), 1), SEARCH_API_MAX_LIMIT)
+    except ValueError:
+        limit = 20
+
+    hits = search(q, kinds, limit) if q else []
+    titles = {
+        (kind, pk): title
+        for kind, pk, title in SearchDocument.objects.filter(
+            object_id__in={hit.object_id for hit in hits}
+        ).values_list("kind", "object_id", "title")
+    }
+    results = [
+        {
+            "kind": hit.kind,
+            "id": hit.object_id,
+            "title": titles.get((hit.kind, hit.object_id), ""),
+            "score": round(hit.score, 4),
+        }
+        for hit in hits
+    ]
+    return JsonResponse({"query": q, "count": len(results), "results": results})